@@ -1,28 +1,57 @@
-from typing import Literal
+import itertools
+from typing import AsyncIterator, Iterable, Literal
 
+from apps.discord_search import SearchKind
 from apps.discord_session import DiscordSession
 from apps.managed_app import ManagedApp
 from apps.types import ProcessConfig, ProcessProperties
 from assman_types import JSONType
 from config import config
 from models.discord_server import DiscordChannel, DiscordServer
+from utils.serialization import Snapshot
 
+# Shared by every instance, so a standby swapped in under the same instance id never repeats
+# the generation of the app it replaces
+_session_generations = itertools.count(1)
 
-class DiscordApp(ManagedApp):
-    process_config = ProcessConfig(
-        process_name="discord",
-        process_params=[f"--remote-debugging-port={config.DISCORD_RPC_PORT}"],
-        wm_class_target="discord",
-        wm_name_target="discord",
-    )
 
+class DiscordApp(ManagedApp):
     @property
     def name(self):
         return "discord"
 
-    def __init__(self):
+    def __init__(
+        self,
+        instance_id: str = "default",
+        rpc_port: int = config.DISCORD_RPC_PORT,
+        user_data_dir: str | None = None,
+        display: str | None = None,
+    ):
+        """
+        Args:
+            instance_id: Identifier of this instance within a DiscordControllerPool.
+            rpc_port: Remote debugging port, unique per concurrently running instance.
+            user_data_dir: Electron profile directory; required for every instance beyond the
+                first, as Discord otherwise hands off to the already running process.
+            display: X display to launch on, i.e. ':1'; inherits DISPLAY when None.
+        """
+        self.instance_id = instance_id
+        self.rpc_port = rpc_port
+        self.user_data_dir = user_data_dir
+        self.display = display
+        process_params = [f"--remote-debugging-port={rpc_port}"]
+        if user_data_dir:
+            process_params.append(f"--user-data-dir={user_data_dir}")
+        self.process_config = ProcessConfig(
+            process_name="discord",
+            process_params=process_params,
+            wm_class_target="discord",
+            wm_name_target="discord",
+        )
         self.process_properties: ProcessProperties | None = None
         self.session: DiscordSession | None = None
+        # Increases with every session started; identifies the session a catalogue came from
+        self.session_generation = 0
 
     async def focus(self):
         raise NotImplementedError()
@@ -43,27 +72,75 @@ class DiscordApp(ManagedApp):
 
     # Playwright Setup
     async def start_playwright(self):
-        self.session = DiscordSession(self)
         if not await self.is_running():
             raise RuntimeError(
                 "Cannot start playwright on uninitilaised application instance"
             )
+        # Drop the previous CDP connection; the Playwright driver itself is reused
+        await self.stop_playwright()
+        self.session = DiscordSession(self)
+        self.session_generation = next(_session_generations)
         await self.session.start()
 
-    async def learn_servers(self):
+    async def stop_playwright(self):
+        if self.session:
+            await self.session.stop()
+            self.session = None
+
+    async def terminate(self) -> bool:
+        await self.stop_playwright()
+        return await super().terminate()
+
+    def adopt_catalogue(self, source: "DiscordApp") -> None:
+        if not self.session:
+            raise RuntimeError(
+                "Cannot adopt a catalogue without playwright initialisation"
+            )
+        if source.session:
+            self.session.adopt_catalogue(source.session)
+
+    async def learn_servers(self, use_cdp: bool | None = None):
         if not self.session:
             raise RuntimeError("Cannot learn servers without playwright initialisation")
-        await self.session.learn_servers()
+        await self.session.learn_servers(use_cdp)
 
-    async def learn_channels(self, server: DiscordServer):
+    async def learn_channels(self, server: DiscordServer, use_cdp: bool | None = None):
         if not self.session:
             raise RuntimeError(
                 "Cannot learn channels from server without playwright initialisation"
             )
-        await self.session.learn_channels(server)
+        await self.session.learn_channels(server, use_cdp)
+
+    def stream_messages(
+        self, channel: DiscordChannel, limit: int | None = None
+    ) -> AsyncIterator[list[dict[str, JSONType]]]:
+        if not self.session:
+            raise RuntimeError(
+                "Cannot fetch messages without playwright initialisation"
+            )
+        return self.session.stream_messages(channel, limit)
+
+    def send_messages(
+        self, channel: DiscordChannel, contents: list[str]
+    ) -> AsyncIterator[dict[str, JSONType]]:
+        if not self.session:
+            raise RuntimeError("Cannot send messages without playwright initialisation")
+        return self.session.send_messages(channel, contents)
 
     # Getters
 
+    def knows(
+        self, channel_ids: Iterable[str] = (), server_id: str | None = None
+    ) -> bool:
+        """Whether the learned catalogue holds the server and every channel given"""
+        if not self.session:
+            return False
+        if server_id is not None and server_id not in self.session.server_list:
+            return False
+        return all(
+            channel_id in self.session.channel_list for channel_id in channel_ids
+        )
+
     def get_servers(self) -> list[dict[str, JSONType]]:
         if not self.session:
             raise RuntimeError("Cannot fetch servers without playwright initialisation")
@@ -72,15 +149,26 @@ class DiscordApp(ManagedApp):
         ]
         return server_list
 
+    def get_servers_snapshot(self) -> Snapshot:
+        if not self.session:
+            raise RuntimeError("Cannot fetch servers without playwright initialisation")
+        return self.session.get_servers_snapshot()
+
+    def get_channels_snapshot(
+        self, channel_type: Literal["any", "voice", "text"] = "any"
+    ) -> Snapshot:
+        if not self.session:
+            raise RuntimeError(
+                "Cannot fetch channels without playwright initialisation"
+            )
+        return self.session.get_channels_snapshot(channel_type)
+
     def get_channels(
         self, channel_type: Literal["any", "voice", "text"] = "any"
     ) -> list[dict[str, JSONType]]:
         if not self.session:
             raise RuntimeError("Cannot fetch server without playwright initialisation")
-        channels = [
-            channel.to_dict() for channel in self.session.get_channels(channel_type)
-        ]
-        return channels
+        return self.session.get_channels_as_dicts(channel_type)
 
     def get_server_by_id(self, id) -> DiscordServer:
         if not self.session:
@@ -118,3 +206,20 @@ class DiscordApp(ManagedApp):
                 "Cannot fetch channel by name without playwright initialisation"
             )
         return self.session.get_servers_by_name(name, strict_match, case_sensitive)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kind: SearchKind = "all",
+        server_id: str | None = None,
+        channel_type: Literal["all", "voice", "text"] = "all",
+    ) -> list[dict[str, JSONType]]:
+        if not self.session:
+            raise RuntimeError("Cannot search without playwright initialisation")
+        return [
+            result.to_dict()
+            for result in self.session.search(
+                query, limit, kind, server_id, channel_type
+            )
+        ]
@@ -0,0 +1,266 @@
+import asyncio
+import json
+import logging
+import re
+import zlib
+from typing import TYPE_CHECKING, Any, Literal
+
+from playwright.async_api import Page, Response, WebSocket
+
+from models.discord_server import DiscordChannel, DiscordServer
+
+if TYPE_CHECKING:
+    from apps.discord_session import DiscordSession
+
+logger = logging.getLogger(__name__)
+
+# Gateway channel type ids -> DiscordChannel.type; other channel kinds (categories, threads,
+# forums, directories) are not navigable sidebar channels and are skipped
+CHANNEL_TYPES: dict[int, Literal["text", "voice"]] = {
+    0: "text",  # GUILD_TEXT
+    2: "voice",  # GUILD_VOICE
+    5: "text",  # GUILD_ANNOUNCEMENT
+    13: "voice",  # GUILD_STAGE_VOICE
+}
+
+CATALOGUE_EVENTS = {"READY", "GUILD_CREATE", "CHANNEL_CREATE", "CHANNEL_UPDATE"}
+ZLIB_SUFFIX = b"\x00\x00\xff\xff"
+GUILDS_ROUTE = re.compile(r"/api/v\d+/users/@me/guilds(?:\?|$)")
+GUILD_CHANNELS_ROUTE = re.compile(r"/api/v\d+/guilds/(\d+)/channels(?:\?|$)")
+
+
+def guild_icon_url(guild_id: str, icon: str | None) -> str:
+    if not icon:
+        return ""
+    return f"https://cdn.discordapp.com/icons/{guild_id}/{icon}.webp?size=96"
+
+
+def parse_guild(guild: dict[str, Any]) -> DiscordServer | None:
+    # Newer gateway versions nest guild metadata under "properties"
+    properties = guild.get("properties") or guild
+    name = properties.get("name")
+    if not guild.get("id") or not name:
+        return None
+    return DiscordServer(
+        id=str(guild["id"]),
+        name=name,
+        image_url=guild_icon_url(str(guild["id"]), properties.get("icon")),
+        channels={},
+    )
+
+
+def parse_channel(
+    channel: dict[str, Any], server_id: str | None
+) -> DiscordChannel | None:
+    channel_type = CHANNEL_TYPES.get(channel.get("type", -1))
+    server_id = str(channel.get("guild_id") or server_id or "")
+    if channel_type is None or not server_id or not channel.get("name"):
+        return None
+    return DiscordChannel(
+        id=str(channel["id"]),
+        server_id=server_id,
+        name=channel["name"],
+        type=channel_type,
+    )
+
+
+class DiscordCapture:
+    """Build the session's server / channel catalogue from Discord's own network traffic.
+
+    Listens to gateway websocket frames (READY, GUILD_CREATE, CHANNEL_CREATE / UPDATE) and REST
+    responses for guild and channel listings, including channels the sidebar has not rendered.
+    Entries are added without locators; the session's locator caches build them on first use.
+
+    The gateway only sends READY on connect; attaching to an already running client captures
+    later events only, so pass reload=True to attach() to capture the full catalogue.
+
+    Args:
+        session: DiscordSession receiving captured servers and channels.
+        record_path: Optional JSONL file every decoded payload is appended to, for use with replay().
+    """
+
+    def __init__(self, session: "DiscordSession", record_path: str | None = None):
+        self.session = session
+        self.record_path = record_path
+        self.page: Page | None = None
+        self.undecodable_frames = 0
+        self._inflators: dict[WebSocket, Any] = {}
+        self._buffers: dict[WebSocket, bytearray] = {}
+        # Entries awaiting the recording writer, which runs off the event loop
+        self._unrecorded: list[dict[str, Any]] = []
+        self._recorder: asyncio.Task | None = None
+
+    async def attach(self, page: Page, reload: bool = False) -> None:
+        self.page = page
+        page.on("websocket", self._on_websocket)
+        page.on("response", self._on_response)
+        if reload:
+            await page.reload(wait_until="domcontentloaded")
+
+    def detach(self) -> None:
+        if not self.page:
+            return
+        self.page.remove_listener("websocket", self._on_websocket)
+        self.page.remove_listener("response", self._on_response)
+        self.page = None
+        self._inflators.clear()
+        self._buffers.clear()
+
+    # Sources
+    def _on_websocket(self, websocket: WebSocket) -> None:
+        if "gateway" not in websocket.url:
+            return
+        if "compress=zlib-stream" in websocket.url:
+            self._inflators[websocket] = zlib.decompressobj()
+            self._buffers[websocket] = bytearray()
+        websocket.on(
+            "framereceived", lambda payload: self._on_frame(websocket, payload)
+        )
+        websocket.on("close", lambda _: self._forget(websocket))
+
+    def _forget(self, websocket: WebSocket) -> None:
+        self._inflators.pop(websocket, None)
+        self._buffers.pop(websocket, None)
+
+    def _on_frame(self, websocket: WebSocket, payload: str | bytes) -> None:
+        if isinstance(payload, str):
+            text = payload
+        else:
+            inflator = self._inflators.get(websocket)
+            if inflator is None:
+                # Unsupported transport compression (i.e. zstd-stream)
+                self.undecodable_frames += 1
+                return
+            buffer = self._buffers[websocket]
+            buffer.extend(payload)
+            # zlib-stream messages may span frames; a message ends with the sync flush marker
+            if not buffer.endswith(ZLIB_SUFFIX):
+                return
+            try:
+                text = inflator.decompress(bytes(buffer)).decode()
+            except (zlib.error, UnicodeDecodeError) as e:
+                # A corrupt or partial frame poisons the stream context; start a fresh one so
+                # capture resumes once the gateway reconnects or resumes
+                logger.warning(
+                    "Undecodable gateway frame: %s",
+                    e,
+                    extra={
+                        "url": websocket.url,
+                        "rate_limit": f"capture_frame:{id(websocket)}",
+                    },
+                )
+                self.undecodable_frames += 1
+                self._inflators[websocket] = zlib.decompressobj()
+                buffer.clear()
+                return
+            buffer.clear()
+        try:
+            message = json.loads(text)
+        except ValueError:
+            # ETF encoded gateways are not supported
+            self.undecodable_frames += 1
+            return
+        self.ingest_gateway_payload(message)
+
+    async def _on_response(self, response: Response) -> None:
+        if response.request.method != "GET" or not response.ok:
+            return
+        if not (
+            GUILDS_ROUTE.search(response.url)
+            or GUILD_CHANNELS_ROUTE.search(response.url)
+        ):
+            return
+        try:
+            body = await response.json()
+        except Exception:
+            return
+        self.ingest_api_response(response.url, body)
+
+    # Ingestion
+    def ingest_gateway_payload(self, message: dict[str, Any]) -> None:
+        """Apply a decoded gateway dispatch ({"op": 0, "t": ..., "d": ...}) to the session"""
+        event, data = message.get("t"), message.get("d") or {}
+        if message.get("op") != 0 or event not in CATALOGUE_EVENTS:
+            return
+        self._record({"source": "gateway", "payload": message})
+        if event == "READY":
+            for guild in data.get("guilds", []):
+                self._add_guild(guild)
+        elif event == "GUILD_CREATE":
+            self._add_guild(data)
+        elif event in ("CHANNEL_CREATE", "CHANNEL_UPDATE"):
+            self._add_channel(data, None)
+
+    def ingest_api_response(self, url: str, body: Any) -> None:
+        """Apply a REST guild list or guild channel list response body to the session"""
+        if not (GUILDS_ROUTE.search(url) or GUILD_CHANNELS_ROUTE.search(url)):
+            return
+        self._record({"source": "api", "url": url, "payload": body})
+        if GUILDS_ROUTE.search(url):
+            for guild in body:
+                self._add_guild(guild)
+            return
+        match = GUILD_CHANNELS_ROUTE.search(url)
+        if match:
+            for channel in body:
+                self._add_channel(channel, match.group(1))
+
+    def replay(self, path: str) -> None:
+        """Feed payloads recorded with record_path back through ingestion"""
+        record_path, self.record_path = self.record_path, None
+        try:
+            with open(path) as recording:
+                for line in recording:
+                    entry = json.loads(line)
+                    if entry["source"] == "gateway":
+                        self.ingest_gateway_payload(entry["payload"])
+                    else:
+                        self.ingest_api_response(entry["url"], entry["payload"])
+        finally:
+            self.record_path = record_path
+
+    def _add_guild(self, guild: dict[str, Any]) -> None:
+        server = parse_guild(guild)
+        if server is None:
+            return
+        existing = self.session.server_list.get(server.id)
+        if existing:
+            self.session.update_server(existing, server.name, server.image_url)
+        else:
+            self.session.add_server(server, None)
+        for channel in guild.get("channels", []):
+            self._add_channel(channel, server.id)
+
+    def _add_channel(self, channel_data: dict[str, Any], server_id: str | None) -> None:
+        channel = parse_channel(channel_data, server_id)
+        if channel is None or channel.server_id not in self.session.server_list:
+            return
+        self.session.add_channel(channel, None)
+
+    def _record(self, entry: dict[str, Any]) -> None:
+        if not self.record_path:
+            return
+        # READY can run to megabytes; encode and write it on a worker thread
+        self._unrecorded.append(entry)
+        if self._recorder is None or self._recorder.done():
+            self._recorder = asyncio.create_task(
+                self._write_recording(self.record_path), name="capture_recorder"
+            )
+
+    async def _write_recording(self, path: str) -> None:
+        def write(entries: list[dict[str, Any]]) -> None:
+            with open(path, "a") as recording:
+                for entry in entries:
+                    recording.write(json.dumps(entry) + "\n")
+
+        while self._unrecorded:
+            entries, self._unrecorded = self._unrecorded, []
+            try:
+                await asyncio.to_thread(write, entries)
+            except OSError as e:
+                logger.error("Failed to record captured payloads: %s", e)
+
+    async def flush(self) -> None:
+        """Wait until every captured payload has been written to record_path"""
+        if self._recorder is not None:
+            await self._recorder
@@ -0,0 +1,236 @@
+"""In-page scripts evaluated against the Discord main page.
+
+Each script runs as a single `evaluate` round-trip, keeping DOM work inside the renderer
+instead of issuing one CDP call per element.
+"""
+
+# Expand every collapsed category under the channel nav root, then resolve once the DOM has
+# been quiet for `settleMs`. Categories rendered by the expansion itself are picked up on the
+# next pass. The deadline grows once per distinct category found so large servers are not cut
+# short, while toggles which never expand cannot extend it past `maxMs`.
+# Args: {baseMs, perCategoryMs, settleMs, maxMs}
+# Returns: {expanded, remaining, timedOut}
+EXPAND_CATEGORIES = """
+(root, { baseMs, perCategoryMs, settleMs, maxMs }) => new Promise((resolve) => {
+    const collapsedSelector = '[aria-expanded="false"]';
+    const started = performance.now();
+    let deadline = started + baseMs;
+    let expanded = 0;
+    const clicked = new WeakSet();
+    let settleTimer = null;
+
+    const finish = (timedOut) => {
+        observer.disconnect();
+        clearTimeout(settleTimer);
+        clearTimeout(deadlineTimer);
+        resolve({
+            expanded,
+            remaining: root.querySelectorAll(collapsedSelector).length,
+            timedOut,
+        });
+    };
+
+    const expandPass = () => {
+        const collapsed = root.querySelectorAll(collapsedSelector);
+        if (collapsed.length === 0) {
+            finish(false);
+            return;
+        }
+        for (const category of collapsed) {
+            if (!clicked.has(category)) {
+                clicked.add(category);
+                expanded += 1;
+                deadline += perCategoryMs;
+            }
+            category.click();
+        }
+        deadline = Math.min(deadline, started + maxMs);
+        resetDeadline();
+        armSettle();
+    };
+
+    const armSettle = () => {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(expandPass, settleMs);
+    };
+
+    let deadlineTimer = null;
+    const resetDeadline = () => {
+        clearTimeout(deadlineTimer);
+        deadlineTimer = setTimeout(
+            () => finish(true),
+            Math.max(0, deadline - performance.now())
+        );
+    };
+
+    const observer = new MutationObserver(armSettle);
+    observer.observe(root, {
+        subtree: true,
+        childList: true,
+        attributes: true,
+        attributeFilter: ['aria-expanded'],
+    });
+    resetDeadline();
+    expandPass();
+})
+"""
+
+# Read every learnable server from the guild nav.
+# Returns: [{id, name, image_url}]
+SCRAPE_SERVERS = """
+() => Array.from(
+    document.querySelectorAll('[aria-label="Servers"] [data-list-item-id^="guildsnav___"]')
+).flatMap((item) => {
+    const name = item.querySelector('span');
+    const image = item.querySelector('img');
+    if (!name || !image) {
+        return [];
+    }
+    return [{
+        id: item.getAttribute('data-list-item-id').split('___')[1],
+        name: name.innerText,
+        image_url: image.getAttribute('src'),
+    }];
+})
+"""
+
+# Read every rendered text and voice channel from the channel sidebar.
+# Returns: [{id, name, type}]
+SCRAPE_CHANNELS = """
+() => [
+    ['text', '[aria-label*="(text channel)"]'],
+    ['voice', '[aria-label*="(voice channel)"]'],
+].flatMap(([type, selector]) => Array.from(document.querySelectorAll(selector)).flatMap((item) => {
+    const dataId = item.getAttribute('data-list-item-id');
+    const name = item.querySelector('div[class^="name"]');
+    if (!dataId || !name) {
+        return [];
+    }
+    return [{ id: dataId.split('___').pop(), name: name.innerText, type }];
+}))
+"""
+
+# Count elements matching a selector.
+# Args: selector
+# Returns: int
+COUNT_SELECTOR = """
+(selector) => document.querySelectorAll(selector).length
+"""
+
+# Read the currently rendered messages of the open channel, then scroll the virtualised list up
+# by one viewport and resolve once the list has been quiet for `settleMs` (bounded by
+# `maxWaitMs`) so the next call sees the older chunk.
+# Args: {settleMs, maxWaitMs}
+# Returns: {messages: [{id, author, content, timestamp}], reachedTop}
+READ_MESSAGE_CHUNK = """
+({ settleMs, maxWaitMs }) => new Promise((resolve) => {
+    const list = document.querySelector('[data-list-id="chat-messages"]');
+    if (!list) {
+        resolve({ messages: [], reachedTop: true });
+        return;
+    }
+    let scroller = list;
+    while (scroller && scroller.scrollHeight <= scroller.clientHeight) {
+        scroller = scroller.parentElement;
+    }
+    scroller = scroller || list;
+
+    const messages = [];
+    let author = null;
+    for (const item of list.querySelectorAll('li[id^="chat-messages-"]')) {
+        const username = item.querySelector('[id^="message-username-"]');
+        // Grouped follow-up messages omit the username; it carries over from the previous message
+        author = username ? username.innerText : author;
+        const content = item.querySelector('[id^="message-content-"]');
+        const time = item.querySelector('time[datetime]');
+        messages.push({
+            id: item.id.split('-').pop(),
+            author,
+            content: content ? content.innerText : '',
+            timestamp: time ? time.getAttribute('datetime') : null,
+        });
+    }
+
+    const startTop = scroller.scrollTop;
+    const startHeight = scroller.scrollHeight;
+    let settleTimer = null;
+    const finish = () => {
+        observer.disconnect();
+        clearTimeout(settleTimer);
+        clearTimeout(maxTimer);
+        resolve({
+            messages,
+            reachedTop: startTop === 0 && scroller.scrollHeight === startHeight,
+        });
+    };
+    const armSettle = () => {
+        clearTimeout(settleTimer);
+        settleTimer = setTimeout(finish, settleMs);
+    };
+    const observer = new MutationObserver(armSettle);
+    observer.observe(list, { childList: true, subtree: true });
+    const maxTimer = setTimeout(finish, maxWaitMs);
+    scroller.scrollTop = Math.max(0, startTop - scroller.clientHeight);
+    armSettle();
+})
+"""
+
+# Id of the newest rendered message in the open channel, or null.
+# Returns: str | null
+LAST_MESSAGE_ID = """
+() => {
+    const items = document.querySelectorAll('[data-list-id="chat-messages"] li[id^="chat-messages-"]');
+    return items.length ? items[items.length - 1].id.split('-').pop() : null;
+}
+"""
+
+# Resolve with the id of the newest message after `afterId` once no message after it is still
+# in the sending state, i.e. the message just sent has been acknowledged by the server, or null
+# if it failed or `timeoutMs` passes. Discord renders markdown, mentions and emoji, so the
+# acknowledgement is matched by position rather than by comparing rendered text.
+# Args: {afterId, timeoutMs}
+# Returns: str | null, the id of the delivered message
+CONFIRM_MESSAGE_SENT = """
+({ afterId, timeoutMs }) => new Promise((resolve) => {
+    const list = document.querySelector('[data-list-id="chat-messages"]');
+    if (!list) {
+        resolve(null);
+        return;
+    }
+    const after = afterId === null ? -1n : BigInt(afterId);
+    // undefined while the send is still unresolved
+    const findDelivered = () => {
+        const items = list.querySelectorAll('li[id^="chat-messages-"]');
+        let newest = null;
+        for (let i = items.length - 1; i >= 0; i--) {
+            const id = items[i].id.split('-').pop();
+            if (BigInt(id) <= after) {
+                break;
+            }
+            if (items[i].querySelector('[class*="isFailed"]')) {
+                return null;
+            }
+            if (items[i].querySelector('[class*="isSending"]')) {
+                return undefined;
+            }
+            newest = newest ?? id;
+        }
+        return newest ?? undefined;
+    };
+    const finish = (id) => {
+        observer.disconnect();
+        clearTimeout(timer);
+        resolve(id);
+    };
+    const check = () => {
+        const id = findDelivered();
+        if (id !== undefined) {
+            finish(id);
+        }
+    };
+    const observer = new MutationObserver(check);
+    observer.observe(list, { childList: true, subtree: true, attributes: true, attributeFilter: ['class'] });
+    const timer = setTimeout(() => finish(null), timeoutMs);
+    check();
+})
+"""
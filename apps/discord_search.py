@@ -0,0 +1,148 @@
+import heapq
+from collections import Counter
+from dataclasses import dataclass
+from typing import Literal
+
+from assman_types import JSONType
+from models.discord_server import DiscordChannel, DiscordServer
+
+SearchKind = Literal["all", "server", "channel"]
+
+
+def _normalise(text: str) -> str:
+    return " ".join(text.lower().split())
+
+
+def _trigrams(text: str) -> Counter[str]:
+    """Split normalised text into padded character trigrams, i.e. 'abc' -> '  a', ' ab', 'abc', 'bc '"""
+    padded = f"  {_normalise(text)} "
+    return Counter(padded[i : i + 3] for i in range(len(padded) - 2))
+
+
+@dataclass
+class SearchResult:
+    kind: Literal["server", "channel"]
+    score: float
+    item: DiscordServer | DiscordChannel
+
+    def to_dict(self) -> dict[str, JSONType]:
+        return {
+            "kind": self.kind,
+            "score": round(self.score, 4),
+            "item": self.item.to_dict(),
+        }
+
+
+class DiscordSearchIndex:
+    """Trigram index over learned servers and channels for ranked fuzzy name lookups.
+
+    Entries are indexed as they are added to the session, so a query only touches the
+    posting lists of its own trigrams rather than scanning every known name.
+    """
+
+    def __init__(self):
+        self._postings: dict[str, set[tuple[str, str]]] = {}
+        self._entry_trigrams: dict[tuple[str, str], Counter[str]] = {}
+        self._entry_names: dict[tuple[str, str], str] = {}
+        self._servers: dict[str, DiscordServer] = {}
+        self._channels: dict[str, DiscordChannel] = {}
+
+    def add_server(self, server: DiscordServer) -> None:
+        self._servers[server.id] = server
+        self._index(("server", server.id), server.name)
+
+    def add_channel(self, channel: DiscordChannel) -> None:
+        self._channels[channel.id] = channel
+        self._index(("channel", channel.id), channel.name)
+
+    def _index(self, key: tuple[str, str], name: str) -> None:
+        if key in self._entry_trigrams:
+            self._unindex(key)
+        trigrams = _trigrams(name)
+        self._entry_trigrams[key] = trigrams
+        self._entry_names[key] = _normalise(name)
+        for trigram in trigrams:
+            self._postings.setdefault(trigram, set()).add(key)
+
+    def _unindex(self, key: tuple[str, str]) -> None:
+        for trigram in self._entry_trigrams.pop(key):
+            posting = self._postings.get(trigram)
+            if posting is None:
+                continue
+            posting.discard(key)
+            if not posting:
+                del self._postings[trigram]
+        del self._entry_names[key]
+
+    def _accepts(
+        self,
+        key: tuple[str, str],
+        kind: SearchKind,
+        server_id: str | None,
+        channel_type: Literal["all", "voice", "text"],
+    ) -> bool:
+        entry_kind, entry_id = key
+        if kind != "all" and entry_kind != kind:
+            return False
+        if entry_kind == "server":
+            # Channel type filtering only applies to channels
+            if channel_type != "all":
+                return False
+            return server_id is None or entry_id == server_id
+        channel = self._channels[entry_id]
+        if server_id is not None and channel.server_id != server_id:
+            return False
+        return channel_type == "all" or channel.type == channel_type
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kind: SearchKind = "all",
+        server_id: str | None = None,
+        channel_type: Literal["all", "voice", "text"] = "all",
+    ) -> list[SearchResult]:
+        """Return up to `limit` entries ranked by trigram similarity (Dice coefficient) to `query`.
+
+        Exact name matches score 1.0 and substring matches are lifted above plain trigram overlap,
+        so results stay compatible with the strict / non-strict matching of get_*_by_name.
+        """
+        if limit <= 0 or not _normalise(query):
+            return []
+        query_trigrams = _trigrams(query)
+        query_size = sum(query_trigrams.values())
+        normalised_query = _normalise(query)
+
+        shared: Counter[tuple[str, str]] = Counter()
+        for trigram, count in query_trigrams.items():
+            for key in self._postings.get(trigram, ()):
+                shared[key] += min(count, self._entry_trigrams[key][trigram])
+        if len(normalised_query) < 3:
+            # Every trigram of a query this short is padded, so names containing it mid-word
+            # share none; scan for them instead
+            for key, name in self._entry_names.items():
+                if normalised_query in name:
+                    shared.setdefault(key, 0)
+
+        scored: list[tuple[float, tuple[str, str]]] = []
+        for key, overlap in shared.items():
+            if not self._accepts(key, kind, server_id, channel_type):
+                continue
+            entry_size = sum(self._entry_trigrams[key].values())
+            score = 2 * overlap / (query_size + entry_size)
+            name = self._entry_names[key]
+            if name == normalised_query:
+                score = 1.0
+            elif normalised_query in name:
+                score = 0.5 + score / 2
+            scored.append((score, key))
+
+        results = []
+        for score, (entry_kind, entry_id) in heapq.nlargest(
+            limit, scored, key=lambda entry: entry[0]
+        ):
+            if entry_kind == "server":
+                results.append(SearchResult("server", score, self._servers[entry_id]))
+            else:
+                results.append(SearchResult("channel", score, self._channels[entry_id]))
+        return results
@@ -1,20 +1,30 @@
 import asyncio
+import json
+import time
 from dataclasses import dataclass
-from typing import Literal
+from typing import Any, AsyncIterator, Callable, Literal
 
-import requests
 from playwright.async_api import (
     Browser,
     BrowserContext,
+    CDPSession,
+    Frame,
     Locator,
     Page,
     Playwright,
-    async_playwright,
 )
 
+import apps.discord_scripts as scripts
 import apps.discord_session_utils as utils
+from apps.discord_capture import DiscordCapture
+from apps.discord_search import DiscordSearchIndex, SearchKind, SearchResult
+from apps.locator_cache import LocatorCache
+from apps.playwright_driver import get_playwright
+from assman_types import JSONType
 from config import config
 from models.discord_server import DiscordChannel, DiscordServer
+from utils.serialization import RawJSON, Snapshot
+from utils.tracing import traced
 
 
 @dataclass
@@ -32,20 +42,48 @@ class DiscordSession:
         self.app = app
         self.pw_properties: PlaywrightProperties | None = None
         self.server_list: dict[str, DiscordServer] = {}
-        self.server_locators: dict[str, Locator] = {}
+        # Rebuilds use a short timeout so a vanished element fails fast rather than
+        # waiting out Playwright's default action timeout
+        self.server_locators = LocatorCache(
+            lambda id: self.build_server_locator(
+                self.get_server_by_id(id), config.LOCATOR_REBUILD_TIMEOUT * 1000
+            ),
+            ttl=config.LOCATOR_TTL,
+        )
         self.channel_list: dict[str, DiscordChannel] = {}
-        self.channel_locators: dict[str, Locator] = {}
+        self.channel_locators = LocatorCache(
+            lambda id: self.build_channel_locator(
+                self.get_channel_by_id(id), config.LOCATOR_REBUILD_TIMEOUT * 1000
+            ),
+            ttl=config.LOCATOR_TTL,
+        )
+        self.channels_by_type: dict[str, dict[str, DiscordChannel]] = {
+            "text": {},
+            "voice": {},
+        }
+        # Bumped by every server / channel change; encoded snapshots are built on first read
+        # of each version and shared until the next change
+        self.catalogue_version = 0
+        self._snapshots: dict[str, Snapshot] = {}
+        # Serialised channel listings per channel_type, cleared with the snapshots
+        self._channel_dicts: dict[str, list[dict[str, JSONType]]] = {}
+        self.search_index = DiscordSearchIndex()
+        # Navigation state, derived from main_page.url and kept current by navigation events
+        self.current_server_id: str | None = None
+        self.current_channel_id: str | None = None
+        self.expanded_servers: set[str] = set()
+        # Raw CDP channel for read-only page queries, created on first use
+        self._cdp_session: CDPSession | None = None
+        self.capture: DiscordCapture | None = None
 
     async def start(self):
-        t_rpc_port: int = config.DISCORD_RPC_PORT
+        t_rpc_port: int = self.app.rpc_port
         t_playwright_instance: Playwright
         t_browser: Browser
         t_context: BrowserContext
         t_main_page: Page
         t_debug_websocket_url: str
-        t_rpc_response = requests.get(
-            f"http://localhost:{t_rpc_port}/json/version"
-        ).json()
+        t_rpc_response = await self.fetch_debugger_version(t_rpc_port)
         if "webSocketDebuggerUrl" not in t_rpc_response:
             raise ValueError(
                 "No RPC Websocket debugger URL found in RPC response from Discord"
@@ -54,7 +92,7 @@ class DiscordSession:
         t_debug_websocket_url = t_rpc_response["webSocketDebuggerUrl"]
         if not t_debug_websocket_url:
             raise ValueError("Debug websocket URL was empty")
-        t_playwright_instance = await async_playwright().start()
+        t_playwright_instance = await get_playwright()
         t_browser = await t_playwright_instance.chromium.connect_over_cdp(
             t_debug_websocket_url
         )
@@ -82,16 +120,132 @@ class DiscordSession:
             main_page=t_main_page,
             debug_websocket_url=t_debug_websocket_url,
         )
+        self.sync_location(t_main_page.url)
+        t_main_page.on("framenavigated", self._on_frame_navigated)
+        t_main_page.on("domcontentloaded", self._on_document_loaded)
+        if config.NETWORK_CAPTURE:
+            await self.enable_capture(reload=config.NETWORK_CAPTURE_RELOAD)
+
+    async def enable_capture(
+        self, reload: bool = False, record_path: str | None = None
+    ) -> DiscordCapture:
+        """Start building servers / channels from network traffic, see DiscordCapture"""
+        if self.capture is None:
+            self.capture = DiscordCapture(self, record_path)
+            await self.capture.attach(self.get_pw_props().main_page, reload=reload)
+        return self.capture
+
+    async def fetch_debugger_version(self, rpc_port: int) -> dict:
+        """Query the CDP `/json/version` endpoint, retrying with exponential backoff while the
+        debug port comes up. The blocking request runs in a worker thread to keep the loop free.
+        """
+        # requests (and certifi) take longer to import than the rest of the session; only needed here
+        import requests
+
+        url = f"http://localhost:{rpc_port}/json/version"
+        deadline = time.monotonic() + config.CDP_DISCOVERY_TIMEOUT
+        delay = config.CDP_DISCOVERY_BACKOFF
+        while True:
+            try:
+                response = await asyncio.to_thread(requests.get, url, timeout=1.0)
+                response.raise_for_status()
+                return response.json()
+            except requests.RequestException:
+                if time.monotonic() + delay > deadline:
+                    raise
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, 1.0)
+
+    async def stop(self) -> None:
+        """Disconnect from Discord's CDP endpoint; leaves the Discord process and shared driver running"""
+        if not self.pw_properties:
+            return
+        pw_properties = self.pw_properties
+        self.pw_properties = None
+        if self.capture:
+            self.capture.detach()
+            await self.capture.flush()
+            self.capture = None
+        if self._cdp_session:
+            cdp_session = self._cdp_session
+            self._cdp_session = None
+            if pw_properties.browser.is_connected():
+                await cdp_session.detach()
+        pw_properties.main_page.remove_listener(
+            "framenavigated", self._on_frame_navigated
+        )
+        pw_properties.main_page.remove_listener(
+            "domcontentloaded", self._on_document_loaded
+        )
+        if pw_properties.browser.is_connected():
+            await pw_properties.browser.close()
+
+    # Navigation state
+    def sync_location(self, url: str) -> None:
+        self.current_server_id, self.current_channel_id = utils.parse_channel_url(url)
+
+    def _on_frame_navigated(self, frame: Frame) -> None:
+        # Fires for client side (history API) route changes as well as full loads
+        if frame.parent_frame is None:
+            previous_server_id = self.current_server_id
+            self.sync_location(frame.url)
+            if self.current_server_id != previous_server_id:
+                # Switching server re-renders the channel sidebar
+                self.channel_locators.invalidate()
+
+    def _on_document_loaded(self, page: Page) -> None:
+        # A fresh document re-renders the sidebar; category state can no longer be assumed
+        self.expanded_servers.clear()
+        self.server_locators.invalidate()
+        self.channel_locators.invalidate()
 
     # Setters / Builders
-    def add_server(self, server: DiscordServer, server_locator: Locator):
+    def add_server(self, server: DiscordServer, server_locator: Locator | None):
         self.server_list[server.id] = server
-        self.server_locators[server.id] = server_locator
-
-    def add_channel(self, channel: DiscordChannel, channel_locator: Locator):
+        self.server_locators.set(server.id, server_locator)
+        self.search_index.add_server(server)
+        self._catalogue_changed()
+
+    def update_server(self, server: DiscordServer, name: str, image_url: str) -> None:
+        server.update(name, image_url)
+        # Re-indexing replaces the entry under the old name
+        self.search_index.add_server(server)
+        self._catalogue_changed()
+
+    def add_channel(self, channel: DiscordChannel, channel_locator: Locator | None):
+        previous = self.channel_list.get(channel.id)
+        if previous and previous.type != channel.type:
+            del self.channels_by_type[previous.type][channel.id]
         self.channel_list[channel.id] = channel
-        self.channel_locators[channel.id] = channel_locator
-        self.server_list[channel.server_id].channels[channel.id] = channel
+        self.channels_by_type[channel.type][channel.id] = channel
+        self.channel_locators.set(channel.id, channel_locator)
+        self.server_list[channel.server_id].add_channel(channel)
+        self.search_index.add_channel(channel)
+        self._catalogue_changed()
+
+    def adopt_catalogue(self, source: "DiscordSession") -> None:
+        """Copy servers and channels learned by another session of the same account which this
+        session lacks, i.e. onto a hot standby; their locators are built on first use
+        """
+        for server in source.server_list.values():
+            if server.id not in self.server_list:
+                self.add_server(
+                    DiscordServer(
+                        id=server.id,
+                        name=server.name,
+                        image_url=server.image_url,
+                        channels={},
+                    ),
+                    None,
+                )
+        for channel in source.channel_list.values():
+            if channel.id not in self.channel_list:
+                self.add_channel(channel, None)
+
+    def _catalogue_changed(self) -> None:
+        self.catalogue_version += 1
+        self._snapshots.clear()
+        self._channel_dicts.clear()
 
     # Getters
     def get_servers(self) -> dict[str, DiscordServer]:
@@ -104,7 +258,50 @@ class DiscordSession:
         self,
         channel_type: Literal["any", "voice", "text"] = "any",
     ) -> list[DiscordChannel]:
-        return utils.get_channels(self.channel_list, channel_type)
+        if channel_type == "any":
+            return list(self.channel_list.values())
+        return list(self.channels_by_type[channel_type].values())
+
+    def get_channels_as_dicts(
+        self,
+        channel_type: Literal["any", "voice", "text"] = "any",
+    ) -> list[dict[str, JSONType]]:
+        """Serialised channel listing, cached until the catalogue changes; a shallow copy, so
+        callers may reorder or filter it but not edit its entries
+        """
+        cached = self._channel_dicts.get(channel_type)
+        if cached is None:
+            cached = [channel.to_dict() for channel in self.get_channels(channel_type)]
+            self._channel_dicts[channel_type] = cached
+        return list(cached)
+
+    def get_servers_snapshot(self) -> Snapshot:
+        """Encoded listing of every server with its channels, as DiscordServer.to_dict()"""
+        return self._snapshot(
+            "servers",
+            lambda: RawJSON.array(
+                [server.to_json() for server in self.server_list.values()]
+            ),
+        )
+
+    def get_channels_snapshot(
+        self,
+        channel_type: Literal["any", "voice", "text"] = "any",
+    ) -> Snapshot:
+        """Encoded channel listing, as get_channels_as_dicts()"""
+        return self._snapshot(
+            f"channels:{channel_type}",
+            lambda: RawJSON.array(
+                [channel.to_json() for channel in self.get_channels(channel_type)]
+            ),
+        )
+
+    def _snapshot(self, key: str, build: Callable[[], RawJSON]) -> Snapshot:
+        snapshot = self._snapshots.get(key)
+        if snapshot is None:
+            snapshot = Snapshot.encode(self.catalogue_version, build())
+            self._snapshots[key] = snapshot
+        return snapshot
 
     def get_server_by_id(self, id: str) -> DiscordServer:
         return utils.get_server_by_id(self.server_list, id)
@@ -119,9 +316,13 @@ class DiscordSession:
         case_sensitive=True,
         channel_type: Literal["all", "voice", "text"] = "all",
     ) -> list[DiscordChannel]:
-        return utils.get_channels_by_name(
-            self.channel_list, name, strict_match, case_sensitive, channel_type
+        # Narrow the pool to the type partition so the utility skips its type filter
+        pool = (
+            self.channel_list
+            if channel_type == "all"
+            else self.channels_by_type[channel_type]
         )
+        return utils.get_channels_by_name(pool, name, strict_match, case_sensitive)
 
     def get_servers_by_name(
         self,
@@ -133,21 +334,43 @@ class DiscordSession:
             self.server_list, name, strict_match, case_sensitive
         )
 
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kind: SearchKind = "all",
+        server_id: str | None = None,
+        channel_type: Literal["all", "voice", "text"] = "all",
+    ) -> list[SearchResult]:
+        return self.search_index.search(query, limit, kind, server_id, channel_type)
+
     # Playwright Factories
-    async def build_channel_locator(self, channel: DiscordChannel) -> Locator:
+    async def build_channel_locator(
+        self, channel: DiscordChannel, timeout: float | None = None
+    ) -> Locator:
         page = self.get_pw_props().main_page
         locator_identifier = f"channels___{channel.id}"
-        new_locator = page.locator(f'a[data-list-item-id="{locator_identifier}"]')
-        located_data_id = await new_locator.get_attribute("data-list-item-id")
-        located_name = await new_locator.locator('div[class^="name"]').inner_text()
+        new_locator = page.locator(utils.channel_item_selector(channel.id))
+        located_data_id = await traced(
+            "playwright.get_attribute",
+            new_locator.get_attribute("data-list-item-id", timeout=timeout),
+        )
+        located_name = await traced(
+            "playwright.inner_text",
+            new_locator.locator('div[class^="name"]').inner_text(timeout=timeout),
+        )
         assert (located_name, located_data_id) == (channel.name, locator_identifier)
         return new_locator
 
     async def build_channel(
         self, channel: Locator, ch_type: Literal["text", "voice"], server_id: str
     ) -> tuple[DiscordChannel, Locator]:
-        name = await channel.locator('div[class^="name"]').inner_text()
-        data_id = await channel.get_attribute("data-list-item-id")
+        name = await traced(
+            "playwright.inner_text", channel.locator('div[class^="name"]').inner_text()
+        )
+        data_id = await traced(
+            "playwright.get_attribute", channel.get_attribute("data-list-item-id")
+        )
         if not isinstance(data_id, str):
             raise ValueError("Channel ID was not of expected string type")
         # Extract channel id from attribute `channel___{id}` -> [`channel`, `{id}`]
@@ -156,25 +379,32 @@ class DiscordSession:
         new_locator = await self.build_channel_locator(new_channel)
         return (new_channel, new_locator)
 
-    async def build_server_locator(self, server: DiscordServer) -> Locator:
+    async def build_server_locator(
+        self, server: DiscordServer, timeout: float | None = None
+    ) -> Locator:
         page = self.get_pw_props().main_page
-        server_locator = page.locator(
-            f'[data-list-item-id="guildsnav___{server.id}"]:has(img):has(span)'
-        )
-        assert f"guildsnav___{server.id}" == await server_locator.get_attribute(
-            "data-list-item-id"
+        server_locator = page.locator(utils.server_item_selector(server.id))
+        assert f"guildsnav___{server.id}" == await traced(
+            "playwright.get_attribute",
+            server_locator.get_attribute("data-list-item-id", timeout=timeout),
         )
 
         return server_locator
 
     async def build_server(self, server: Locator) -> tuple[DiscordServer, Locator]:
-        name = await server.locator("span").inner_text()
-        img = await server.locator("img").get_attribute("src")
+        name = await traced(
+            "playwright.inner_text", server.locator("span").inner_text()
+        )
+        img = await traced(
+            "playwright.get_attribute", server.locator("img").get_attribute("src")
+        )
         if not isinstance(img, str):
             raise ValueError(
                 "Could not fetch image id correctly, did not yield string type"
             )
-        id_attr = await server.get_attribute("data-list-item-id")
+        id_attr = await traced(
+            "playwright.get_attribute", server.get_attribute("data-list-item-id")
+        )
         if not isinstance(id_attr, str):
             raise ValueError(
                 "Could not fetch data-list-item-id correctly, did not yield string type"
@@ -192,98 +422,316 @@ class DiscordSession:
         else:
             raise ValueError("Requested uninitialised Playwright properties")
 
-    def get_server_locator(self, server: DiscordServer) -> Locator:
+    async def get_server_locator(self, server: DiscordServer) -> Locator:
         try:
-            return self.server_locators[server.id]
+            return await self.server_locators.get(server.id)
         except KeyError:
             raise FileNotFoundError(
                 f"Server {server.name} did not have corresponding locator in server locator list"
             )
 
-    def get_channel_locator(self, channel: DiscordChannel) -> Locator:
+    async def get_channel_locator(self, channel: DiscordChannel) -> Locator:
         try:
-            return self.channel_locators[channel.id]
+            return await self.channel_locators.get(channel.id)
         except KeyError:
             raise FileNotFoundError(
-                f"Channel {channel.name} of server {self.get_server_by_id(channel.id).name} did not have corresponding locator in channel locator list"
+                f"Channel {channel.name} of server {self.get_server_by_id(channel.server_id).name} did not have corresponding locator in channel locator list"
+            )
+
+    async def get_cdp_session(self) -> CDPSession:
+        if self._cdp_session is None:
+            pw_props = self.get_pw_props()
+            self._cdp_session = await traced(
+                "playwright.new_cdp_session",
+                pw_props.context.new_cdp_session(pw_props.main_page),
+            )
+        return self._cdp_session
+
+    # Read-only page queries
+    async def read_page(
+        self, script: str, arg: Any = None, use_cdp: bool | None = None
+    ) -> Any:
+        """Evaluate a side-effect free page script and return its JSON result.
+
+        With use_cdp the script is sent as a raw `Runtime.evaluate` over a dedicated CDPSession,
+        bypassing Playwright's frame and handle bookkeeping. Defaults to config.CDP_FAST_PATH.
+        """
+        if use_cdp is None:
+            use_cdp = config.CDP_FAST_PATH
+        if not use_cdp:
+            return await traced(
+                "playwright.evaluate",
+                self.get_pw_props().main_page.evaluate(script, arg),
+            )
+        cdp_session = await self.get_cdp_session()
+        response = await traced(
+            "cdp.Runtime.evaluate",
+            cdp_session.send(
+                "Runtime.evaluate",
+                {
+                    "expression": f"({script})({json.dumps(arg)})",
+                    "returnByValue": True,
+                    "awaitPromise": True,
+                },
+            ),
+        )
+        if "exceptionDetails" in response:
+            raise RuntimeError(
+                f"Page script raised: {response['exceptionDetails'].get('text')}"
+            )
+        return response["result"].get("value")
+
+    async def count_elements(self, selector: str, use_cdp: bool | None = None) -> int:
+        if use_cdp is None:
+            use_cdp = config.CDP_FAST_PATH
+        if not use_cdp:
+            return await traced(
+                "playwright.count",
+                self.get_pw_props().main_page.locator(selector).count(),
             )
+        return await self.read_page(scripts.COUNT_SELECTOR, selector, use_cdp=True)
 
-    async def get_channel_nav(self) -> Locator:
+    async def get_channel_nav(self, use_cdp: bool | None = None) -> Locator:
         page = self.get_pw_props().main_page
-        channel_nav = page.locator('[aria-label="Channels"]')
-        assert await channel_nav.count() == 1
-        return channel_nav
+        selector = '[aria-label="Channels"]'
+        assert await self.count_elements(selector, use_cdp) == 1
+        return page.locator(selector)
 
-    async def get_textbox_locator(self) -> Locator:
+    async def get_textbox_locator(self, use_cdp: bool | None = None) -> Locator:
         page = self.get_pw_props().main_page
         try:
-            textbox_locator = page.locator('[role="textbox"][aria-label*="Message"]')
-            assert await textbox_locator.count() == 1
-            return textbox_locator
+            selector = '[role="textbox"][aria-label*="Message"]'
+            assert await self.count_elements(selector, use_cdp) == 1
+            return page.locator(selector)
         except AssertionError:
             raise ValueError(
                 "Found incorrect number of textbox elements in channel view"
             )
 
     # Playwright Actions
-    async def expand_categories(self):
-        async def _expand_categories(channel_nav: Locator):
-            collapsed_categories = channel_nav.locator('[aria-expanded="false"]')
-            while await collapsed_categories.count() != 0:
-                target = collapsed_categories.first
-                await target.click()
-
-        try:
-            await asyncio.wait_for(
-                _expand_categories(await self.get_channel_nav()), timeout=5
-            )
-        except asyncio.TimeoutError:
+    async def expand_categories(self) -> int:
+        """Expand all collapsed categories in the channel nav in a single in-page pass.
+
+        Returns:
+            Number of categories expanded.
+
+        Raises:
+            asyncio.TimeoutError if categories remain collapsed once the budget, which scales
+            with the number of categories found up to config.EXPAND_MAX_TIMEOUT, is spent.
+        """
+        channel_nav = await self.get_channel_nav()
+        result = await traced(
+            "playwright.evaluate",
+            # The script enforces the cap itself; this bounds a page which never resolves it
+            asyncio.wait_for(
+                channel_nav.evaluate(
+                    scripts.EXPAND_CATEGORIES,
+                    {
+                        "baseMs": config.EXPAND_BASE_TIMEOUT * 1000,
+                        "perCategoryMs": config.EXPAND_CATEGORY_TIMEOUT * 1000,
+                        "settleMs": config.DOM_SETTLE_INTERVAL * 1000,
+                        "maxMs": config.EXPAND_MAX_TIMEOUT * 1000,
+                    },
+                ),
+                config.EXPAND_MAX_TIMEOUT + config.EXPAND_BASE_TIMEOUT,
+            ),
+            script="EXPAND_CATEGORIES",
+        )
+        if result["timedOut"]:
             raise asyncio.TimeoutError(
-                "Timeout error waiting to expand collapsed discord categories on server discovery"
+                f"Timeout error waiting to expand collapsed discord categories on server discovery, {result['remaining']} remaining"
             )
+        return result["expanded"]
 
-    async def learn_servers(self) -> None:
+    async def learn_servers(self, use_cdp: bool | None = None) -> None:
+        """Learn servers from the guild nav.
+
+        use_cdp reads every server in one raw CDP evaluate; otherwise each server is read and
+        validated through Playwright locators. Defaults to config.CDP_FAST_PATH.
+        """
+        if use_cdp is None:
+            use_cdp = config.CDP_FAST_PATH
         page = self.get_pw_props().main_page
-        servers = await page.locator(
-            '[aria-label="Servers"] [data-list-item-id^="guildsnav___"]:has(img):has(span)'
-        ).all()
+        if use_cdp:
+            for server in await self.read_page(scripts.SCRAPE_SERVERS, use_cdp=True):
+                new_server = DiscordServer(channels={}, **server)
+                self.add_server(
+                    new_server, page.locator(utils.server_item_selector(new_server.id))
+                )
+            return
+        servers = await traced(
+            "playwright.all",
+            page.locator(
+                '[aria-label="Servers"] [data-list-item-id^="guildsnav___"]:has(img):has(span)'
+            ).all(),
+        )
         for server in servers:
             new_server, new_locator = await self.build_server(server)
             self.add_server(new_server, new_locator)
 
-    async def learn_channels(self, server: DiscordServer) -> None:
-        await self.navigate_to_server(server)
+    async def learn_channels(
+        self, server: DiscordServer, use_cdp: bool | None = None
+    ) -> None:
+        """Learn the channels of a server; see learn_servers for use_cdp"""
+        if use_cdp is None:
+            use_cdp = config.CDP_FAST_PATH
+        # Always expand when learning; categories may have been collapsed by hand
+        await self.navigate_to_server(server, force_expand=True)
         page = self.get_pw_props().main_page
+        if use_cdp:
+            for channel in await self.read_page(scripts.SCRAPE_CHANNELS, use_cdp=True):
+                new_channel = DiscordChannel(server_id=server.id, **channel)
+                self.add_channel(
+                    new_channel,
+                    page.locator(utils.channel_item_selector(new_channel.id)),
+                )
+            return
         text_channel_loc = page.locator('[aria-label*="(text channel)"]')
         voice_channel_loc = page.locator('[aria-label*="(voice channel)"]')
-        for text_channel in await text_channel_loc.all():
+        for text_channel in await traced("playwright.all", text_channel_loc.all()):
             new_channel, new_locator = await self.build_channel(
                 text_channel, "text", server.id
             )
             self.add_channel(new_channel, new_locator)
-        for voice_channel in await voice_channel_loc.all():
+        for voice_channel in await traced("playwright.all", voice_channel_loc.all()):
             new_channel, new_locator = await self.build_channel(
                 voice_channel, "voice", server.id
             )
             self.add_channel(new_channel, new_locator)
 
     # Playwright Navigation Actions
-    async def navigate_to_server(self, server: DiscordServer) -> None:
+    async def navigate_to_server(
+        self, server: DiscordServer, force_expand: bool = False
+    ) -> None:
         page = self.get_pw_props().main_page
-        locator = self.get_server_locator(server)
-        await locator.click()
-        await page.wait_for_url(f"**channels/{server.id}**")
-        await self.expand_categories()
+        self.sync_location(page.url)
+        if self.current_server_id != server.id:
+            locator = await self.get_server_locator(server)
+            await traced("playwright.click", locator.click())
+            await traced(
+                "playwright.wait_for_url",
+                page.wait_for_url(f"**channels/{server.id}**"),
+            )
+            self.sync_location(page.url)
+        if force_expand or server.id not in self.expanded_servers:
+            await self.expand_categories()
+            self.expanded_servers.add(server.id)
 
     async def navigate_to_text_channel(self, channel: DiscordChannel) -> None:
         if channel.type != "text":
             # TODO: this *should* be doable, voice channels DO have a text channel component
             raise ValueError("Cannot navigate to text channel")
         page = self.get_pw_props().main_page
+        self.sync_location(page.url)
+        if (self.current_server_id, self.current_channel_id) == (
+            channel.server_id,
+            channel.id,
+        ):
+            return
         # Channel requires server to be active
         server = self.get_server_by_id(channel.server_id)
         await self.navigate_to_server(server)
 
-        locator = self.get_channel_locator(channel)
-        await locator.click()
-        await page.wait_for_url(f"**channels/{server.id}/{channel.id}**")
+        locator = await self.get_channel_locator(channel)
+        await traced("playwright.click", locator.click())
+        await traced(
+            "playwright.wait_for_url",
+            page.wait_for_url(f"**channels/{server.id}/{channel.id}**"),
+        )
+        self.sync_location(page.url)
+
+    # Playwright Message Actions
+    async def stream_messages(
+        self, channel: DiscordChannel, limit: int | None = None
+    ) -> AsyncIterator[list[dict[str, JSONType]]]:
+        """Yield a text channel's history newest first, one rendered chunk at a time.
+
+        Each chunk is read and the list scrolled up in a single evaluate. Message ids are
+        snowflakes, so scrolling upwards only ever reveals smaller ids; tracking the oldest id
+        yielded is enough to drop re-rendered messages, keeping memory flat however long the
+        history is.
+        """
+        await self.navigate_to_text_channel(channel)
+        page = self.get_pw_props().main_page
+        oldest_id: int | None = None
+        fetched = 0
+        idle_chunks = 0
+        while limit is None or fetched < limit:
+            chunk = await traced(
+                "playwright.evaluate",
+                page.evaluate(
+                    scripts.READ_MESSAGE_CHUNK,
+                    {
+                        "settleMs": config.DOM_SETTLE_INTERVAL * 1000,
+                        "maxWaitMs": config.MESSAGE_CHUNK_TIMEOUT * 1000,
+                    },
+                ),
+                script="READ_MESSAGE_CHUNK",
+            )
+            batch = sorted(
+                (
+                    message
+                    for message in chunk["messages"]
+                    if oldest_id is None or int(message["id"]) < oldest_id
+                ),
+                key=lambda message: int(message["id"]),
+                reverse=True,
+            )
+            if limit is not None:
+                batch = batch[: limit - fetched]
+            if batch:
+                idle_chunks = 0
+                oldest_id = int(batch[-1]["id"])
+                fetched += len(batch)
+                yield batch
+            elif chunk["reachedTop"]:
+                return
+            else:
+                # Discord may still be loading older history; give up after repeated empty chunks
+                idle_chunks += 1
+                if idle_chunks >= config.MESSAGE_IDLE_CHUNKS:
+                    return
+
+    async def send_messages(
+        self, channel: DiscordChannel, contents: list[str]
+    ) -> AsyncIterator[dict[str, JSONType]]:
+        """Send messages to a text channel with a single navigation, yielding a receipt per message.
+
+        Messages are entered with `fill` and delivery is confirmed by observing the message list
+        until the newest message is no longer pending, rather than sleeping.
+
+        Yields:
+            {"content", "message_id", "delivered", "latency"} where latency is seconds from
+            entering the message to its confirmation (or timeout).
+        """
+        await self.navigate_to_text_channel(channel)
+        page = self.get_pw_props().main_page
+        textbox = await self.get_textbox_locator()
+        last_id = await traced(
+            "playwright.evaluate",
+            page.evaluate(scripts.LAST_MESSAGE_ID),
+            script="LAST_MESSAGE_ID",
+        )
+        for content in contents:
+            started = time.monotonic()
+            await traced("playwright.fill", textbox.fill(content))
+            await traced("playwright.press", textbox.press("Enter"))
+            message_id = await traced(
+                "playwright.evaluate",
+                page.evaluate(
+                    scripts.CONFIRM_MESSAGE_SENT,
+                    {
+                        "afterId": last_id,
+                        "timeoutMs": config.MESSAGE_SEND_TIMEOUT * 1000,
+                    },
+                ),
+                script="CONFIRM_MESSAGE_SENT",
+            )
+            if message_id is not None:
+                last_id = message_id
+            yield {
+                "content": content,
+                "message_id": message_id,
+                "delivered": message_id is not None,
+                "latency": time.monotonic() - started,
+            }
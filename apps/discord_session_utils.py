@@ -1,6 +1,10 @@
-from typing import Literal
+from __future__ import annotations
 
-from models.discord_server import DiscordChannel, DiscordServer
+from typing import TYPE_CHECKING, Literal
+from urllib.parse import urlparse
+
+if TYPE_CHECKING:
+    from models.discord_server import DiscordChannel, DiscordServer
 
 
 def get_channel_by_id(pool: dict[str, DiscordChannel], id: str) -> DiscordChannel:
@@ -86,3 +90,21 @@ def get_channels(
     if channel_type == "any":
         return list(pool.values())
     return list(filter(lambda ch: ch.type == channel_type, pool.values()))
+
+
+def parse_channel_url(url: str) -> tuple[str | None, str | None]:
+    """Extract (server_id, channel_id) from a discord `/channels/{server}/{channel}` url"""
+    path = urlparse(url).path.strip("/").split("/")
+    if len(path) < 2 or path[0] != "channels":
+        return (None, None)
+    server_id = path[1] or None
+    channel_id = path[2] if len(path) > 2 and path[2] else None
+    return (server_id, channel_id)
+
+
+def server_item_selector(server_id: str) -> str:
+    return f'[data-list-item-id="guildsnav___{server_id}"]:has(img):has(span)'
+
+
+def channel_item_selector(channel_id: str) -> str:
+    return f'a[data-list-item-id="channels___{channel_id}"]'
@@ -0,0 +1,78 @@
+import time
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from playwright.async_api import Locator
+
+from utils.tracing import traced
+
+
+@dataclass
+class CachedLocator:
+    locator: Locator | None
+    validated_at: float
+    generation: int
+
+
+class LocatorCache:
+    """Id indexed Locator store which re-validates entries lazily, before use.
+
+    An entry is trusted without a round-trip while it is younger than `ttl` and no invalidation
+    has happened since it was validated. Otherwise a single `count()` confirms it still resolves
+    to exactly one element, and entries that no longer do are rebuilt via `rebuild`.
+
+    Args:
+        rebuild: Async factory producing a freshly validated Locator for an entry id.
+        ttl: Seconds an entry is trusted after validation.
+    """
+
+    def __init__(self, rebuild: Callable[[str], Awaitable[Locator]], ttl: float):
+        self._rebuild = rebuild
+        self._ttl = ttl
+        self._entries: dict[str, CachedLocator] = {}
+        # Bumped by invalidate(); entries validated under an older generation are re-checked
+        self._generation = 0
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def set(self, key: str, locator: Locator | None) -> None:
+        """Store a locator which has just been validated by its builder, or register the key
+        with no locator so that one is built on first use
+        """
+        self._entries[key] = CachedLocator(locator, time.monotonic(), self._generation)
+
+    def invalidate(self) -> None:
+        """Mark every entry as requiring re-validation before its next use"""
+        self._generation += 1
+
+    def is_fresh(self, key: str) -> bool:
+        entry = self._entries[key]
+        return (
+            entry.generation == self._generation
+            and time.monotonic() - entry.validated_at < self._ttl
+        )
+
+    async def get(self, key: str) -> Locator:
+        """Fetch a usable locator, re-validating or rebuilding it only when stale.
+
+        Raises:
+            KeyError if no entry exists for key
+        """
+        entry = self._entries[key]
+        if entry.locator is None:
+            locator = await self._rebuild(key)
+            self.set(key, locator)
+            return locator
+        if self.is_fresh(key):
+            return entry.locator
+        if await traced("playwright.count", entry.locator.count()) == 1:
+            entry.validated_at = time.monotonic()
+            entry.generation = self._generation
+            return entry.locator
+        locator = await self._rebuild(key)
+        self.set(key, locator)
+        return locator
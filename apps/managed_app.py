@@ -12,15 +12,25 @@ from config import config
 class ManagedApp(ABC):
     process_config: ProcessConfig
     process_properties: ProcessProperties | None
+    # Distinguishes concurrent instances of the same app; each may run on its own X display
+    instance_id: str = "default"
+    display: str | None = None
 
     @property
     @abstractmethod
     def name(self) -> str:
         raise NotImplementedError
 
+    def _process_env(self) -> dict[str, str]:
+        """Environment for the app process and X tooling, targeting the instance display if set"""
+        env = os.environ.copy()
+        if self.display:
+            env["DISPLAY"] = self.display
+        return env
+
     def _list_windows(self) -> list[str]:
         """Fetch list of window id's in current display environment"""
-        env = os.environ.copy()
+        env = self._process_env()
         out = subprocess.check_output(
             ["xdotool", "search", "--name", "--onlyvisible", ""],
             env=env,
@@ -33,6 +43,7 @@ class ManagedApp(ABC):
         props = ["WM_NAME", "WM_CLASS", "_NET_WM_PID"]
         result = subprocess.run(
             ["xprop", "-id", window_id, *props],
+            env=self._process_env(),
             capture_output=True,
             text=True,
             check=False,
@@ -72,14 +83,14 @@ class ManagedApp(ABC):
     def find_window_name(self):
         window_id = self.get_process_properties().window_id
         result = subprocess.check_output(
-            ["xprop", "-id", str(window_id), "WM_NAME"]
+            ["xprop", "-id", str(window_id), "WM_NAME"], env=self._process_env()
         ).decode()
         return result
 
     async def _start_process_with_window(self):
         """Open an instance of process defined by ManagedApp process_config - wait for timeout and return new window ID's"""
         timeout = config.POLL_TIMEOUT
-        env = os.environ.copy()
+        env = self._process_env()
 
         # Get window state -> Spawn Process -> Check window state
         prior_window_state = set(self._list_windows())
@@ -139,6 +150,26 @@ class ManagedApp(ABC):
             return True
         return False
 
+    def memory_usage(self) -> int:
+        """Resident memory in bytes of the app process and its children"""
+        if not (self.process_properties and self.process_properties.process_id):
+            raise ValueError(
+                "Attempted to measure memory of process with no associated process_id"
+            )
+        try:
+            process = psutil.Process(self.process_properties.process_id)
+            return process.memory_info().rss + sum(
+                child.memory_info().rss for child in process.children(recursive=True)
+            )
+        except psutil.NoSuchProcess:
+            raise ProcessLookupError(
+                f"Process {self.process_properties.process_id} no longer exists"
+            )
+
+    def in_use(self) -> bool:
+        """Whether the app holds state which recycling it would lose, i.e. active playback"""
+        return False
+
     @abstractmethod
     async def is_locatable(self) -> bool:
         pass
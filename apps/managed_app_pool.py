@@ -0,0 +1,175 @@
+import asyncio
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Awaitable, Callable, Generic, TypeVar
+
+from apps.managed_app import ManagedApp
+
+PooledAppType = TypeVar("PooledAppType", bound=ManagedApp)
+
+
+class ManagedAppPool(Generic[PooledAppType]):
+    """Fixed set of interchangeable ManagedApp instances leased out to tasks one at a time.
+
+    Instances are launched on first lease and reused across leases. An instance is recycled
+    (terminated, then relaunched on its next lease) after `max_uses` leases, or once its
+    process tree's resident memory exceeds `max_memory`, unless the instance reports in_use().
+
+    Args:
+        factory: Builds the app for a slot index; called once per slot.
+        size: Number of instances.
+        max_uses: Leases before an instance is recycled; unlimited when None.
+        max_memory: Resident memory in bytes above which an instance is recycled; unlimited when None.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[int], PooledAppType],
+        size: int,
+        max_uses: int | None = None,
+        max_memory: int | None = None,
+    ):
+        if size < 1:
+            raise ValueError("ManagedAppPool requires at least one instance")
+        self.apps: list[PooledAppType] = [factory(index) for index in range(size)]
+        self.max_uses = max_uses
+        self.max_memory = max_memory
+        self.uses: list[int] = [0] * size
+        self._idle: set[int] = set(range(size))
+        self._released = asyncio.Condition()
+        self._launched: set[int] = set()
+        # Launches detect their window by diffing the window list, so they must not overlap
+        self._launch_lock = asyncio.Lock()
+        self._retire_listeners: list[Callable[[PooledAppType], Awaitable[None]]] = []
+
+    @property
+    def size(self) -> int:
+        return len(self.apps)
+
+    @property
+    def idle_count(self) -> int:
+        return len(self._idle)
+
+    def index_of(self, instance_id: str) -> int:
+        for index, app in enumerate(self.apps):
+            if app.instance_id == instance_id:
+                return index
+        raise LookupError(f"Unknown pooled instance: {instance_id}")
+
+    def add_retire_listener(
+        self, listener: Callable[[PooledAppType], Awaitable[None]]
+    ) -> None:
+        """Await `listener` with each instance terminated, for recycling or pool shutdown"""
+        self._retire_listeners.append(listener)
+
+    async def _acquire(self, index: int | None) -> int:
+        async with self._released:
+            if index is None:
+                await self._released.wait_for(lambda: bool(self._idle))
+                index = min(self._idle, key=self._preference)
+            else:
+                await self._released.wait_for(lambda: index in self._idle)
+            self._idle.discard(index)
+            return index
+
+    def _preference(self, index: int) -> int:
+        """Rank of an idle instance for an unpinned lease, lowest first: launched and free, then
+        not yet launched, and only then one still in_use() (i.e. playing or paused) since a
+        lease may replace what it is doing
+        """
+        if index not in self._launched:
+            return 1
+        return 2 if self.apps[index].in_use() else 0
+
+    async def _release(self, index: int) -> None:
+        async with self._released:
+            self._idle.add(index)
+            self._released.notify_all()
+
+    async def _ensure_launched(self, index: int) -> None:
+        if index in self._launched:
+            if await self.apps[index].is_running():
+                return
+            # Exited since its last lease; retire it so listeners drop what it was doing
+            await self._retire(index)
+        async with self._launch_lock:
+            await self.apps[index].launch()
+        self.uses[index] = 0
+        self._launched.add(index)
+
+    async def start(self) -> None:
+        """Launch every instance up front rather than on first lease"""
+        for index in range(self.size):
+            await self._ensure_launched(index)
+
+    @asynccontextmanager
+    async def lease(
+        self, instance_id: str | None = None
+    ) -> AsyncIterator[PooledAppType]:
+        """Wait for an idle instance, or the given instance, launching it if needed, and return
+        it to the pool after use
+        """
+        index = await self._acquire(
+            None if instance_id is None else self.index_of(instance_id)
+        )
+        launched = False
+        try:
+            await self._ensure_launched(index)
+            launched = True
+            yield self.apps[index]
+        finally:
+            if launched:
+                # A failed launch never served the lease, so it does not count towards recycling
+                self.uses[index] += 1
+            try:
+                if self._should_recycle(index):
+                    await self._retire(index)
+            finally:
+                await self._release(index)
+
+    def _should_recycle(self, index: int) -> bool:
+        if index in self._launched and self.apps[index].in_use():
+            # Deferred to a later lease rather than interrupting the instance
+            return False
+        if self.max_uses is not None and self.uses[index] >= self.max_uses:
+            return True
+        if self.max_memory is not None and index in self._launched:
+            try:
+                return self.apps[index].memory_usage() > self.max_memory
+            except (ValueError, ProcessLookupError):
+                return True
+        return False
+
+    async def _retire(self, index: int) -> None:
+        self._launched.discard(index)
+        app = self.apps[index]
+        if await app.is_running():
+            await app.terminate()
+        for listener in self._retire_listeners:
+            await listener(app)
+
+    async def terminate(self) -> None:
+        for index in list(self._launched):
+            await self._retire(index)
+
+    # Pool level health, mirroring the ManagedApp heartbeat interface over launched instances
+    async def is_running(self) -> bool:
+        return all([await self.apps[index].is_running() for index in self._launched])
+
+    async def is_interactable(self) -> bool:
+        return all(
+            [await self.apps[index].is_interactable() for index in self._launched]
+        )
+
+    async def is_locatable(self) -> bool:
+        return all([await self.apps[index].is_locatable() for index in self._launched])
+
+    def describe(self) -> list[dict]:
+        return [
+            {
+                "instance": app.instance_id,
+                "launched": index in self._launched,
+                "leased": index not in self._idle,
+                "uses": self.uses[index],
+            }
+            for index, app in enumerate(self.apps)
+        ]
@@ -1,22 +1,177 @@
+import asyncio
+import os
+from typing import Any, Callable
+
 from apps.managed_app import ManagedApp
+from apps.mpv_ipc import MpvIpc
 from apps.types import ProcessConfig, ProcessProperties
+from assman_types import JSONType
+from config import config
+
+# Playback state kept current from IPC property-change events
+OBSERVED_PROPERTIES = ["pause", "idle-active", "path", "media-title", "eof-reached"]
 
 
 class MpvApp(ManagedApp):
-    process_config = ProcessConfig(
-        process_name="mpv",
-        process_params=["--player-operation-mode=pseudo-gui"],
-        wm_class_target="mpv",
-        wm_name_target="mpv",
-    )
+    @property
+    def name(self):
+        return "mpv"
 
-    process_properties: ProcessProperties | None = None
+    def __init__(self, instance_id: str = "default", display: str | None = None):
+        self.instance_id = instance_id
+        self.display = display
+        self.ipc_socket = os.path.join(
+            config.MPV_IPC_DIR, f"assman-mpv-{instance_id}.sock"
+        )
+        self.process_config = ProcessConfig(
+            process_name="mpv",
+            process_params=[
+                "--player-operation-mode=pseudo-gui",
+                "--idle=yes",
+                f"--input-ipc-server={self.ipc_socket}",
+            ],
+            wm_class_target="mpv",
+            wm_name_target="mpv",
+        )
+        self.process_properties: ProcessProperties | None = None
+        self.ipc: MpvIpc | None = None
+        # Registered with every IPC connection, so they outlive relaunches
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
 
-    def can_locate_window(self) -> bool:
-        return True
+    async def launch(self, *, use_class_target=True, use_name_target=True):
+        await self.close_ipc()
+        # A socket left behind by a killed instance would refuse connections
+        if os.path.exists(self.ipc_socket):
+            os.unlink(self.ipc_socket)
+        running = await super().launch(
+            use_class_target=use_class_target, use_name_target=use_name_target
+        )
+        self.ipc = MpvIpc(self.ipc_socket, config.MPV_IPC_TIMEOUT)
+        for listener in self._listeners:
+            self.ipc.add_listener(listener)
+        await self.ipc.connect(config.POLL_TIMEOUT, config.POLL_INTERVAL)
+        for name in OBSERVED_PROPERTIES:
+            await self.ipc.observe(name)
+        return running
+
+    async def close_ipc(self):
+        if self.ipc:
+            await self.ipc.close()
+            self.ipc = None
+
+    async def terminate(self) -> bool:
+        await self.close_ipc()
+        return await super().terminate()
 
-    def can_interact(self) -> bool:
+    def add_listener(self, listener: Callable[[dict[str, Any]], None]) -> None:
+        """Receive every mpv event, across relaunches; see MpvIpc.add_listener"""
+        self._listeners.append(listener)
+        if self.ipc:
+            self.ipc.add_listener(listener)
+
+    def get_ipc(self) -> MpvIpc:
+        if not (self.ipc and self.ipc.connected):
+            raise RuntimeError("mpv IPC is not connected")
+        return self.ipc
+
+    # Heartbeat implementations
+
+    async def is_locatable(self) -> bool:
+        return self.ipc is not None and self.ipc.connected
+
+    async def is_interactable(self) -> bool:
+        if not await self.is_locatable():
+            return False
+        try:
+            await self.get_ipc().command("get_property", "idle-active")
+        except (ConnectionError, RuntimeError, TimeoutError):
+            return False
         return True
 
     async def focus(self):
         pass
+
+    # Playback
+
+    def playback_state(self) -> dict[str, JSONType]:
+        properties = self.ipc.properties if self.ipc else {}
+        return {
+            "instance": self.instance_id,
+            "path": properties.get("path"),
+            "title": properties.get("media-title"),
+            "paused": properties.get("pause"),
+            "idle": properties.get("idle-active"),
+        }
+
+    async def query_playback_state(self) -> dict[str, JSONType]:
+        """playback_state() read over IPC rather than from property-change events, which may
+        still be in flight after a command
+        """
+        ipc = self.get_ipc()
+
+        async def query(name: str) -> JSONType:
+            try:
+                return await ipc.command("get_property", name)
+            except RuntimeError:
+                # Unavailable, i.e. path while idle
+                return None
+
+        path, title, paused, idle = await asyncio.gather(
+            query("path"), query("media-title"), query("pause"), query("idle-active")
+        )
+        return {
+            "instance": self.instance_id,
+            "path": path,
+            "title": title,
+            "paused": paused,
+            "idle": idle,
+        }
+
+    def in_use(self) -> bool:
+        # A paused file counts; recycling would lose it and its position
+        properties = self.ipc.properties if self.ipc else {}
+        return (
+            properties.get("idle-active") is False
+            and properties.get("path") is not None
+        )
+
+    def is_playing(self) -> bool:
+        properties = self.ipc.properties if self.ipc else {}
+        return (
+            properties.get("idle-active") is False and properties.get("pause") is False
+        )
+
+    async def play(self, path: str, append: bool = False) -> None:
+        """Load `path`, returning once mpv has opened it, or straight away when it is queued
+        behind a file still playing
+
+        Raises:
+            RuntimeError if mpv fails to open the file
+            TimeoutError if it is not opened within MPV_LOAD_TIMEOUT
+        """
+        ipc = self.get_ipc()
+        loaded = None
+        if not append or ipc.properties.get("idle-active") is not False:
+            # Replacing ends the current file first, with reason "stop"; only the new file's
+            # outcome counts
+            loaded = ipc.expect_event(
+                lambda event: event.get("event") == "file-loaded"
+                or (event.get("event") == "end-file" and event.get("reason") == "error")
+            )
+        try:
+            await ipc.command("loadfile", path, "append-play" if append else "replace")
+            await ipc.set_property("pause", False)
+            if loaded is None:
+                return
+            event = await asyncio.wait_for(loaded, config.MPV_LOAD_TIMEOUT)
+        finally:
+            if loaded is not None:
+                loaded.cancel()
+        if event.get("event") == "end-file":
+            raise RuntimeError(f"mpv failed to load {path}: {event.get('file_error')}")
+
+    async def set_paused(self, paused: bool) -> None:
+        await self.get_ipc().set_property("pause", paused)
+
+    async def stop(self) -> None:
+        await self.get_ipc().command("stop")
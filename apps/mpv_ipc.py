@@ -0,0 +1,174 @@
+import asyncio
+import itertools
+import json
+from typing import Any, Callable
+
+from assman_types import JSONType
+
+
+class MpvIpc:
+    """Persistent connection to an mpv JSON IPC socket (--input-ipc-server).
+
+    Commands are pipelined: each request carries a request_id and awaits its own reply, so
+    several may be in flight at once. Properties registered with observe() are kept current
+    from mpv's property-change events and read without a round-trip.
+
+    Args:
+        socket_path: Path mpv was launched with via --input-ipc-server.
+        timeout: Seconds to wait for a command reply.
+    """
+
+    def __init__(self, socket_path: str, timeout: float):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.properties: dict[str, JSONType] = {}
+        self._reader: asyncio.StreamReader | None = None
+        self._writer: asyncio.StreamWriter | None = None
+        self._read_task: asyncio.Task | None = None
+        self._pending: dict[int, asyncio.Future] = {}
+        self._request_ids = itertools.count(1)
+        self._observe_ids = itertools.count(1)
+        self._observed: dict[int, str] = {}
+        self._listeners: list[Callable[[dict[str, Any]], None]] = []
+        self._expected: list[
+            tuple[Callable[[dict[str, Any]], bool], asyncio.Future]
+        ] = []
+
+    @property
+    def connected(self) -> bool:
+        return self._read_task is not None and not self._read_task.done()
+
+    async def connect(self, timeout: float, interval: float) -> None:
+        """Open the socket, retrying until mpv has created it or `timeout` elapses"""
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            try:
+                self._reader, self._writer = await asyncio.open_unix_connection(
+                    self.socket_path
+                )
+                break
+            except (FileNotFoundError, ConnectionRefusedError):
+                if loop.time() >= deadline:
+                    raise RuntimeError(
+                        f"mpv IPC socket {self.socket_path} did not become available"
+                    )
+                await asyncio.sleep(interval)
+        self._read_task = asyncio.create_task(self._read_loop())
+
+    async def close(self) -> None:
+        if self._read_task:
+            self._read_task.cancel()
+            try:
+                await self._read_task
+            except asyncio.CancelledError:
+                pass
+            self._read_task = None
+        if self._writer:
+            self._writer.close()
+            try:
+                await self._writer.wait_closed()
+            except (ConnectionError, BrokenPipeError):
+                pass
+            self._writer = self._reader = None
+        self._fail_pending(ConnectionError("mpv IPC connection closed"))
+        self._observed.clear()
+        self.properties.clear()
+
+    def add_listener(self, listener: Callable[[dict[str, Any]], None]) -> None:
+        """Receive every event mpv sends (property-change, end-file, ...)"""
+        self._listeners.append(listener)
+
+    def expect_event(
+        self, predicate: Callable[[dict[str, Any]], bool]
+    ) -> asyncio.Future:
+        """Future for the next event matching `predicate`; create it before sending the command
+        which triggers the event
+        """
+        event = asyncio.get_running_loop().create_future()
+        self._expected.append((predicate, event))
+        return event
+
+    async def command(self, *args: JSONType) -> JSONType:
+        """Send a command and return its `data`
+
+        Raises:
+            ConnectionError if not connected
+            RuntimeError if mpv reports an error
+            TimeoutError if no reply arrives within the timeout
+        """
+        if not (self.connected and self._writer):
+            raise ConnectionError("mpv IPC is not connected")
+        request_id = next(self._request_ids)
+        reply = asyncio.get_running_loop().create_future()
+        self._pending[request_id] = reply
+        try:
+            self._writer.write(
+                json.dumps({"command": list(args), "request_id": request_id}).encode()
+                + b"\n"
+            )
+            await self._writer.drain()
+            response = await asyncio.wait_for(reply, self.timeout)
+        finally:
+            self._pending.pop(request_id, None)
+        if response.get("error") != "success":
+            raise RuntimeError(f"mpv command {args[0]} failed: {response.get('error')}")
+        return response.get("data")
+
+    async def get_property(self, name: str) -> JSONType:
+        if name in self.properties:
+            return self.properties[name]
+        return await self.command("get_property", name)
+
+    async def set_property(self, name: str, value: JSONType) -> None:
+        await self.command("set_property", name, value)
+
+    async def observe(self, name: str) -> None:
+        """Track a property from change events; its current value arrives as the first event"""
+        if name in self._observed.values():
+            return
+        observe_id = next(self._observe_ids)
+        self._observed[observe_id] = name
+        await self.command("observe_property", observe_id, name)
+
+    async def _read_loop(self) -> None:
+        assert self._reader
+        try:
+            while line := await self._reader.readline():
+                try:
+                    message = json.loads(line)
+                except ValueError:
+                    continue
+                if "request_id" in message and "event" not in message:
+                    reply = self._pending.get(message["request_id"])
+                    if reply and not reply.done():
+                        reply.set_result(message)
+                    continue
+                self._on_event(message)
+        finally:
+            self._fail_pending(ConnectionError("mpv IPC connection lost"))
+
+    def _on_event(self, event: dict[str, Any]) -> None:
+        if (
+            event.get("event") == "property-change"
+            and event.get("id") in self._observed
+        ):
+            self.properties[self._observed[event["id"]]] = event.get("data")
+        for predicate, expected in list(self._expected):
+            if expected.done():
+                self._expected.remove((predicate, expected))
+            elif predicate(event):
+                expected.set_result(event)
+                self._expected.remove((predicate, expected))
+        for listener in self._listeners:
+            listener(event)
+
+    def _fail_pending(self, error: Exception) -> None:
+        for reply in self._pending.values():
+            if not reply.done():
+                reply.set_exception(error)
+        self._pending.clear()
+        for _, expected in self._expected:
+            if not expected.done():
+                expected.set_exception(error)
+        self._expected.clear()
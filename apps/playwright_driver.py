@@ -0,0 +1,32 @@
+from __future__ import annotations
+
+import asyncio
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from playwright.async_api import Playwright
+
+# One Playwright driver (node subprocess) per process, shared by every session
+_driver: Playwright | None = None
+_driver_lock = asyncio.Lock()
+
+
+async def get_playwright() -> Playwright:
+    """Return the process wide Playwright driver, starting it on first use"""
+    global _driver
+    async with _driver_lock:
+        if _driver is None:
+            # Deferred so that importing stop_playwright() does not load Playwright
+            from playwright.async_api import async_playwright
+
+            _driver = await async_playwright().start()
+        return _driver
+
+
+async def stop_playwright() -> None:
+    """Stop the process wide Playwright driver; sessions must have disconnected first"""
+    global _driver
+    async with _driver_lock:
+        if _driver is not None:
+            await _driver.stop()
+            _driver = None
@@ -7,6 +7,79 @@ class AppConfig:
     POLL_TIMEOUT: float = float(os.getenv("POLL_TIMEOUT", 6.0))
     POLL_INTERVAL: float = float(os.getenv("POLL_INTERVAL", 0.1))
     DISCORD_RPC_PORT: int = 9222
+    # Concurrent Discord instances; instance n uses DISCORD_RPC_PORT + n
+    DISCORD_INSTANCES: int = int(os.getenv("DISCORD_INSTANCES", 1))
+    # Per instance profiles live under this root; instance 0 uses Discord's default when unset
+    DISCORD_USER_DATA_ROOT: str | None = os.getenv("DISCORD_USER_DATA_ROOT")
+    # Instance n launches on display :(base + n); all instances inherit DISPLAY when unset
+    DISCORD_DISPLAY_BASE: int | None = (
+        int(os.environ["DISCORD_DISPLAY_BASE"])
+        if "DISCORD_DISPLAY_BASE" in os.environ
+        else None
+    )
+    # mpv pool: instance count, leases before recycling, and resident memory recycle threshold
+    MPV_POOL_SIZE: int = int(os.getenv("MPV_POOL_SIZE", 2))
+    MPV_MAX_USES: int = int(os.getenv("MPV_MAX_USES", 50))
+    MPV_MAX_MEMORY_MB: int = int(os.getenv("MPV_MAX_MEMORY_MB", 512))
+    # Directory holding per instance mpv JSON IPC sockets, and the per command reply timeout
+    MPV_IPC_DIR: str = os.getenv("MPV_IPC_DIR", "/tmp")
+    MPV_IPC_TIMEOUT: float = float(os.getenv("MPV_IPC_TIMEOUT", 2.0))
+    # Seconds PLAY waits for mpv to open a file (streams resolve through ytdl) before failing
+    MPV_LOAD_TIMEOUT: float = float(os.getenv("MPV_LOAD_TIMEOUT", 30.0))
+    # Supervisor restart limits: budget per window, exponential backoff, open circuit cooldown
+    RESTART_BUDGET: int = int(os.getenv("RESTART_BUDGET", 3))
+    RESTART_WINDOW: float = float(os.getenv("RESTART_WINDOW", 300.0))
+    RESTART_BACKOFF_BASE: float = float(os.getenv("RESTART_BACKOFF_BASE", 2.0))
+    RESTART_BACKOFF_MAX: float = float(os.getenv("RESTART_BACKOFF_MAX", 60.0))
+    CIRCUIT_COOLDOWN: float = float(os.getenv("CIRCUIT_COOLDOWN", 120.0))
+    # Keep a second launched + attached instance per controller to fail over to
+    HOT_STANDBY: bool = os.getenv("HOT_STANDBY", "0") == "1"
+    # Standby Discord instances use DISCORD_RPC_PORT + instance + this offset
+    DISCORD_STANDBY_PORT_OFFSET: int = int(
+        os.getenv("DISCORD_STANDBY_PORT_OFFSET", 100)
+    )
+    # Total time to wait for the CDP debug port to answer, and the initial retry delay
+    CDP_DISCOVERY_TIMEOUT: float = float(os.getenv("CDP_DISCOVERY_TIMEOUT", 10.0))
+    CDP_DISCOVERY_BACKOFF: float = float(os.getenv("CDP_DISCOVERY_BACKOFF", 0.05))
+    # Category expansion budget: base allowance plus an allowance per collapsed category found
+    EXPAND_BASE_TIMEOUT: float = float(os.getenv("EXPAND_BASE_TIMEOUT", 2.0))
+    EXPAND_CATEGORY_TIMEOUT: float = float(os.getenv("EXPAND_CATEGORY_TIMEOUT", 0.25))
+    # Absolute cap on category expansion, however many categories are found
+    EXPAND_MAX_TIMEOUT: float = float(os.getenv("EXPAND_MAX_TIMEOUT", 30.0))
+    # Upper bound on waiting for older messages after each scroll, and empty chunks tolerated
+    MESSAGE_CHUNK_TIMEOUT: float = float(os.getenv("MESSAGE_CHUNK_TIMEOUT", 2.0))
+    MESSAGE_IDLE_CHUNKS: int = int(os.getenv("MESSAGE_IDLE_CHUNKS", 3))
+    # Time allowed for a sent message to be acknowledged in the message list
+    MESSAGE_SEND_TIMEOUT: float = float(os.getenv("MESSAGE_SEND_TIMEOUT", 5.0))
+    # Route read-only page queries over a raw CDPSession instead of Playwright locators
+    CDP_FAST_PATH: bool = os.getenv("CDP_FAST_PATH", "0") == "1"
+    # Build servers / channels from gateway and API traffic; reload to receive a fresh READY
+    NETWORK_CAPTURE: bool = os.getenv("NETWORK_CAPTURE", "0") == "1"
+    NETWORK_CAPTURE_RELOAD: bool = os.getenv("NETWORK_CAPTURE_RELOAD", "0") == "1"
+    # Seconds a validated server / channel locator is trusted before being re-checked
+    LOCATOR_TTL: float = float(os.getenv("LOCATOR_TTL", 30.0))
+    LOCATOR_REBUILD_TIMEOUT: float = float(os.getenv("LOCATOR_REBUILD_TIMEOUT", 2.0))
+    # Root log level, per module overrides ('controllers.AppController=DEBUG,apps=WARNING'),
+    # output format ('json' or 'text') and the minimum interval between repeated heartbeat lines
+    LOG_LEVEL: str = os.getenv("LOG_LEVEL", "INFO")
+    LOG_LEVELS: str = os.getenv("LOG_LEVELS", "")
+    LOG_FORMAT: str = os.getenv("LOG_FORMAT", "json")
+    LOG_RATE_LIMIT_INTERVAL: float = float(os.getenv("LOG_RATE_LIMIT_INTERVAL", 60.0))
+    # JSON lines file each finished task trace is appended to, in OTLP/JSON form; off when unset
+    TRACE_EXPORT_PATH: str | None = os.getenv("TRACE_EXPORT_PATH")
+    # Event loop watchdog: enabled at startup, tick interval, stall treated as blocking, and
+    # minimum duration of a single callback reported as a slow coroutine step
+    LOOP_WATCHDOG: bool = os.getenv("LOOP_WATCHDOG", "0") == "1"
+    LOOP_WATCHDOG_INTERVAL: float = float(os.getenv("LOOP_WATCHDOG_INTERVAL", 0.05))
+    LOOP_BLOCK_THRESHOLD: float = float(os.getenv("LOOP_BLOCK_THRESHOLD", 0.25))
+    LOOP_SLOW_STEP_THRESHOLD: float = float(os.getenv("LOOP_SLOW_STEP_THRESHOLD", 0.02))
+    # Sampling profiler: thread stack and asyncio task stack sample intervals, and the longest
+    # profile an admin request may ask for
+    PROFILER_INTERVAL: float = float(os.getenv("PROFILER_INTERVAL", 0.01))
+    PROFILER_TASK_INTERVAL: float = float(os.getenv("PROFILER_TASK_INTERVAL", 0.05))
+    PROFILER_MAX_DURATION: float = float(os.getenv("PROFILER_MAX_DURATION", 300.0))
+    # Quiet period without DOM mutations before the page is considered settled
+    DOM_SETTLE_INTERVAL: float = float(os.getenv("DOM_SETTLE_INTERVAL", 0.1))
 
 
 config = AppConfig()
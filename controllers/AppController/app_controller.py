@@ -1,11 +1,17 @@
 import asyncio
+import inspect
+import logging
 import time
 from abc import ABC, abstractmethod
 from asyncio.queues import Queue
-from typing import Any, Dict, Generic
+from contextlib import asynccontextmanager
+from dataclasses import replace
+from typing import Any, AsyncIterator, Dict, Generic
 from uuid import UUID
 
 from assman_types import JSONType
+from config import config
+from controllers.AppController.supervisor import Supervisor
 from controllers.apptask import AppTask, TaskStatus
 from controllers.controller_types import (
     ActivityHealthCheck,
@@ -14,6 +20,7 @@ from controllers.controller_types import (
     AppBroadcastType,
     AppHealthCheckType,
     BaseHealthCheckType,
+    CircuitState,
     CoreHealthCheck,
     ExecutorCallable,
     Failure,
@@ -23,6 +30,16 @@ from controllers.controller_types import (
     ManagedAppType,
     ValidatorCallable,
 )
+from utils.metrics import (
+    HEALTH_CHECK_DURATION,
+    HEALTH_CHECK_FAILURES,
+    TASK_DURATION,
+    TASK_QUEUE_DEPTH,
+    TASK_QUEUE_WAIT,
+)
+from utils.tracing import export_trace, span, start_trace, use_span
+
+logger = logging.getLogger(__name__)
 
 
 class AppController(
@@ -31,13 +48,34 @@ class AppController(
 ):
     """Base implementation of common AppController descendant components"""
 
-    def __init__(self, broadcaster):
+    # Concurrent process_tasks loops; only pooled controllers can usefully run more than one
+    task_workers: int = 1
+
+    def __init__(self, broadcaster, hot_standby: bool = config.HOT_STANDBY):
         self.broadcaster = broadcaster
         self.task_queue: Queue[UUID] = asyncio.Queue()
         self.active_tasks: Dict[UUID, AppTask] = {}
         self.health_status: HealthState = HealthState.UNINITIALISED
         self.activity: AppActivity | None = None
-        self.base_health_checks: list[CoreHealthCheck] = [
+        self.base_health_checks: list[CoreHealthCheck] = (
+            self._build_base_health_checks()
+        )
+        self.supervisor = Supervisor(self.rectify_state, self._on_circuit_change)
+        self._task_supervisor: asyncio.Task | None = None
+        self._event_tasks: set[asyncio.Task] = set()
+        self._running: bool = False
+        # Set by stop() and cleared by start(); a restart still pending then must not undo it
+        self._stop_requested: bool = False
+        # Tasks dequeued and still executing, which the queue no longer counts
+        self.running_tasks: int = 0
+        # Hot standby: a second launched + prepared app instance to fail over to
+        self.hot_standby = hot_standby
+        self.standby_app: ManagedAppType | None = None
+        self._standby_task: asyncio.Task | None = None
+
+    def _build_base_health_checks(self) -> list[CoreHealthCheck]:
+        # Checks bind the current app's methods; rebuilt whenever the app is swapped
+        return [
             CoreHealthCheck(
                 check_type=BaseHealthCheckType.RUNNING, executor=self.app.is_running
             ),
@@ -49,33 +87,55 @@ class AppController(
                 check_type=BaseHealthCheckType.VISIBLE, executor=self.app.is_locatable
             ),
         ]
-        self._task_supervisor: asyncio.Task | None = None
-        self._task_failures: asyncio.Queue[Failure] = asyncio.Queue()
-        self._event_tasks: set[asyncio.Task] = set()
-        self._running: bool = False
 
     @property
     def app_name(self) -> str:
         """Define ManagedApp subclass name for controller"""
         return self.app.name
 
+    def _log_fields(self, **fields: Any) -> dict[str, Any]:
+        """Structured fields identifying this controller, for a logging call's `extra`"""
+        return {"app": self.app_name, "instance": self.app.instance_id, **fields}
+
     async def broadcast(
         self, broadcast_type: AppBroadcastType, payload: dict[str, JSONType]
     ):
         """Broadcast standardiser for websocket response"""
         msg = {
             "app": self.app_name,
+            "instance": self.app.instance_id,
             "message_type": broadcast_type.value,
             "payload": payload,
         }
         await self.broadcaster.broadcast(msg)
 
     # Heartbeat / Health supervisor
-    async def _supervise(self):
-        while True:
-            failure_type = await self._task_failures.get()
-            if failure_type is Failure.CRITICAL:
-                await self.rectify_state()
+    async def _on_circuit_change(self, state: CircuitState) -> None:
+        if state is CircuitState.OPEN:
+            self.health_status = HealthState.ERROR
+            await self.broadcast_health(is_error=True)
+
+    # Activity
+    async def start_activity(
+        self, activity_type: AppActivityType, initialiser: str | None = None
+    ) -> None:
+        """Enter an activity, enabling its activity health checks from the next heartbeat"""
+        self.activity = AppActivity(
+            activity_type=activity_type, initialiser=initialiser, start_time=time.time()
+        )
+        await self.broadcast(
+            broadcast_type=AppBroadcastType.ACTIVITY_START,
+            payload=self.activity.to_dict(),
+        )
+
+    async def end_activity(self, terminator: str | None = None) -> None:
+        if self.activity is None:
+            return
+        ended = replace(self.activity, end_time=time.time(), terminator=terminator)
+        self.activity = None
+        await self.broadcast(
+            broadcast_type=AppBroadcastType.ACTIVITY_END, payload=ended.to_dict()
+        )
 
     # Heartbeat + Healthchecks
     async def broadcast_health(self, is_error: bool = False):
@@ -89,21 +149,30 @@ class AppController(
             payload={
                 "activity": self.activity.to_dict() if self.activity else None,
                 "health_status": self.health_status.value,
+                "circuit": self.supervisor.circuit.value,
             },
         )
 
     async def start(self):
-        print(f"Starting {self.app_name} controller")
+        logger.info("Starting controller", extra=self._log_fields())
         if self._task_supervisor is None:
             # Start once, allow start() calls after init
-            asyncio.create_task(self._supervise())
+            self._task_supervisor = asyncio.create_task(
+                self.supervisor.run(), name="supervisor"
+            )
         self.health_status = HealthState.STARTING
         self._running = True
-        await self.app.launch()
+        self._stop_requested = False
+        await self.launch_app()
         self._event_tasks.add(asyncio.create_task(self.heartbeat(), name="heartbeat"))
-        self._event_tasks.add(
-            asyncio.create_task(self.process_tasks(), name="process_tasks")
-        )
+        for worker in range(self.task_workers):
+            self._event_tasks.add(
+                asyncio.create_task(
+                    self.process_tasks(), name=f"process_tasks_{worker}"
+                )
+            )
+        if self.hot_standby:
+            self._schedule_standby()
 
     def is_running(self):
         return self._running
@@ -111,7 +180,21 @@ class AppController(
     async def stop(self):
         if not self._running:
             raise RuntimeError("Cannot stop non-running controller")
-
+        self._stop_requested = True
+        await self._stop_supervisor()
+        await self._teardown()
+
+    async def _stop_supervisor(self) -> None:
+        # Cancels a restart pending or in progress; start() runs a new supervisor loop
+        if self._task_supervisor is not None:
+            self._task_supervisor.cancel()
+            await asyncio.gather(self._task_supervisor, return_exceptions=True)
+            self._task_supervisor = None
+
+    async def _teardown(self) -> None:
+        """Stop the event loops, standby and app, without touching the supervisor, which may
+        be the caller
+        """
         self._running = False
         self.health_status = HealthState.STOPPED
 
@@ -122,10 +205,29 @@ class AppController(
         await asyncio.gather(*self._event_tasks, return_exceptions=True)
 
         self._event_tasks.clear()
+        await self._discard_standby()
+        await self.terminate_app()
+
+    async def shutdown(self) -> None:
+        """Stop the controller if it is running, on process shutdown"""
+        if self._running:
+            await self.stop()
+        else:
+            await self._stop_supervisor()
+
+    async def launch_app(self) -> None:
+        await self.app.launch()
+
+    async def terminate_app(self) -> None:
         await self.app.terminate()
 
+    @asynccontextmanager
+    async def lease_app(self, task: AppTask) -> AsyncIterator[ManagedAppType]:
+        """App instance a task executes against; the single controlled app by default"""
+        yield self.app
+
     async def handle_check_failures(self, failed_checks: list[HealthCheckT]) -> None:
-        print(f"Handling failures for {self.app_name} controller")
+        logger.info("Handling health check failures", extra=self._log_fields())
         generic_core_failed_checks = [
             check
             for check in failed_checks
@@ -157,22 +259,115 @@ class AppController(
             await self.handle_activity_health_failures(app_activity_failed_checks)
 
     def report_failure(self, failure_type: Failure):
-        if failure_type is Failure.CRITICAL:
-            # Don't wait to report.
-            self._task_failures.put_nowait(Failure.CRITICAL)
+        # Don't wait to report; the supervisor coalesces repeated reports
+        self.supervisor.report(failure_type)
 
     async def rectify_state(self) -> None:
-        print(f"Rectifying state (restarting) for {self.app_name} controller")
-        # NOT final implementation; but functional restarting
-        await self.stop()
+        if self._stop_requested:
+            logger.info(
+                "Skipping restart of a controller stopped by request",
+                extra=self._log_fields(),
+            )
+            return
+        if await self.fail_over():
+            return
+        logger.warning("Rectifying state (restarting)", extra=self._log_fields())
+        # NOT final implementation; but functional restarting. A previous attempt may have left
+        # the app partially started or already torn down
+        if self._running:
+            await self._teardown()
         await self.start()
 
+    # Hot standby
+    def _schedule_standby(self) -> None:
+        if self._standby_task is None or self._standby_task.done():
+            self._standby_task = asyncio.create_task(
+                self.warm_standby(), name="warm_standby"
+            )
+
+    async def warm_standby(self, retired_app: ManagedAppType | None = None) -> None:
+        """Launch and prepare a standby app in the background, after retiring the failed app
+        whose resources (i.e. ports, profiles) the new standby may reuse.
+        """
+        if retired_app is not None:
+            try:
+                await retired_app.terminate()
+            except Exception as e:
+                logger.error(
+                    "Failed to terminate retired instance: %s",
+                    e,
+                    extra=self._log_fields(),
+                )
+        standby = self.create_standby_app()
+        try:
+            await standby.launch()
+            await self.prepare_app(standby)
+        except asyncio.CancelledError:
+            if await standby.is_running():
+                await standby.terminate()
+            raise
+        except Exception as e:
+            logger.error("Failed to warm standby: %s", e, extra=self._log_fields())
+            if await standby.is_running():
+                await standby.terminate()
+            return
+        self.standby_app = standby
+        logger.info("Standby ready", extra=self._log_fields())
+
+    async def fail_over(self) -> bool:
+        """Swap to the standby app if one is ready; queued tasks run against it unchanged as
+        executors resolve self.app at execution time.
+
+        Returns:
+            Whether a fail over took place.
+        """
+        standby = self.standby_app
+        if standby is None or not await standby.is_running():
+            return False
+        logger.warning("Failing over to standby", extra=self._log_fields())
+        self.standby_app = None
+        retired_app = self.app
+        self.set_app(standby)
+        self.base_health_checks = self._build_base_health_checks()
+        self.health_status = HealthState.HEALTHY
+        await self.broadcast_health()
+        self._standby_task = asyncio.create_task(
+            self.warm_standby(retired_app), name="warm_standby"
+        )
+        return True
+
+    async def _discard_standby(self) -> None:
+        if self._standby_task and not self._standby_task.done():
+            self._standby_task.cancel()
+            await asyncio.gather(self._standby_task, return_exceptions=True)
+        self._standby_task = None
+        if self.standby_app is not None:
+            standby, self.standby_app = self.standby_app, None
+            if await standby.is_running():
+                await standby.terminate()
+
+    def create_standby_app(self) -> ManagedAppType:
+        """Construct a second app instance able to run alongside self.app"""
+        raise NotImplementedError(
+            f"{self.app_name} controller does not support hot standby"
+        )
+
+    def set_app(self, app: ManagedAppType) -> None:
+        """Replace the controlled app instance, used when failing over to a standby"""
+        raise NotImplementedError(
+            f"{self.app_name} controller does not support hot standby"
+        )
+
+    async def prepare_app(self, app: ManagedAppType) -> None:
+        """Bring a freshly launched app instance to a ready-to-serve state"""
+        pass
+
     def get_health_checks(self) -> list[HealthCheckT]:
-        print(f"Fetching health checks for {self.app_name} controller")
         checks: list[HealthCheckT] = [*self.base_health_checks, *self.app_health_checks]
         if self.activity:
-            print(
-                f"Found activity: {self.activity.activity_type.value} getting health checks for {self.app_name} controller"
+            logger.debug(
+                "Including activity health checks",
+                extra=self._log_fields(activity=self.activity.activity_type.value),
             )
             current_activity_checks = self.activity_health_checks.get(
                 self.activity.activity_type
@@ -189,26 +384,65 @@ class AppController(
         try:
             while self._running:
                 await asyncio.sleep(5)
-                print(f"Doing heartbeat for {self.app_name} controller")
+                logger.debug(
+                    "Doing heartbeat",
+                    extra=self._log_fields(rate_limit=f"heartbeat:{id(self)}"),
+                )
                 checks_to_run = self.get_health_checks()
                 failed_checks = []
                 for check in checks_to_run:
-                    print(f"Running health check: {check.check_type.value}")
-                    if not await check.execute():
+                    if not await self._run_health_check(check):
                         failed_checks.append(check)
                 if failed_checks:
-                    print(f"Health Checks failed: {failed_checks}")
+                    logger.warning(
+                        "Health checks failed",
+                        extra=self._log_fields(
+                            failed_checks=[
+                                check.check_type.value for check in failed_checks
+                            ]
+                        ),
+                    )
                     await self.handle_check_failures(failed_checks)
                 else:
-                    print(f"All checks passed for {self.app_name} controller heartbeat")
+                    logger.info(
+                        "All health checks passed",
+                        extra=self._log_fields(rate_limit=f"heartbeat_ok:{id(self)}"),
+                    )
                     # All checks passed: Single truth for healthy state in application
                     self.health_status = HealthState.HEALTHY
                 await self.broadcast_health()
         except asyncio.CancelledError:
-            print(f"Heartbeat routine cancelled for {self.app_name} controller")
+            logger.info("Heartbeat routine cancelled", extra=self._log_fields())
             self.health_status = HealthState.STOPPED
             raise
 
+    async def _run_health_check(self, check: HealthCheckT) -> bool:
+        started = time.perf_counter()
+        passed = False
+        try:
+            passed = await check.execute()
+            return passed
+        finally:
+            HEALTH_CHECK_DURATION.observe(
+                time.perf_counter() - started,
+                app=self.app_name,
+                check_type=check.check_type.value,
+            )
+            if not passed:
+                HEALTH_CHECK_FAILURES.inc(
+                    app=self.app_name, check_type=check.check_type.value
+                )
+
+    @property
+    def load(self) -> int:
+        """Tasks queued or executing"""
+        return self.task_queue.qsize() + self.running_tasks
+
+    def _record_queue_depth(self) -> None:
+        TASK_QUEUE_DEPTH.set(
+            self.task_queue.qsize(), app=self.app_name, instance=self.app.instance_id
+        )
+
     # Task runner
     async def submit_task(
         self, task_type: ManagedAppTaskType, params: Dict[str, Any]
@@ -223,28 +457,39 @@ class AppController(
         Returns:
             The UUID of the newly created task, allowing the submitter (i.e. FastAPI route handler -> Frontend) to track status of task.
         """
-        print(f"Submitting task {task_type.value} for {self.app_name} controller")
+        if self.supervisor.circuit_open:
+            raise RuntimeError(
+                f"Task submission rejected - {self.app_name} controller circuit is open after repeated restart failures"
+            )
         param_validator = self.validators.get(task_type)
         if not param_validator:
             raise ValueError(
                 f"Task validation failed - no validator found for task of type {task_type.value}"
             )
-        try:
-            param_validator(params)
-        except ValueError as e:
-            raise ValueError(f"Task: {task_type} failed with message: {str(e)}")
-        task = AppTask(
-            task_type=task_type,
-            params=params,
-        )
-        await self.broadcast(
-            broadcast_type=AppBroadcastType.TASK_CREATE, payload=task.to_dict()
+        root = start_trace(
+            "task",
+            app=self.app_name,
+            instance=self.app.instance_id,
+            task_type=task_type.value,
         )
+        with use_span(root):
+            try:
+                with span("validate"):
+                    param_validator(params)
+            except ValueError as e:
+                raise ValueError(f"Task: {task_type} failed with message: {str(e)}")
+            task = AppTask(task_type=task_type, params=params, span=root)
+            root.attributes["task_id"] = str(task.id)
+            await self.broadcast(
+                broadcast_type=AppBroadcastType.TASK_CREATE, payload=task.to_dict()
+            )
         self.active_tasks[task.id] = task
-        print(
-            f"Enqueing task {task.id} {task.task_type.value} for {self.app_name} controller"
+        logger.debug(
+            "Enqueued task",
+            extra=self._log_fields(task_id=str(task.id), task_type=task_type.value),
         )
         await self.task_queue.put(task.id)
+        self._record_queue_depth()
         return task.id
 
     async def process_tasks(self):
@@ -270,55 +515,126 @@ class AppController(
         try:
             while self._running:
                 task_id = await self.task_queue.get()
+                self._record_queue_depth()
                 task = self.active_tasks[task_id]  # Access new entry
-                print(f"Found task: {task_id} in controller for {self.app_name}")
-
-                task.status = TaskStatus.RUNNING
-                task.started_at = time.time()
-
-                await self.broadcast(
-                    broadcast_type=AppBroadcastType.TASK_RUNNING, payload=task.to_dict()
-                )
-
+                self.running_tasks += 1
                 try:
-                    await self.execute_task(task)
-                    task.status = TaskStatus.COMPLETED
-                    task.finished_at = time.time()
-                    await self.broadcast(
-                        broadcast_type=AppBroadcastType.TASK_FINISH,
-                        payload=task.to_dict(),
-                    )
-                except Exception as e:
-                    task.status = TaskStatus.FAILED
-                    task.finished_at = time.time()
-                    task.error = str(e)
-                    await self.broadcast(
-                        broadcast_type=AppBroadcastType.TASK_ERROR,
-                        payload=task.to_dict(),
-                    )
+                    with use_span(task.span):
+                        await self.run_task(task)
                 finally:
+                    self.running_tasks -= 1
                     self.task_queue.task_done()
         except asyncio.CancelledError:
-            print(f"Cancelling task runner routine for {self.app_name}")
+            logger.info("Cancelling task runner routine", extra=self._log_fields())
+            raise
+
+    async def run_task(self, task: AppTask) -> None:
+        """Execute a dequeued task, recording its outcome and broadcasting lifecycle events"""
+        task.status = TaskStatus.RUNNING
+        task.started_at = time.time()
+        if task.created_at:
+            TASK_QUEUE_WAIT.observe(
+                task.started_at - task.created_at,
+                app=self.app_name,
+                task_type=task.task_type.value,
+            )
+            if task.span:
+                queue_wait = task.span.child("queue_wait")
+                queue_wait.start_ns = int(task.created_at * 1e9)
+                queue_wait.end()
+
+        await self.broadcast(
+            broadcast_type=AppBroadcastType.TASK_RUNNING, payload=task.to_dict()
+        )
+
+        try:
+            with span("execute_task", task_type=task.task_type.value):
+                await self.execute_task(task)
+            task.status = TaskStatus.COMPLETED
+            task.finished_at = time.time()
+            logger.debug(
+                "Task completed",
+                extra=self._log_fields(
+                    task_id=str(task.id),
+                    task_type=task.task_type.value,
+                    duration=task.finished_at - task.started_at,
+                ),
+            )
+            await self.broadcast(
+                broadcast_type=AppBroadcastType.TASK_FINISH,
+                payload={**task.to_dict(), "trace": self._end_trace(task)},
+            )
+        except asyncio.CancelledError:
+            # Stopped, restarted or failed over mid task; report it rather than leave it RUNNING
+            logger.warning(
+                "Task cancelled",
+                extra=self._log_fields(
+                    task_id=str(task.id), task_type=task.task_type.value
+                ),
+            )
+            await self._fail_task(task, "Task cancelled")
             raise
+        except Exception as e:
+            logger.error(
+                "Task failed: %s",
+                e,
+                extra=self._log_fields(
+                    task_id=str(task.id), task_type=task.task_type.value
+                ),
+            )
+            await self._fail_task(task, str(e))
+        finally:
+            TASK_DURATION.observe(
+                (task.finished_at or time.time()) - task.started_at,
+                app=self.app_name,
+                task_type=task.task_type.value,
+                status=task.status.value,
+            )
+            if task.span and config.TRACE_EXPORT_PATH:
+                await export_trace(task.span.trace, config.TRACE_EXPORT_PATH)
+
+    async def _fail_task(self, task: AppTask, error: str) -> None:
+        task.status = TaskStatus.FAILED
+        task.finished_at = time.time()
+        task.error = error
+        await self.broadcast(
+            broadcast_type=AppBroadcastType.TASK_ERROR,
+            payload={**task.to_dict(), "trace": self._end_trace(task)},
+        )
+
+    def _end_trace(self, task: AppTask) -> dict[str, JSONType] | None:
+        """End the task's root span and summarise where its time went"""
+        if task.span is None:
+            return None
+        task.span.error = task.error
+        task.span.end()
+        return {**task.span.trace.summary(), "duration_ms": task.span.duration_ms}
 
     async def execute_task(self, task: AppTask) -> Any:
         """Route task to its corresponding executor, and broadcast responses.
 
         Retrieves executor via dictionary dispatcher mapping - executes it using app instance with
         AppTask provided parameters. Broadcasts result as an APP_RESPONSE if the executor returns a
-        ExecutorResponse.
+        ExecutorResponse. Streaming (async generator) executors instead have each yielded
+        ExecutorResponse broadcast as an APP_UPDATE as soon as it is produced.
 
         Raises:
             ValueError if no executor mapping is found for AppTaskType
         """
-        print(f"Attempting to execute task: {task.task_type.value}")
         executor = self.executors.get(task.task_type)
         if not executor:
             raise ValueError(
                 f"Execution failed - no executor found for task of type {task.task_type.value}"
             )
-        res = await executor(self.app, task.params)
+        async with self.lease_app(task) as app:
+            if inspect.isasyncgenfunction(executor):
+                async for update in executor(app, task.params):
+                    await self.broadcast(
+                        broadcast_type=AppBroadcastType.APP_UPDATE,
+                        payload={"task_id": str(task.id), **update.to_dict()},
+                    )
+                return
+            res = await executor(app, task.params)
         if res:
             await self.broadcast(
                 broadcast_type=AppBroadcastType.APP_RESPONSE, payload=res.to_dict()
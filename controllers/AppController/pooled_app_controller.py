@@ -0,0 +1,62 @@
+from contextlib import asynccontextmanager
+from typing import AsyncIterator
+
+from apps.managed_app_pool import ManagedAppPool
+from controllers.AppController.app_controller import AppController
+from controllers.apptask import AppTask
+from controllers.controller_types import (
+    AppActivityType,
+    AppHealthCheckType,
+    BaseHealthCheckType,
+    CoreHealthCheck,
+    ManagedAppTaskType,
+    ManagedAppType,
+)
+
+
+class PooledAppController(
+    AppController[
+        ManagedAppType, ManagedAppTaskType, AppActivityType, AppHealthCheckType
+    ]
+):
+    """AppController over a ManagedAppPool; runs one task worker per pooled instance, with each
+    task executing against an instance leased for its duration. Tasks may pin an instance with
+    an "instance" param.
+    """
+
+    def __init__(self, broadcaster, pool: ManagedAppPool[ManagedAppType]):
+        self.pool = pool
+        self.task_workers = pool.size
+        # A pool already provides spare instances; hot standby does not apply
+        super().__init__(broadcaster, hot_standby=False)
+
+    @property
+    def app(self) -> ManagedAppType:
+        """Representative instance, used for naming; tasks run against leased instances"""
+        return self.pool.apps[0]
+
+    def _build_base_health_checks(self) -> list[CoreHealthCheck]:
+        return [
+            CoreHealthCheck(
+                check_type=BaseHealthCheckType.RUNNING, executor=self.pool.is_running
+            ),
+            CoreHealthCheck(
+                check_type=BaseHealthCheckType.INTERACTABLE,
+                executor=self.pool.is_interactable,
+            ),
+            CoreHealthCheck(
+                check_type=BaseHealthCheckType.VISIBLE,
+                executor=self.pool.is_locatable,
+            ),
+        ]
+
+    async def launch_app(self) -> None:
+        await self.pool.start()
+
+    async def terminate_app(self) -> None:
+        await self.pool.terminate()
+
+    @asynccontextmanager
+    async def lease_app(self, task: AppTask) -> AsyncIterator[ManagedAppType]:
+        async with self.pool.lease(task.params.get("instance")) as app:
+            yield app
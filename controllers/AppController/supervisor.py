@@ -0,0 +1,131 @@
+import asyncio
+import logging
+import time
+from collections import deque
+from dataclasses import dataclass
+from typing import Awaitable, Callable
+
+from config import config
+from controllers.controller_types import CircuitState, Failure
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class RestartPolicy:
+    """Limits on how aggressively a Supervisor restarts its controller
+
+    Args:
+        budget: Restarts allowed within `window` before the circuit opens.
+        window: Seconds over which restarts are counted against the budget.
+        backoff_base: Delay before the second restart in a window, doubling for each after.
+        backoff_max: Upper bound on the restart delay.
+        cooldown: Seconds the circuit stays open before a single trial restart.
+    """
+
+    budget: int = config.RESTART_BUDGET
+    window: float = config.RESTART_WINDOW
+    backoff_base: float = config.RESTART_BACKOFF_BASE
+    backoff_max: float = config.RESTART_BACKOFF_MAX
+    cooldown: float = config.CIRCUIT_COOLDOWN
+
+
+class Supervisor:
+    """Single restart loop per controller, with exponential backoff, a restart budget per time
+    window and a circuit breaker.
+
+    Failures reported while a restart is pending or in progress are coalesced into it. Once the
+    budget is spent the circuit opens, submissions should be rejected, and after `cooldown` one
+    trial restart decides whether it closes again.
+
+    Args:
+        restart: Coroutine function restoring the controller to a working state.
+        on_circuit_change: Coroutine function notified with the new state when the circuit opens or closes.
+        policy: Restart limits, defaults from AppConfig.
+    """
+
+    def __init__(
+        self,
+        restart: Callable[[], Awaitable[None]],
+        on_circuit_change: Callable[[CircuitState], Awaitable[None]],
+        policy: RestartPolicy | None = None,
+    ):
+        self._restart = restart
+        self._on_circuit_change = on_circuit_change
+        self.policy = policy or RestartPolicy()
+        self.circuit: CircuitState = CircuitState.CLOSED
+        self._failures: asyncio.Queue[Failure] = asyncio.Queue()
+        self._restarts: deque[float] = deque()
+        self._handling = False
+
+    @property
+    def circuit_open(self) -> bool:
+        return self.circuit is CircuitState.OPEN
+
+    def report(self, failure_type: Failure) -> None:
+        if failure_type is not Failure.CRITICAL or self._handling:
+            # A restart is already pending or running; it covers this failure too
+            return
+        self._failures.put_nowait(failure_type)
+
+    def _drain(self) -> None:
+        while not self._failures.empty():
+            self._failures.get_nowait()
+
+    def _restarts_in_window(self) -> int:
+        horizon = time.monotonic() - self.policy.window
+        while self._restarts and self._restarts[0] < horizon:
+            self._restarts.popleft()
+        return len(self._restarts)
+
+    async def _set_circuit(self, state: CircuitState) -> None:
+        if self.circuit is state:
+            return
+        self.circuit = state
+        logger.warning(
+            "Supervisor circuit %s", state.value, extra={"circuit": state.value}
+        )
+        await self._on_circuit_change(state)
+
+    async def _attempt_restart(self) -> bool:
+        self._restarts.append(time.monotonic())
+        try:
+            await self._restart()
+            return True
+        except Exception as e:
+            logger.error("Supervisor restart failed: %s", e)
+            return False
+
+    async def run(self) -> None:
+        while True:
+            await self._failures.get()
+            self._handling = True
+            recovered = False
+            try:
+                recovered = await self._handle_failure()
+            finally:
+                self._drain()
+                self._handling = False
+            if not recovered:
+                # Nothing else may report while the controller is down; retry under the budget
+                self._failures.put_nowait(Failure.CRITICAL)
+
+    async def _handle_failure(self) -> bool:
+        recent = self._restarts_in_window()
+        if recent >= self.policy.budget:
+            await self._set_circuit(CircuitState.OPEN)
+            # Half-open: after cooling down, a single trial restart decides the circuit state
+            while True:
+                await asyncio.sleep(self.policy.cooldown)
+                if await self._attempt_restart():
+                    self._restarts.clear()
+                    await self._set_circuit(CircuitState.CLOSED)
+                    return True
+        if recent:
+            await asyncio.sleep(
+                min(
+                    self.policy.backoff_base * 2 ** (recent - 1),
+                    self.policy.backoff_max,
+                )
+            )
+        return await self._attempt_restart()
@@ -1,4 +1,7 @@
+import os
+
 from apps.discord_app import DiscordApp
+from config import config
 from controllers.AppController.app_controller import AppController
 from controllers.controller_types import (
     ActivityHealthCheck,
@@ -26,14 +29,59 @@ class DiscordAppController(
         DiscordApp, DiscordAppTaskType, DiscordAppActivityType, DiscordHealthCheckType
     ]
 ):
-    def __init__(self, broadcaster):
-        self._app = DiscordApp()
-        super().__init__(broadcaster)
+    def __init__(
+        self,
+        broadcaster,
+        app: DiscordApp | None = None,
+        hot_standby: bool = config.HOT_STANDBY,
+    ):
+        self._app = app or DiscordApp()
+        # Launch slots alternated between primary and standby, so a replacement standby can take
+        # over the failed instance's debug port and profile once it has been terminated
+        self._slots: list[tuple[int, str | None]] = [
+            (self._app.rpc_port, self._app.user_data_dir),
+            (
+                self._app.rpc_port + config.DISCORD_STANDBY_PORT_OFFSET,
+                self._standby_user_data_dir(self._app),
+            ),
+        ]
+        super().__init__(broadcaster, hot_standby)
+
+    @staticmethod
+    def _standby_user_data_dir(app: DiscordApp) -> str:
+        # Discord is single instance per profile; the standby needs its own (logged in) profile
+        if app.user_data_dir:
+            return f"{app.user_data_dir}-standby"
+        return os.path.expanduser(f"~/.config/assman/discord-{app.instance_id}-standby")
 
     @property
     def app(self) -> DiscordApp:
         return self._app
 
+    def set_app(self, app: DiscordApp) -> None:
+        # Pick up whatever the outgoing instance learned after the standby was prepared
+        if app.session:
+            app.adopt_catalogue(self._app)
+        self._app = app
+
+    def create_standby_app(self) -> DiscordApp:
+        rpc_port, user_data_dir = next(
+            slot for slot in self._slots if slot[0] != self.app.rpc_port
+        )
+        return DiscordApp(
+            instance_id=self.app.instance_id,
+            rpc_port=rpc_port,
+            user_data_dir=user_data_dir,
+            display=self.app.display,
+        )
+
+    async def prepare_app(self, app: DiscordApp) -> None:
+        """Attach Playwright and carry over the serving instance's catalogue, so channel based
+        tasks keep resolving after a fail over without relearning
+        """
+        await app.start_playwright()
+        app.adopt_catalogue(self.app)
+
     @property
     def app_health_checks(self) -> list[CoreHealthCheck]:
         """TODO: Elaborate
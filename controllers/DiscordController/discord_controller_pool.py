@@ -0,0 +1,180 @@
+import os
+from typing import Callable, Iterable, Literal
+
+from apps.discord_app import DiscordApp
+from apps.discord_search import SearchKind
+from apps.discord_session import DiscordSession
+from assman_types import JSONType
+from config import config
+from models.discord_server import DiscordChannel, DiscordServer
+from controllers.controller_types import HealthState
+from controllers.DiscordController.discord_controller import DiscordAppController
+from utils.serialization import RawJSON, Snapshot
+
+
+class DiscordControllerPool:
+    """Set of DiscordAppControllers, one per Discord instance, each with its own debug port,
+    profile directory and X display.
+
+    Each instance is logged in to its own account and learns its own catalogue. Requests pinned
+    to an instance id are routed to it; unpinned requests are balanced by load across the
+    healthy instances whose catalogue holds the channels or server they target.
+    """
+
+    def __init__(self, broadcaster, instances: int = config.DISCORD_INSTANCES):
+        self.controllers: dict[str, DiscordAppController] = {}
+        for index in range(instances):
+            app = DiscordApp(
+                instance_id=str(index),
+                rpc_port=config.DISCORD_RPC_PORT + index,
+                user_data_dir=self._user_data_dir(index),
+                display=(
+                    f":{config.DISCORD_DISPLAY_BASE + index}"
+                    if config.DISCORD_DISPLAY_BASE is not None
+                    else None
+                ),
+            )
+            self.controllers[app.instance_id] = DiscordAppController(broadcaster, app)
+        # Merged listings, each with the (instance, session generation, catalogue version) of
+        # every session it was built from
+        self._snapshots: dict[str, tuple[tuple, Snapshot]] = {}
+        self._snapshot_version = 0
+
+    @staticmethod
+    def _user_data_dir(index: int) -> str | None:
+        if config.DISCORD_USER_DATA_ROOT:
+            return os.path.join(config.DISCORD_USER_DATA_ROOT, str(index))
+        if index == 0:
+            return None
+        return os.path.expanduser(f"~/.config/assman/discord-{index}")
+
+    def __iter__(self):
+        return iter(self.controllers.values())
+
+    async def shutdown(self) -> None:
+        for controller in self:
+            await controller.shutdown()
+
+    def get(self, instance_id: str) -> DiscordAppController:
+        try:
+            return self.controllers[instance_id]
+        except KeyError:
+            raise LookupError(f"Unknown discord instance: {instance_id}")
+
+    def running(self) -> list[DiscordAppController]:
+        return [controller for controller in self if controller.is_running()]
+
+    def pick(
+        self, channel_ids: Iterable[str] = (), server_id: str | None = None
+    ) -> DiscordAppController:
+        """Least loaded healthy controller which has learned `server_id` and every channel in
+        `channel_ids`, falling back to any such running controller
+
+        Raises:
+            RuntimeError if no controller is running
+            LookupError if no running controller has learned the targets
+        """
+        running = self.running()
+        if not running:
+            raise RuntimeError("No running discord instances available")
+        channel_ids = list(channel_ids)
+        if channel_ids or server_id is not None:
+            running = [
+                controller
+                for controller in running
+                if controller.app.knows(channel_ids, server_id)
+            ]
+            if not running:
+                raise LookupError(
+                    "No running discord instance has learned the requested channels or server"
+                )
+        healthy = [
+            controller
+            for controller in running
+            if controller.health_status is HealthState.HEALTHY
+        ]
+        return min(healthy or running, key=lambda controller: controller.load)
+
+    def search(
+        self,
+        query: str,
+        limit: int = 10,
+        kind: SearchKind = "all",
+        server_id: str | None = None,
+        channel_type: Literal["all", "voice", "text"] = "all",
+    ) -> list[dict[str, JSONType]]:
+        """Search every running instance's catalogue, best first; an entry known to several
+        instances is listed once, under the instance that scored it highest
+        """
+        merged: dict[tuple[str, str], dict[str, JSONType]] = {}
+        for controller in self.running():
+            if not controller.app.session:
+                continue
+            for result in controller.app.search(
+                query, limit, kind, server_id, channel_type
+            ):
+                key = (result["kind"], result["item"]["id"])
+                if key not in merged or merged[key]["score"] < result["score"]:
+                    merged[key] = {**result, "instance": controller.app.instance_id}
+        return sorted(merged.values(), key=lambda result: -result["score"])[:limit]
+
+    def get_servers_snapshot(self) -> Snapshot:
+        """Servers learned by every running instance, as DiscordSession.get_servers_snapshot();
+        a server known to several instances is listed once
+        """
+        return self._merged_snapshot(
+            "servers", lambda session: session.get_servers_as_list()
+        )
+
+    def get_channels_snapshot(
+        self, channel_type: Literal["any", "voice", "text"] = "any"
+    ) -> Snapshot:
+        return self._merged_snapshot(
+            f"channels:{channel_type}",
+            lambda session: session.get_channels(channel_type),
+        )
+
+    def _merged_snapshot(
+        self,
+        key: str,
+        entries: Callable[[DiscordSession], list[DiscordServer] | list[DiscordChannel]],
+    ) -> Snapshot:
+        """Rebuilt only when an instance starts, stops or changes its catalogue, so repeated
+        polls keep one version and ETag whichever instance would have served them
+        """
+        sessions = [
+            (controller.app, controller.app.session)
+            for controller in self.running()
+            if controller.app.session
+        ]
+        source = tuple(
+            (app.instance_id, app.session_generation, session.catalogue_version)
+            for app, session in sessions
+        )
+        cached = self._snapshots.get(key)
+        if cached is not None and cached[0] == source:
+            return cached[1]
+        merged: dict[str, RawJSON] = {}
+        for _, session in sessions:
+            for entry in entries(session):
+                merged.setdefault(entry.id, entry.to_json())
+        self._snapshot_version += 1
+        snapshot = Snapshot.encode(
+            self._snapshot_version, RawJSON.array(list(merged.values()))
+        )
+        self._snapshots[key] = (source, snapshot)
+        return snapshot
+
+    def describe(self) -> list[dict]:
+        return [
+            {
+                "instance": controller.app.instance_id,
+                "rpc_port": controller.app.rpc_port,
+                "display": controller.app.display,
+                "running": controller.is_running(),
+                "health_status": controller.health_status.value,
+                "queued_tasks": controller.task_queue.qsize(),
+                "running_tasks": controller.running_tasks,
+            }
+            for controller in self
+        ]
@@ -1,4 +1,4 @@
-from typing import Any
+from typing import Any, AsyncIterator
 
 from apps.discord_app import DiscordApp
 from controllers.controller_types import ExecutorCallable, ExecutorResponse
@@ -10,16 +10,61 @@ async def execute_learn_servers(
 ) -> ExecutorResponse:
     """
     Returns:
-        Payload: {"servers": [DiscordServer.to_dict()]}
+        Payload: {"servers": [DiscordServer.to_dict()], "version": int, "etag": str}; the
+        etag matches GET /discord/servers for the same catalogue
     """
     await app.learn_servers()
-    servers = app.get_servers()
+    snapshot = app.get_servers_snapshot()
     return ExecutorResponse(
-        response_name=DiscordAppTaskType.LEARN_SERVERS, payload={"servers": servers}
+        response_name=DiscordAppTaskType.LEARN_SERVERS,
+        payload={
+            "servers": snapshot.json,
+            "version": snapshot.version,
+            "etag": snapshot.etag,
+        },
     )
 
 
+async def execute_fetch_messages(
+    app: DiscordApp, params: dict[str, Any]
+) -> AsyncIterator[ExecutorResponse]:
+    """
+    Yields:
+        Payload: {"channel_id": str, "messages": [{id, author, content, timestamp}]} per chunk,
+        newest first
+    """
+    channel = app.get_channel_by_id(params["channel_id"])
+    async for batch in app.stream_messages(channel, params.get("limit")):
+        yield ExecutorResponse(
+            response_name=DiscordAppTaskType.FETCH_MESSAGES,
+            payload={"channel_id": channel.id, "messages": batch},
+        )
+
+
+async def execute_send_message(
+    app: DiscordApp, params: dict[str, Any]
+) -> AsyncIterator[ExecutorResponse]:
+    """Send a batch of messages, grouped so that each channel is navigated to once.
+
+    Yields:
+        Payload: {"channel_id": str, "receipts": [{content, message_id, delivered, latency}]}
+        per channel, in order of each channel's first message in the batch
+    """
+    by_channel: dict[str, list[str]] = {}
+    for message in params["messages"]:
+        by_channel.setdefault(message["channel_id"], []).append(message["content"])
+    for channel_id, contents in by_channel.items():
+        channel = app.get_channel_by_id(channel_id)
+        receipts = [receipt async for receipt in app.send_messages(channel, contents)]
+        yield ExecutorResponse(
+            response_name=DiscordAppTaskType.SEND_MESSAGE,
+            payload={"channel_id": channel_id, "receipts": receipts},
+        )
+
+
 def get_discord_executors() -> dict[DiscordAppTaskType, ExecutorCallable]:
     return {
         DiscordAppTaskType.LEARN_SERVERS: execute_learn_servers,
+        DiscordAppTaskType.FETCH_MESSAGES: execute_fetch_messages,
+        DiscordAppTaskType.SEND_MESSAGE: execute_send_message,
     }
@@ -1,7 +1,10 @@
+from __future__ import annotations
+
 from enum import Enum
-from typing import Protocol
+from typing import TYPE_CHECKING, Protocol
 
-from apps.discord_app import DiscordApp
+if TYPE_CHECKING:
+    from apps.discord_app import DiscordApp
 
 
 class DiscordAppControllerProtocol(Protocol):
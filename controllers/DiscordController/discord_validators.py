@@ -12,7 +12,44 @@ def validate_learn_servers(params: dict[str, Any]) -> bool:
     return not params
 
 
+def validate_fetch_messages(params: dict[str, Any]) -> bool:
+    """
+    Params:
+        channel_id: str, id of a learned text channel
+        limit: int | None, maximum number of messages; whole history when omitted
+    """
+    if not isinstance(params.get("channel_id"), str):
+        raise ValueError("channel_id must be a string")
+    limit = params.get("limit")
+    if limit is not None and (not isinstance(limit, int) or limit <= 0):
+        raise ValueError("limit must be a positive integer")
+    return True
+
+
+def validate_send_message(params: dict[str, Any]) -> bool:
+    """
+    Params:
+        messages: non-empty list of {"channel_id": str, "content": str}
+    """
+    messages = params.get("messages")
+    if not isinstance(messages, list) or not messages:
+        raise ValueError("messages must be a non-empty list")
+    for message in messages:
+        if not (
+            isinstance(message, dict)
+            and isinstance(message.get("channel_id"), str)
+            and isinstance(message.get("content"), str)
+            and message["content"].strip()
+        ):
+            raise ValueError(
+                "each message requires a string channel_id and non-empty string content"
+            )
+    return True
+
+
 def get_discord_validators() -> dict[DiscordAppTaskType, ValidatorCallable]:
     return {
         DiscordAppTaskType.LEARN_SERVERS: validate_learn_servers,
+        DiscordAppTaskType.FETCH_MESSAGES: validate_fetch_messages,
+        DiscordAppTaskType.SEND_MESSAGE: validate_send_message,
     }
@@ -0,0 +1,18 @@
+from apps.managed_app_pool import ManagedAppPool
+from apps.mpv_app import MpvApp
+from controllers.controller_types import ActivityHealthCheck
+from controllers.MpvController.mpv_types import MpvAppActivityType
+
+
+def get_mpv_activity_health_checks(
+    pool: ManagedAppPool[MpvApp],
+) -> dict[MpvAppActivityType, list[ActivityHealthCheck[MpvAppActivityType]]]:
+    return {
+        MpvAppActivityType.PLAYING: [
+            ActivityHealthCheck(
+                check_type=MpvAppActivityType.PLAYING,
+                # Answers over the IPC socket, so also confirms playback can be controlled
+                executor=pool.is_interactable,
+            )
+        ],
+    }
@@ -0,0 +1,128 @@
+import asyncio
+from contextlib import asynccontextmanager
+from functools import partial
+from typing import Any, AsyncIterator
+
+from apps.managed_app_pool import ManagedAppPool
+from apps.mpv_app import MpvApp
+from config import config
+from controllers.AppController.pooled_app_controller import PooledAppController
+from controllers.apptask import AppTask
+from controllers.controller_types import (
+    ActivityHealthCheck,
+    CoreHealthCheck,
+    ExecutorCallable,
+    Failure,
+    ValidatorCallable,
+)
+from controllers.MpvController.health_checks.mpv_activity_health_checks import (
+    get_mpv_activity_health_checks,
+)
+from controllers.MpvController.mpv_executors import get_mpv_executors
+from controllers.MpvController.mpv_types import (
+    MpvAppActivityType,
+    MpvAppTaskType,
+    MpvHealthCheckType,
+)
+from controllers.MpvController.mpv_validators import get_mpv_validators
+
+
+class MpvAppController(
+    PooledAppController[MpvApp, MpvAppTaskType, MpvAppActivityType, MpvHealthCheckType]
+):
+    def __init__(self, broadcaster, pool: ManagedAppPool[MpvApp] | None = None):
+        super().__init__(
+            broadcaster,
+            pool
+            or ManagedAppPool(
+                lambda index: MpvApp(instance_id=str(index)),
+                size=config.MPV_POOL_SIZE,
+                max_uses=config.MPV_MAX_USES,
+                max_memory=config.MPV_MAX_MEMORY_MB * 1024 * 1024,
+            ),
+        )
+        # Instances started by PLAY and not since stopped, gone idle or retired; PLAYING lasts
+        # while any remain
+        self.playing: set[str] = set()
+        self._playback_events: set[asyncio.Task] = set()
+        for app in self.pool.apps:
+            app.add_listener(partial(self._on_mpv_event, app))
+        self.pool.add_retire_listener(self._on_retired)
+
+    @asynccontextmanager
+    async def lease_app(self, task: AppTask) -> AsyncIterator[MpvApp]:
+        async with super().lease_app(task) as app:
+            yield app
+            # Reached only once the executor succeeds
+            await self._track_playback(task, app)
+
+    async def _track_playback(self, task: AppTask, app: MpvApp) -> None:
+        if task.task_type is MpvAppTaskType.PLAY:
+            self.playing.add(app.instance_id)
+            if self.activity is None:
+                await self.start_activity(MpvAppActivityType.PLAYING, str(task.id))
+        elif task.task_type is MpvAppTaskType.STOP:
+            self.playing.discard(app.instance_id)
+            await self._end_playing(str(task.id))
+
+    def _on_mpv_event(self, app: MpvApp, event: dict[str, Any]) -> None:
+        # mpv goes idle once the last queued file ends on its own, fails, or is stopped
+        if (
+            event.get("event") == "property-change"
+            and event.get("name") == "idle-active"
+            and event.get("data") is True
+            and app.instance_id in self.playing
+        ):
+            self.playing.discard(app.instance_id)
+            task = asyncio.create_task(self._end_playing("idle"))
+            self._playback_events.add(task)
+            task.add_done_callback(self._playback_events.discard)
+
+    async def _on_retired(self, app: MpvApp) -> None:
+        self.playing.discard(app.instance_id)
+        await self._end_playing("retired")
+
+    async def _end_playing(self, terminator: str | None = None) -> None:
+        # Checked when run; a PLAY may have started another instance since
+        if not self.playing:
+            await self.end_activity(terminator)
+
+    async def terminate_app(self) -> None:
+        # Retiring each instance clears its playback
+        await super().terminate_app()
+        await self.end_activity()
+
+    @property
+    def app_health_checks(self) -> list[CoreHealthCheck]:
+        return []
+
+    @property
+    def activity_health_checks(
+        self,
+    ) -> dict[MpvAppActivityType, list[ActivityHealthCheck]]:
+        return get_mpv_activity_health_checks(self.pool)
+
+    @property
+    def executors(self) -> dict[MpvAppTaskType, ExecutorCallable]:
+        return get_mpv_executors()
+
+    @property
+    def validators(self) -> dict[MpvAppTaskType, ValidatorCallable]:
+        return get_mpv_validators(self.pool)
+
+    async def handle_app_health_failures(self, failed_checks: list[CoreHealthCheck]):
+        # No mpv specific core checks are defined; any failure restarts the pool
+        self.report_failure(Failure.CRITICAL)
+
+    async def handle_activity_health_failures(
+        self, failed_checks: list[ActivityHealthCheck]
+    ) -> None:
+        """PLAYING fails once a pooled instance stops answering over IPC; its playback is lost,
+        so forget it, ending PLAYING if nothing else plays, and restart the pool
+        """
+        for instance_id in list(self.playing):
+            app = self.pool.apps[self.pool.index_of(instance_id)]
+            if not await app.is_interactable():
+                self.playing.discard(instance_id)
+        await self._end_playing("health_check")
+        self.report_failure(Failure.CRITICAL)
@@ -0,0 +1,47 @@
+from typing import Any
+
+from apps.mpv_app import MpvApp
+from controllers.controller_types import ExecutorCallable, ExecutorResponse
+from controllers.MpvController.mpv_types import MpvAppTaskType
+
+
+async def execute_play(app: MpvApp, params: dict[str, Any]) -> ExecutorResponse:
+    """
+    Returns:
+        Payload: {"instance", "path", "title", "paused", "idle"} of the instance playing, once
+        it has opened the file
+    """
+    await app.play(params["path"], params.get("append", False))
+    return ExecutorResponse(
+        response_name=MpvAppTaskType.PLAY, payload=await app.query_playback_state()
+    )
+
+
+async def execute_pause(app: MpvApp, params: dict[str, Any]) -> ExecutorResponse:
+    await app.set_paused(True)
+    return ExecutorResponse(
+        response_name=MpvAppTaskType.PAUSE, payload=app.playback_state()
+    )
+
+
+async def execute_resume(app: MpvApp, params: dict[str, Any]) -> ExecutorResponse:
+    await app.set_paused(False)
+    return ExecutorResponse(
+        response_name=MpvAppTaskType.RESUME, payload=app.playback_state()
+    )
+
+
+async def execute_stop(app: MpvApp, params: dict[str, Any]) -> ExecutorResponse:
+    await app.stop()
+    return ExecutorResponse(
+        response_name=MpvAppTaskType.STOP, payload=app.playback_state()
+    )
+
+
+def get_mpv_executors() -> dict[MpvAppTaskType, ExecutorCallable]:
+    return {
+        MpvAppTaskType.PLAY: execute_play,
+        MpvAppTaskType.PAUSE: execute_pause,
+        MpvAppTaskType.RESUME: execute_resume,
+        MpvAppTaskType.STOP: execute_stop,
+    }
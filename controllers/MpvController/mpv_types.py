@@ -0,0 +1,22 @@
+from enum import Enum
+
+
+class MpvAppActivityType(Enum):
+    """Define enumeration of activities assignable to the mpv pool controller state"""
+
+    PLAYING = "playing"
+
+
+class MpvAppTaskType(Enum):
+    """Define enumeration of tasks assignable to AppTask instances
+    Each task runs against one leased mpv instance from the pool
+    """
+
+    PLAY = "play"
+    PAUSE = "pause"
+    RESUME = "resume"
+    STOP = "stop"
+
+
+class MpvHealthCheckType(Enum):
+    pass
@@ -0,0 +1,58 @@
+from functools import partial
+from typing import Any, Collection
+
+from apps.managed_app_pool import ManagedAppPool
+from apps.mpv_app import MpvApp
+
+from controllers.controller_types import ValidatorCallable
+from controllers.MpvController.mpv_types import MpvAppTaskType
+
+
+def validate_play(params: dict[str, Any], instances: Collection[str]) -> bool:
+    """
+    Params:
+        path: str, file path or URL for mpv to load
+        append: bool | None, queue after the current file instead of replacing it
+        instance: str | None, pooled instance to play on; any idle instance when omitted
+    """
+    if not isinstance(params.get("path"), str) or not params["path"].strip():
+        raise ValueError("path must be a non-empty string")
+    if not isinstance(params.get("append", False), bool):
+        raise ValueError("append must be a boolean")
+    _validate_instance(params.get("instance"), instances)
+    return True
+
+
+def validate_playback_control(
+    params: dict[str, Any], instances: Collection[str]
+) -> bool:
+    """
+    Params:
+        instance: str, pooled instance to control, as returned by PLAY
+    """
+    if params.get("instance") is None:
+        raise ValueError("instance is required to control playback")
+    _validate_instance(params["instance"], instances)
+    return True
+
+
+def _validate_instance(instance: Any, instances: Collection[str]) -> None:
+    if instance is None:
+        return
+    if not isinstance(instance, str):
+        raise ValueError("instance must be a string")
+    if instance not in instances:
+        raise ValueError(f"Unknown pooled instance: {instance}")
+
+
+def get_mpv_validators(
+    pool: ManagedAppPool[MpvApp],
+) -> dict[MpvAppTaskType, ValidatorCallable]:
+    instances = frozenset(app.instance_id for app in pool.apps)
+    validate_control = partial(validate_playback_control, instances=instances)
+    return {
+        MpvAppTaskType.PLAY: partial(validate_play, instances=instances),
+        MpvAppTaskType.PAUSE: validate_control,
+        MpvAppTaskType.RESUME: validate_control,
+        MpvAppTaskType.STOP: validate_control,
+    }
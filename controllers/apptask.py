@@ -4,6 +4,7 @@ from enum import Enum
 from typing import Any, Dict, Generic, Optional
 from uuid import UUID, uuid4
 from controllers.controller_types import JSONType, ManagedAppTaskType
+from utils.tracing import Span
 
 
 class TaskStatus(Enum):
@@ -12,7 +13,7 @@ class TaskStatus(Enum):
     COMPLETED = "completed"
     FAILED = "failed"
 
-@dataclass
+@dataclass(slots=True)
 class AppTask(Generic[ManagedAppTaskType]):
     '''Represents a state management interface for an AppController's operation requests.
     
@@ -26,6 +27,7 @@ class AppTask(Generic[ManagedAppTaskType]):
         error: Error message set on task failure, broadcast to websocket receivers.
         started_at: Timestamp when task execution began via time.time().
         finished_at: Timestamp when task finished (error or completion) via time.time().
+        span: Root tracing span, opened on submission and ended once the task finishes.
     '''
     task_type: ManagedAppTaskType
     params: Dict[str, Any]
@@ -35,12 +37,18 @@ class AppTask(Generic[ManagedAppTaskType]):
     started_at: Optional[float] = None
     finished_at: Optional[float] = None
     error: Optional[str] = None
+    span: Optional[Span] = field(default=None, repr=False, compare=False)
+    # Formatted once; every lifecycle broadcast serialises the task
+    _id_text: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self._id_text = str(self.id)
 
     def to_dict(self) -> Dict[str, JSONType]:
         return {
             "task_type": self.task_type.value,
             "status": self.status.value,
-            "id": str(self.id),
+            "id": self._id_text,
             "created_at": self.created_at,
             "started_at": self.started_at,
             "finish_at": self.finished_at,
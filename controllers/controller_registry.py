@@ -0,0 +1,56 @@
+import importlib
+from typing import Any
+
+
+class ControllerRegistry:
+    """Controllers built on first use rather than at startup.
+
+    Each controller is registered by the import path of its factory, `module:attribute`, called
+    with the shared broadcaster. Neither the module (nor its app's dependencies, i.e. Playwright)
+    is imported until the controller is first requested, so the service binds its port without
+    paying for controllers no request has touched.
+
+    Registered objects must provide `async shutdown()`, called for those built when the process
+    stops.
+    """
+
+    def __init__(self, broadcaster):
+        self.broadcaster = broadcaster
+        self._factories: dict[str, str] = {}
+        self._controllers: dict[str, Any] = {}
+
+    def register(self, name: str, factory: str) -> None:
+        if name in self._factories:
+            raise ValueError(f"Controller {name} is already registered")
+        if ":" not in factory:
+            raise ValueError(
+                f"Controller factory must be 'module:attribute', not {factory}"
+            )
+        self._factories[name] = factory
+
+    def get(self, name: str) -> Any:
+        """The named controller, importing and constructing it on first request
+
+        Raises:
+            LookupError if no controller is registered under `name`
+        """
+        controller = self._controllers.get(name)
+        if controller is None:
+            try:
+                module_name, attribute = self._factories[name].split(":", 1)
+            except KeyError:
+                raise LookupError(f"Unknown controller: {name}")
+            factory = getattr(importlib.import_module(module_name), attribute)
+            controller = self._controllers[name] = factory(self.broadcaster)
+        return controller
+
+    def loaded(self) -> dict[str, Any]:
+        return dict(self._controllers)
+
+    def describe(self) -> dict[str, bool]:
+        """Registered controller names and whether each has been built"""
+        return {name: name in self._controllers for name in self._factories}
+
+    async def shutdown(self) -> None:
+        for controller in self._controllers.values():
+            await controller.shutdown()
@@ -1,19 +1,34 @@
 from dataclasses import dataclass, field
-from datetime import datetime, timezone
 from enum import Enum
-from typing import Any, Awaitable, Callable, Generic, TypeAlias, TypeVar, Union
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Generic,
+    TypeAlias,
+    TypeVar,
+    Union,
+)
 
-from apps.discord_app import DiscordApp
-from apps.managed_app import ManagedApp
 from assman_types import JSONType
+from utils.serialization import RawJSON, isoformat
+
+if TYPE_CHECKING:
+    # Type only; importing apps here would load Playwright for every controller and router
+    from apps.discord_app import DiscordApp
+    from apps.managed_app import ManagedApp
 
 # Generics for AppController subclass definitions
 ManagedAppType = TypeVar("ManagedAppType", bound="ManagedApp")
 ManagedAppTaskType = TypeVar("ManagedAppTaskType", bound="Enum")
 AppActivityType = TypeVar("AppActivityType", bound="Enum")
 
-ExecutorCallable: TypeAlias = Callable[
-    ["DiscordApp", dict[str, Any]], Awaitable["ExecutorResponse | None"]
+ExecutorCallable: TypeAlias = Union[
+    Callable[["DiscordApp", dict[str, Any]], Awaitable["ExecutorResponse | None"]],
+    # Streaming executors are async generators; each yielded response is an APP_UPDATE
+    Callable[["DiscordApp", dict[str, Any]], AsyncIterator["ExecutorResponse"]],
 ]
 ValidatorCallable: TypeAlias = Callable[[dict[str, Any]], bool]
 
@@ -22,6 +37,11 @@ class Failure(Enum):
     CRITICAL = "critical"
 
 
+class CircuitState(Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+
+
 class AppBroadcastType(Enum):
     TASK_RUNNING = "task_running"
     TASK_UPDATE = "task_update"
@@ -38,17 +58,20 @@ class AppBroadcastType(Enum):
     APP_RESPONSE = "app_response"
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class ExecutorResponse(Generic[ManagedAppTaskType]):
     response_name: ManagedAppTaskType
-    payload: dict[str, JSONType]
+    # RawJSON values are pre-encoded parts, i.e. a server listing, written as is
+    payload: dict[str, JSONType | RawJSON]
 
-    def to_dict(self) -> dict[str, JSONType]:
+    def to_dict(self) -> dict[str, JSONType | RawJSON]:
         return {"response_name": self.response_name.value, **self.payload}
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class AppActivity(Generic[AppActivityType]):
+    """Immutable; ending an activity replaces it, i.e. dataclasses.replace(activity, end_time=...)"""
+
     activity_type: AppActivityType
     initialiser: str | None = None
     start_time: float | None = None
@@ -58,24 +81,15 @@ class AppActivity(Generic[AppActivityType]):
     metadata: dict[str, JSONType] = field(default_factory=dict)
 
     def to_dict(self) -> dict[str, JSONType]:
-        response = {}
-        response["activity_type"] = self.activity_type.value
-        response["initialiser"] = self.initialiser
-        if self.start_time:
-            response["start_time"] = datetime.fromtimestamp(
-                self.start_time, tz=timezone.utc
-            ).isoformat()
-        else:
-            response["start_time"] = None
-        if self.end_time:
-            response["end_time"] = datetime.fromtimestamp(
-                self.end_time, tz=timezone.utc
-            ).isoformat()
-        else:
-            response["end_time"] = None
-        response["terminator"] = self.terminator
-        response["metadata"] = self.metadata
-        return response
+        # Broadcast with every heartbeat; timestamp formatting is cached by value
+        return {
+            "activity_type": self.activity_type.value,
+            "initialiser": self.initialiser,
+            "start_time": isoformat(self.start_time) if self.start_time else None,
+            "end_time": isoformat(self.end_time) if self.end_time else None,
+            "terminator": self.terminator,
+            "metadata": self.metadata,
+        }
 
 
 # Health Management Types
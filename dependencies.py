@@ -1,12 +1,83 @@
-from fastapi import Request, WebSocket
+from __future__ import annotations
 
-from controllers.DiscordController.discord_controller import DiscordAppController
+from typing import TYPE_CHECKING, Iterable
+
+from fastapi import HTTPException, Request, WebSocket
+
+from controllers.controller_registry import ControllerRegistry
 from utils.broadcaster import Broadcaster
+from utils.loop_watchdog import LoopWatchdog
+from utils.profiler import SamplingProfiler
+
+if TYPE_CHECKING:
+    # Controller modules load on first use through the registry, see ControllerRegistry
+    from controllers.DiscordController.discord_controller import DiscordAppController
+    from controllers.DiscordController.discord_controller_pool import (
+        DiscordControllerPool,
+    )
+    from controllers.MpvController.mpv_controller import MpvAppController
 
 
 def get_broadcaster(websocket: WebSocket) -> Broadcaster:
     return websocket.app.state.broadcaster
 
 
-def get_discord_controller(request: Request) -> DiscordAppController:
-    return request.app.state.discord_controller
+def get_controller_registry(request: Request) -> ControllerRegistry:
+    return request.app.state.controllers
+
+
+def get_discord_pool(request: Request) -> DiscordControllerPool:
+    return get_controller_registry(request).get("discord")
+
+
+def pick_discord_controller(
+    pool: DiscordControllerPool,
+    instance: str | None = None,
+    channel_ids: Iterable[str] = (),
+    server_id: str | None = None,
+) -> DiscordAppController:
+    """Controller pinned by `instance`, else the least loaded one which has learned the
+    targeted channels and server
+    """
+    try:
+        if instance is not None:
+            return pool.get(instance)
+        return pool.pick(channel_ids, server_id)
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+def get_channel_controller(
+    request: Request, channel_id: str, instance: str | None = None
+) -> DiscordAppController:
+    """Controller pinned by the `instance` query parameter, else the least loaded one which has
+    learned `channel_id`
+    """
+    return pick_discord_controller(get_discord_pool(request), instance, [channel_id])
+
+
+def get_discord_controllers(
+    request: Request, instance: str | None = None
+) -> list[DiscordAppController]:
+    """Controller pinned by the `instance` query parameter, else every controller in the pool"""
+    pool = get_discord_pool(request)
+    if instance is None:
+        return list(pool)
+    try:
+        return [pool.get(instance)]
+    except LookupError as e:
+        raise HTTPException(status_code=404, detail=str(e))
+
+
+def get_mpv_controller(request: Request) -> MpvAppController:
+    return get_controller_registry(request).get("mpv")
+
+
+def get_loop_watchdog(request: Request) -> LoopWatchdog:
+    return request.app.state.loop_watchdog
+
+
+def get_profiler(request: Request) -> SamplingProfiler:
+    return request.app.state.profiler
@@ -0,0 +1,435 @@
+"""Controller load generator: task throughput, end-to-end latency, broadcast fan-out cost and
+memory growth of an AppController behind the FastAPI app.
+
+A stub controller, whose app is not a real process and whose executor sleeps for a configurable
+latency, is served with the production Broadcaster, `/ws` and `/metrics` endpoints by uvicorn in
+a child process. Concurrent HTTP clients then submit tasks in a closed loop while websocket
+subscribers listen; a task's end-to-end latency runs from its POST until TASK_FINISH arrives.
+Each `--subscribers` step runs against a fresh server so memory growth is comparable.
+
+Usage:
+    python -m dev.bench_controller --clients 32 --subscribers 0,10,50,100 --duration 20 \\
+        --latency 0.005 [--workers 1] [--payload-bytes 256]
+"""
+
+import argparse
+import asyncio
+import json
+import multiprocessing
+import statistics
+import sys
+import time
+from contextlib import asynccontextmanager
+from enum import Enum
+from typing import Any
+
+import httpx
+import psutil
+from websockets.asyncio.client import connect
+
+from apps.managed_app import ManagedApp
+from controllers.AppController.app_controller import AppController
+from controllers.controller_types import (
+    ActivityHealthCheck,
+    CoreHealthCheck,
+    ExecutorCallable,
+    ExecutorResponse,
+    ValidatorCallable,
+)
+from utils.loop_watchdog import percentile
+
+FINISHED = ("task_finish", "task_error")
+
+
+class BenchAppTaskType(Enum):
+    WORK = "work"
+
+
+class BenchAppActivityType(Enum):
+    pass
+
+
+class BenchHealthCheckType(Enum):
+    pass
+
+
+class StubApp(ManagedApp):
+    """ManagedApp without a process; always running and healthy"""
+
+    @property
+    def name(self):
+        return "bench"
+
+    def __init__(self):
+        self.process_properties = None
+        self._running = False
+
+    async def launch(self, *, use_class_target=True, use_name_target=True):
+        self._running = True
+        return True
+
+    async def is_running(self) -> bool:
+        return self._running
+
+    async def terminate(self) -> bool:
+        self._running = False
+        return True
+
+    async def is_locatable(self) -> bool:
+        return self._running
+
+    async def is_interactable(self) -> bool:
+        return self._running
+
+    async def focus(self):
+        pass
+
+
+async def execute_work(app: StubApp, params: dict[str, Any]) -> ExecutorResponse:
+    await asyncio.sleep(params["latency"])
+    return ExecutorResponse(
+        response_name=BenchAppTaskType.WORK,
+        payload={"data": "x" * params.get("payload_bytes", 0)},
+    )
+
+
+def validate_work(params: dict[str, Any]) -> bool:
+    """
+    Params:
+        latency: float, seconds the executor sleeps for
+        payload_bytes: int | None, size of the APP_RESPONSE payload
+    """
+    if not isinstance(params.get("latency"), (int, float)) or params["latency"] < 0:
+        raise ValueError("latency must be a non-negative number")
+    if not isinstance(params.get("payload_bytes", 0), int):
+        raise ValueError("payload_bytes must be an integer")
+    return True
+
+
+class BenchAppController(
+    AppController[StubApp, BenchAppTaskType, BenchAppActivityType, BenchHealthCheckType]
+):
+    def __init__(self, broadcaster, workers: int = 1):
+        self._app = StubApp()
+        self.task_workers = workers
+        super().__init__(broadcaster, hot_standby=False)
+
+    @property
+    def app(self) -> StubApp:
+        return self._app
+
+    @property
+    def app_health_checks(self) -> list[CoreHealthCheck]:
+        return []
+
+    @property
+    def activity_health_checks(
+        self,
+    ) -> dict[BenchAppActivityType, list[ActivityHealthCheck]]:
+        return {}
+
+    @property
+    def executors(self) -> dict[BenchAppTaskType, ExecutorCallable]:
+        return {BenchAppTaskType.WORK: execute_work}
+
+    @property
+    def validators(self) -> dict[BenchAppTaskType, ValidatorCallable]:
+        return {BenchAppTaskType.WORK: validate_work}
+
+    async def handle_app_health_failures(self, failed_checks: list[CoreHealthCheck]):
+        raise NotImplementedError
+
+    async def handle_activity_health_failures(
+        self, failed_checks: list[ActivityHealthCheck]
+    ) -> None:
+        raise NotImplementedError
+
+
+def create_app(workers: int):
+    from fastapi import FastAPI, Request
+
+    from main import metrics, websocket_connect
+    from utils.broadcaster import Broadcaster
+
+    @asynccontextmanager
+    async def lifespan(app: FastAPI):
+        app.state.broadcaster = Broadcaster()
+        app.state.controller = BenchAppController(app.state.broadcaster, workers)
+        await app.state.controller.start()
+        yield
+        await app.state.controller.stop()
+
+    app = FastAPI(lifespan=lifespan)
+    app.add_api_route("/metrics", metrics)
+    app.add_api_websocket_route("/ws", websocket_connect)
+
+    @app.post("/bench/work")
+    async def work(params: dict[str, Any], request: Request):
+        return await request.app.state.controller.submit_task(
+            BenchAppTaskType.WORK, params
+        )
+
+    @app.get("/bench/stats")
+    async def stats(request: Request):
+        controller = request.app.state.controller
+        return {
+            "active_tasks": len(controller.active_tasks),
+            "queued": controller.task_queue.qsize(),
+        }
+
+    return app
+
+
+def serve(port: int, workers: int) -> None:
+    """Child process entry point"""
+    import uvicorn
+
+    uvicorn.run(create_app(workers), host="127.0.0.1", port=port, log_level="warning")
+
+
+def parse_histogram(metrics_text: str, name: str) -> dict[str, Any]:
+    """Cumulative buckets, sum and count of an unlabelled histogram in Prometheus text"""
+    buckets: list[tuple[float, int]] = []
+    total = count = 0.0
+    for line in metrics_text.splitlines():
+        if line.startswith(f"{name}_bucket"):
+            bound = line.split('le="', 1)[1].split('"', 1)[0]
+            buckets.append((float(bound), int(float(line.rsplit(" ", 1)[1]))))
+        elif line.startswith(f"{name}_sum"):
+            total = float(line.rsplit(" ", 1)[1])
+        elif line.startswith(f"{name}_count"):
+            count = float(line.rsplit(" ", 1)[1])
+    return {"buckets": buckets, "sum": total, "count": int(count)}
+
+
+def bucket_quantile(buckets: list[tuple[float, int]], count: int, q: float) -> float:
+    """Upper bound of the bucket holding the q-th percentile observation"""
+    rank = count * q / 100
+    for bound, cumulative in buckets:
+        if cumulative >= rank:
+            return bound
+    return float("inf")
+
+
+class LoadRun:
+    """One load step against a running server"""
+
+    def __init__(self, args: argparse.Namespace, port: int, subscribers: int):
+        self.args = args
+        self.base_url = f"http://127.0.0.1:{port}"
+        self.ws_url = f"ws://127.0.0.1:{port}/ws"
+        self.subscribers = subscribers
+        self.finished_at: dict[str, float] = {}
+        self.waiters: dict[str, asyncio.Future] = {}
+        self.submit_latency: list[float] = []
+        self.end_to_end: list[float] = []
+        self.errors = 0
+        self.received = [0] * subscribers
+        self.connected = 0
+
+    async def subscribe(self, index: int, ready: asyncio.Event):
+        async with connect(self.ws_url, max_size=None) as websocket:
+            self.connected += 1
+            if self.connected == self.subscribers:
+                ready.set()
+            async for raw in websocket:
+                self.received[index] += 1
+                # One subscriber resolves task completions; the rest only drain their socket
+                if index != 0:
+                    continue
+                message = json.loads(raw)
+                if message.get("message_type") not in FINISHED:
+                    continue
+                task_id = message["payload"]["id"]
+                self.finished_at[task_id] = time.perf_counter()
+                waiter = self.waiters.pop(task_id, None)
+                if waiter and not waiter.done():
+                    waiter.set_result(None)
+
+    async def client(self, http: httpx.AsyncClient, deadline: float):
+        body = {"latency": self.args.latency, "payload_bytes": self.args.payload_bytes}
+        loop = asyncio.get_running_loop()
+        while loop.time() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await http.post("/bench/work", json=body)
+                response.raise_for_status()
+            except httpx.HTTPError:
+                self.errors += 1
+                continue
+            self.submit_latency.append(time.perf_counter() - started)
+            if not self.subscribers:
+                continue
+            task_id = response.json()
+            if task_id not in self.finished_at:
+                waiter = self.waiters[task_id] = loop.create_future()
+                try:
+                    await asyncio.wait_for(waiter, self.args.task_timeout)
+                except TimeoutError:
+                    self.errors += 1
+                    continue
+            self.end_to_end.append(self.finished_at.pop(task_id) - started)
+
+    async def sample_memory(self, pid: int, http: httpx.AsyncClient, samples: list):
+        process = psutil.Process(pid)
+        started = time.perf_counter()
+        while True:
+            stats = (await http.get("/bench/stats")).json()
+            samples.append(
+                {
+                    "elapsed": round(time.perf_counter() - started, 3),
+                    "rss_mb": round(process.memory_info().rss / 2**20, 2),
+                    "submitted": len(self.submit_latency),
+                    **stats,
+                }
+            )
+            await asyncio.sleep(self.args.sample_interval)
+
+    async def run(self, pid: int) -> dict[str, Any]:
+        limits = httpx.Limits(max_connections=self.args.clients)
+        async with httpx.AsyncClient(base_url=self.base_url, limits=limits) as http:
+            ready = asyncio.Event()
+            subscribers = [
+                asyncio.create_task(self.subscribe(index, ready))
+                for index in range(self.subscribers)
+            ]
+            if subscribers:
+                await asyncio.wait_for(ready.wait(), 30)
+
+            memory: list[dict[str, Any]] = []
+            sampler = asyncio.create_task(self.sample_memory(pid, http, memory))
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + self.args.duration
+            started = time.perf_counter()
+            await asyncio.gather(
+                *[self.client(http, deadline) for _ in range(self.args.clients)]
+            )
+            elapsed = time.perf_counter() - started
+            fanout = parse_histogram(
+                (await http.get("/metrics")).text, "assman_broadcast_fanout_seconds"
+            )
+            for task in [sampler, *subscribers]:
+                task.cancel()
+            await asyncio.gather(sampler, *subscribers, return_exceptions=True)
+
+        # Without subscribers completions are unobservable; only acceptance is measured
+        return {
+            "subscribers": self.subscribers,
+            "submitted": len(self.submit_latency),
+            "completed": len(self.end_to_end) if self.subscribers else None,
+            "errors": self.errors,
+            "submitted_per_s": len(self.submit_latency) / elapsed,
+            "completed_per_s": (
+                len(self.end_to_end) / elapsed if self.subscribers else None
+            ),
+            "submit_ms": summarise(self.submit_latency),
+            "end_to_end_ms": summarise(self.end_to_end),
+            "broadcast_fanout": {
+                "broadcasts": fanout["count"],
+                "mean_ms": (
+                    fanout["sum"] / fanout["count"] * 1000 if fanout["count"] else None
+                ),
+                "p99_bucket_ms": (
+                    bucket_quantile(fanout["buckets"], fanout["count"], 99) * 1000
+                    if fanout["count"]
+                    else None
+                ),
+                "messages_per_subscriber": (
+                    statistics.fmean(self.received) if self.received else 0
+                ),
+            },
+            "memory": {
+                "rss_growth_mb": (
+                    memory[-1]["rss_mb"] - memory[0]["rss_mb"] if memory else None
+                ),
+                "samples": memory,
+            },
+        }
+
+
+def summarise(seconds: list[float]) -> dict[str, float] | None:
+    if not seconds:
+        return None
+    return {
+        "p50": percentile(seconds, 50) * 1000,
+        "p99": percentile(seconds, 99) * 1000,
+        "max": max(seconds) * 1000,
+    }
+
+
+async def wait_for_server(port: int, timeout: float = 30.0) -> None:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as http:
+        while True:
+            try:
+                (await http.get("/bench/stats")).raise_for_status()
+                return
+            except httpx.HTTPError:
+                if loop.time() >= deadline:
+                    raise RuntimeError(f"Bench server on port {port} did not start")
+                await asyncio.sleep(0.1)
+
+
+async def run_step(args: argparse.Namespace, subscribers: int) -> dict[str, Any]:
+    # Spawned rather than forked so the server starts without the driver's event loop state
+    process = multiprocessing.get_context("spawn").Process(
+        target=serve, args=(args.port, args.workers), daemon=True
+    )
+    process.start()
+    try:
+        await wait_for_server(args.port)
+        return await LoadRun(args, args.port, subscribers).run(process.pid)
+    finally:
+        process.terminate()
+        process.join(10)
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    steps = [await run_step(args, count) for count in args.subscribers]
+    return {
+        "clients": args.clients,
+        "workers": args.workers,
+        "latency": args.latency,
+        "payload_bytes": args.payload_bytes,
+        "duration": args.duration,
+        "steps": steps,
+    }
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--clients", type=int, default=32, help="concurrent HTTP clients"
+    )
+    parser.add_argument(
+        "--subscribers",
+        type=lambda value: [int(count) for count in value.split(",")],
+        default=[1, 10, 50],
+        help="comma separated websocket subscriber counts, one run each",
+    )
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per run")
+    parser.add_argument(
+        "--latency", type=float, default=0.005, help="executor latency in seconds"
+    )
+    parser.add_argument("--workers", type=int, default=1, help="process_tasks loops")
+    parser.add_argument("--payload-bytes", type=int, default=256)
+    parser.add_argument("--task-timeout", type=float, default=60.0)
+    parser.add_argument("--sample-interval", type=float, default=1.0)
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,198 @@
+"""Deterministic DiscordSession benchmark against the synthetic page in dev/fake_discord.py.
+
+Launches headless Chromium with a remote debugging port and `discord.com` resolved to the
+local fake server, attaches a DiscordSession exactly as DiscordApp does, and times each
+operation. Round-trips are the Playwright / CDP calls recorded by the session's tracing spans.
+
+Usage:
+    python -m dev.bench_discord --guilds 20 --channels 40 --collapsed 4 --repeat 5 [--cdp]
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from apps.discord_session import DiscordSession
+from apps.playwright_driver import get_playwright, stop_playwright
+from dev.fake_discord import FakeDiscordLayout, FakeDiscordServer
+from utils.loop_watchdog import percentile
+from utils.tracing import start_trace, use_span
+
+ROUND_TRIP_PREFIXES = ("playwright.", "cdp.")
+
+
+@dataclass
+class BenchApp:
+    """Stands in for DiscordApp; DiscordSession only needs the debugging port"""
+
+    rpc_port: int
+    instance_id: str = "bench"
+
+
+class Recorder:
+    def __init__(self):
+        self.results: dict[str, list[dict[str, Any]]] = {}
+
+    async def measure(self, name: str, operation: Callable[[], Awaitable[Any]]) -> Any:
+        root = start_trace(name)
+        started = time.perf_counter()
+        with use_span(root):
+            result = await operation()
+        elapsed = time.perf_counter() - started
+        root.end()
+        calls: dict[str, int] = {}
+        for span in root.trace.spans:
+            if span.name.startswith(ROUND_TRIP_PREFIXES):
+                calls[span.name] = calls.get(span.name, 0) + 1
+        self.results.setdefault(name, []).append(
+            {"seconds": elapsed, "round_trips": sum(calls.values()), "calls": calls}
+        )
+        return result
+
+    def report(self) -> dict[str, Any]:
+        report = {}
+        for name, runs in self.results.items():
+            seconds = [run["seconds"] for run in runs]
+            report[name] = {
+                "runs": len(runs),
+                "mean_ms": statistics.fmean(seconds) * 1000,
+                "p50_ms": percentile(seconds, 50) * 1000,
+                "p90_ms": percentile(seconds, 90) * 1000,
+                "max_ms": max(seconds) * 1000,
+                "round_trips": statistics.fmean(run["round_trips"] for run in runs),
+                "calls": runs[-1]["calls"],
+            }
+        return report
+
+
+async def run(args: argparse.Namespace) -> dict[str, Any]:
+    layout = FakeDiscordLayout(
+        guilds=args.guilds,
+        channels=args.channels,
+        collapsed_categories=args.collapsed,
+        seed=args.seed,
+    )
+    server = FakeDiscordServer(layout)
+    server.start()
+    playwright = await get_playwright()
+    with tempfile.TemporaryDirectory() as profile:
+        # A persistent context gives the single default context + page DiscordSession expects
+        browser = await playwright.chromium.launch_persistent_context(
+            profile,
+            headless=True,
+            args=[
+                f"--remote-debugging-port={args.port}",
+                f"--host-resolver-rules=MAP discord.com 127.0.0.1:{server.port}",
+            ],
+        )
+        try:
+            return await run_session(args, layout, browser.pages[0])
+        finally:
+            await browser.close()
+            await stop_playwright()
+            server.stop()
+
+
+async def run_session(
+    args: argparse.Namespace, layout: FakeDiscordLayout, page
+) -> dict:
+    recorder = Recorder()
+    use_cdp = args.cdp
+    for _ in range(args.repeat):
+        await page.goto("http://discord.com/channels/@me")
+        session = DiscordSession(BenchApp(args.port))
+        await recorder.measure("start", session.start)
+        await recorder.measure("learn_servers", lambda: session.learn_servers(use_cdp))
+        servers = session.get_servers_as_list()
+        assert (
+            len(servers) == layout.guilds
+        ), f"learned {len(servers)} of {layout.guilds} servers"
+
+        for server in servers[: args.learn_guilds]:
+            await recorder.measure(
+                "learn_channels", lambda: session.learn_channels(server, use_cdp)
+            )
+
+        await page.evaluate("window.__fakeDiscord.collapseAll()")
+        await recorder.measure("expand_categories", session.expand_categories)
+        # Collapsing every server's categories invalidates the session's expansion state
+        session.expanded_servers.clear()
+
+        # Alternate servers so that every hop is a server switch followed by a channel switch
+        learned = servers[: args.learn_guilds]
+        targets = [
+            server.get_channels("text")[hop]
+            for hop in range(2)
+            for server in learned
+            if len(server.get_channels("text")) > hop
+        ]
+        for channel in targets:
+            await recorder.measure(
+                "navigate_to_text_channel",
+                lambda: session.navigate_to_text_channel(channel),
+            )
+
+        names = [channel.name for channel in session.get_channels()]
+        lookups = names[: args.lookups]
+
+        async def lookup_by_name():
+            for name in lookups:
+                session.get_channels_by_name(name.split("-")[0], False, False)
+
+        async def fuzzy_search():
+            for name in lookups:
+                session.search(name[:6])
+
+        await recorder.measure("get_channels_by_name", lookup_by_name)
+        await recorder.measure("search", fuzzy_search)
+        await session.stop()
+    return {
+        "layout": {
+            "guilds": layout.guilds,
+            "channels": layout.channels,
+            "collapsed_categories": layout.collapsed_categories,
+            "seed": layout.seed,
+        },
+        "cdp_fast_path": use_cdp,
+        "repeat": args.repeat,
+        "operations": recorder.report(),
+    }
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--guilds", type=int, default=20)
+    parser.add_argument("--channels", type=int, default=40, help="channels per guild")
+    parser.add_argument(
+        "--collapsed", type=int, default=4, help="collapsed categories per guild"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--learn-guilds", type=int, default=3, help="guilds to learn channels of"
+    )
+    parser.add_argument("--lookups", type=int, default=200, help="name lookups per run")
+    parser.add_argument("--cdp", action="store_true", help="use the raw CDP fast path")
+    parser.add_argument("--port", type=int, default=9333, help="remote debugging port")
+    parser.add_argument("--output", help="write the JSON report here instead of stdout")
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> None:
+    args = parse_args(argv)
+    report = json.dumps(asyncio.run(run(args)), indent=2)
+    if args.output:
+        with open(args.output, "w") as output:
+            output.write(report + "\n")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
@@ -0,0 +1,170 @@
+"""Replay check for DiscordCapture against a recorded fixture.
+
+Replays dev/fixtures/discord_capture.jsonl (a recording in the format written by `record_path`)
+and checks each run builds the expected catalogue:
+
+- replay: the recording straight into ingestion.
+- page: headless Chromium loads the synthetic page from dev/fake_discord.py, which replays the
+  recording over the network, gateway payloads as a zlib-stream split across websocket frames
+  after a corrupt connection, and API bodies from their routes. A DiscordSession attaches over
+  CDP and enables capture with reload, as DiscordApp does.
+- recording: what the page run recorded, replayed into a new session.
+
+Usage:
+    python -m dev.capture_replay [--fixture dev/fixtures/discord_capture.jsonl] [--port 9334]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+from typing import Any
+
+from apps.discord_capture import DiscordCapture
+from apps.discord_session import DiscordSession
+from apps.playwright_driver import get_playwright, stop_playwright
+from dev.bench_discord import BenchApp
+from dev.fake_discord import FakeDiscordLayout, FakeDiscordServer
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "discord_capture.jsonl")
+# Seconds for capture's asynchronous response handlers to settle after the page replay
+SETTLE_TIMEOUT = 5.0
+
+# Catalogue the fixture must produce: servers {id: (name, channel ids)} and channels
+# {id: (server_id, name, type)}. Categories, threads and channels of unknown guilds are skipped;
+# later CHANNEL_UPDATE / GUILD_CREATE events rename earlier entries
+EXPECTED_SERVERS = {
+    "1001": ("Jazz Club", ["2001", "2002", "2004"]),
+    "1002": ("Bebop and Beyond", ["2101", "2102"]),
+    "1003": ("Hard Bop", ["2201"]),
+    "1004": ("Free Jazz", ["2301", "2302"]),
+}
+EXPECTED_CHANNELS = {
+    "2001": ("1001", "general-chat", "text"),
+    "2002": ("1001", "Lounge", "voice"),
+    "2004": ("1001", "announcements", "text"),
+    "2101": ("1002", "chat", "text"),
+    "2102": ("1002", "Stage", "voice"),
+    "2201": ("1003", "records", "text"),
+    "2301": ("1004", "ornette", "text"),
+    "2302": ("1004", "Voice", "voice"),
+}
+# Search must follow renames: (query, kind, expected top result id)
+EXPECTED_SEARCHES = [
+    ("Bebop and Beyond", "server", "1002"),
+    ("general-chat", "channel", "2001"),
+]
+
+
+def load_fixture(path: str) -> list[dict[str, Any]]:
+    with open(path) as fixture:
+        return [json.loads(line) for line in fixture if line.strip()]
+
+
+def catalogue(session: DiscordSession) -> dict[str, Any]:
+    return {
+        "servers": {
+            server.id: (server.name, sorted(server.channels))
+            for server in session.get_servers_as_list()
+        },
+        "channels": {
+            channel.id: (channel.server_id, channel.name, channel.type)
+            for channel in session.get_channels()
+        },
+    }
+
+
+def check(name: str, session: DiscordSession) -> list[str]:
+    """Differences between the session's catalogue and the expected one"""
+    errors = []
+    actual = catalogue(session)
+    if actual["servers"] != {
+        id: (server_name, sorted(channels))
+        for id, (server_name, channels) in EXPECTED_SERVERS.items()
+    }:
+        errors.append(f"{name}: servers {actual['servers']}")
+    if actual["channels"] != EXPECTED_CHANNELS:
+        errors.append(f"{name}: channels {actual['channels']}")
+    for query, kind, expected_id in EXPECTED_SEARCHES:
+        results = session.search(query, 1, kind)
+        if not results or results[0].item.id != expected_id:
+            errors.append(f"{name}: search {query!r} gave {results}")
+    return errors
+
+
+async def settle(name: str, session: DiscordSession) -> list[str]:
+    deadline = time.monotonic() + SETTLE_TIMEOUT
+    while (errors := check(name, session)) and time.monotonic() < deadline:
+        await asyncio.sleep(0.1)
+    return errors
+
+
+async def check_page(port: int, recording: str) -> list[str]:
+    session = DiscordSession(BenchApp(port, "capture"))
+    await session.start()
+    capture = await session.enable_capture(reload=True, record_path=recording)
+    await session.get_pw_props().main_page.evaluate(
+        "window.__fakeDiscord.captureReplayed"
+    )
+    errors = await settle("page", session)
+    if capture.undecodable_frames != 1:
+        errors.append(f"page: {capture.undecodable_frames} undecodable frames, not 1")
+    # Flushes the recording
+    await session.stop()
+    return errors
+
+
+async def run(args: argparse.Namespace) -> list[str]:
+    session = DiscordSession(None)
+    DiscordCapture(session).replay(args.fixture)
+    errors = check("replay", session)
+
+    server = FakeDiscordServer(
+        FakeDiscordLayout(guilds=1, channels=1, collapsed_categories=0),
+        capture=load_fixture(args.fixture),
+    )
+    server.start()
+    playwright = await get_playwright()
+    with tempfile.TemporaryDirectory() as directory:
+        browser = await playwright.chromium.launch_persistent_context(
+            os.path.join(directory, "profile"),
+            headless=True,
+            args=[
+                f"--remote-debugging-port={args.port}",
+                f"--host-resolver-rules=MAP discord.com 127.0.0.1:{server.port}",
+            ],
+        )
+        try:
+            page = browser.pages[0]
+            await page.goto("http://discord.com/channels/@me")
+            # Let the replay of this first load finish before capture attaches and reloads
+            await page.evaluate("window.__fakeDiscord.captureReplayed")
+            recording = os.path.join(directory, "recording.jsonl")
+            errors += await check_page(args.port, recording)
+        finally:
+            await browser.close()
+            await stop_playwright()
+            server.stop()
+        session = DiscordSession(None)
+        DiscordCapture(session).replay(recording)
+        errors += check("recording", session)
+    return errors
+
+
+def main(argv: list[str]) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixture", default=FIXTURE)
+    parser.add_argument("--port", type=int, default=9334, help="remote debugging port")
+    args = parser.parse_args(argv)
+    errors = asyncio.run(run(args))
+    for error in errors:
+        print(error, file=sys.stderr)
+    print(json.dumps({"fixture": args.fixture, "passed": not errors}))
+    return 1 if errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,376 @@
+"""Synthetic Discord-like page for offline benchmarks.
+
+Renders the subset of Discord's DOM that DiscordSession relies on (guild nav, channel sidebar
+with collapsible categories, message list and textbox) from generated data, and routes
+`/channels/{server}/{channel}` client side with the history API as Discord does.
+
+Given a capture recording (see DiscordCapture's record_path), the page also replays it over
+the network on every load: gateway payloads through a zlib-stream gateway websocket, and API
+bodies from their recorded routes.
+"""
+
+import base64
+import hashlib
+import json
+import random
+import threading
+import zlib
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+WORDS = [
+    "alpha", "bravo", "cedar", "delta", "ember", "fjord", "gamma", "harbor", "indigo", "juniper",
+    "kestrel", "lumen", "meadow", "nebula", "onyx", "prairie", "quartz", "raven", "sierra",
+    "tundra", "umber", "violet", "willow", "xenon", "yonder", "zephyr",
+]  # fmt: skip
+
+SERVER_ID_BASE = 100_000_000_000_000_000
+CHANNEL_ID_BASE = 200_000_000_000_000_000
+
+
+@dataclass(frozen=True)
+class FakeDiscordLayout:
+    """
+    Args:
+        guilds: Number of servers in the guild nav.
+        channels: Channels per server; every fourth is a voice channel.
+        collapsed_categories: Collapsed categories per server, sharing the channels evenly with
+            an always visible uncategorised group.
+        seed: Name generation seed; the same layout and seed always render the same page.
+    """
+
+    guilds: int = 20
+    channels: int = 40
+    collapsed_categories: int = 4
+    seed: int = 0
+
+    def build(self) -> list[dict]:
+        rng = random.Random(self.seed)
+        guilds = []
+        channel_index = 0
+        for guild_index in range(self.guilds):
+            guild_id = str(SERVER_ID_BASE + guild_index)
+            groups: list[dict] = [{"category": None, "channels": []}] + [
+                {"category": f"{rng.choice(WORDS)} category {n}", "channels": []}
+                for n in range(self.collapsed_categories)
+            ]
+            for n in range(self.channels):
+                channel_type = "voice" if n % 4 == 3 else "text"
+                groups[n % len(groups)]["channels"].append(
+                    {
+                        "id": str(CHANNEL_ID_BASE + channel_index),
+                        "name": f"{rng.choice(WORDS)}-{rng.choice(WORDS)}-{n}",
+                        "type": channel_type,
+                    }
+                )
+                channel_index += 1
+            guilds.append(
+                {
+                    "id": guild_id,
+                    "name": f"{rng.choice(WORDS).title()} {rng.choice(WORDS).title()} {guild_index}",
+                    "icon": f"/icons/{guild_id}.png",
+                    "groups": groups,
+                }
+            )
+        return guilds
+
+
+PAGE_SCRIPT = """
+const guildsById = Object.fromEntries(DATA.map((guild) => [guild.id, guild]));
+// Expanded category indexes per guild; collapse state survives switching servers, as in Discord
+const expanded = {};
+const guildNav = document.getElementById('guilds');
+const channelNav = document.getElementById('channels');
+const chat = document.getElementById('chat');
+
+const channelItem = (channel) => `
+    <li><a href="/channels/${channel.guildId}/${channel.id}" data-list-item-id="channels___${channel.id}"
+        aria-label="${channel.name} (${channel.type} channel)"><div class="name_f1">${channel.name}</div></a></li>`;
+
+const renderGuilds = () => {
+    guildNav.innerHTML = DATA.map((guild) => `
+        <div data-list-item-id="guildsnav___${guild.id}"><img src="${guild.icon}"><span>${guild.name}</span></div>`
+    ).join('');
+};
+
+const renderChannels = (guild) => {
+    const open = expanded[guild.id] || new Set();
+    channelNav.innerHTML = guild.groups.map((group, index) => {
+        const items = group.channels.map((channel) => channelItem({ ...channel, guildId: guild.id })).join('');
+        if (group.category === null) {
+            return `<ul>${items}</ul>`;
+        }
+        const isOpen = open.has(index);
+        return `<div role="button" data-category="${index}" aria-expanded="${isOpen}">${group.category}</div>`
+            + `<ul data-category-list="${index}">${isOpen ? items : ''}</ul>`;
+    }).join('');
+};
+
+const renderChat = (channelId) => {
+    chat.innerHTML = channelId === null ? '' : `
+        <ol data-list-id="chat-messages"></ol>
+        <div role="textbox" contenteditable="true" aria-label="Message #${channelId}"></div>`;
+};
+
+const route = () => {
+    const [, section, guildId, channelId] = location.pathname.split('/');
+    const guild = section === 'channels' ? guildsById[guildId] : undefined;
+    if (!guild) {
+        channelNav.innerHTML = '';
+        renderChat(null);
+        return;
+    }
+    renderChannels(guild);
+    renderChat(channelId || null);
+};
+
+const navigate = (path) => {
+    history.pushState({}, '', path);
+    route();
+};
+
+const toggleCategory = (header) => {
+    const guildId = location.pathname.split('/')[2];
+    const guild = guildsById[guildId];
+    const index = Number(header.dataset.category);
+    const open = (expanded[guildId] = expanded[guildId] || new Set());
+    const list = channelNav.querySelector(`[data-category-list="${index}"]`);
+    if (open.has(index)) {
+        open.delete(index);
+        list.innerHTML = '';
+    } else {
+        open.add(index);
+        list.innerHTML = guild.groups[index].channels
+            .map((channel) => channelItem({ ...channel, guildId })).join('');
+    }
+    header.setAttribute('aria-expanded', String(open.has(index)));
+};
+
+document.addEventListener('click', (event) => {
+    const guild = event.target.closest('[data-list-item-id^="guildsnav___"]');
+    if (guild) {
+        const guildId = guild.getAttribute('data-list-item-id').split('___')[1];
+        const first = guildsById[guildId].groups[0].channels.find((channel) => channel.type === 'text');
+        navigate(`/channels/${guildId}/${first ? first.id : ''}`);
+        return;
+    }
+    const category = event.target.closest('[data-category]');
+    if (category) {
+        toggleCategory(category);
+        return;
+    }
+    const channel = event.target.closest('a[data-list-item-id^="channels___"]');
+    if (channel) {
+        event.preventDefault();
+        if (channel.getAttribute('aria-label').endsWith('(text channel)')) {
+            navigate(channel.getAttribute('href'));
+        }
+    }
+});
+window.addEventListener('popstate', route);
+
+// Capture replay: a corrupt gateway connection, as after a dropped frame, then each recorded
+// step in order; a gateway step is a connection sending entries [from, to) and closing
+const gatewaySocket = (query) => new Promise((resolve) => {
+    const socket = new WebSocket(
+        `ws://${location.host}/gateway?encoding=json&v=9&compress=zlib-stream&${query}`);
+    socket.binaryType = 'arraybuffer';
+    socket.addEventListener('close', resolve);
+});
+
+const replayCapture = async () => {
+    await gatewaySocket('corrupt=1');
+    for (const step of CAPTURE) {
+        if (step.path) {
+            await (await fetch(step.path)).json();
+        } else {
+            await gatewaySocket(`from=${step.from}&to=${step.to}`);
+        }
+    }
+};
+
+// Benchmark and capture replay hooks
+window.__fakeDiscord = {
+    collapseAll: () => {
+        for (const key of Object.keys(expanded)) {
+            delete expanded[key];
+        }
+        route();
+    },
+    captureReplayed: CAPTURE ? replayCapture() : Promise.resolve(),
+};
+
+renderGuilds();
+route();
+"""
+
+
+def render_page(guilds: list[dict], capture: list[dict] | None = None) -> str:
+    return f"""<!doctype html>
+<html>
+<head><meta charset="utf-8"><title>Discord</title></head>
+<body>
+<nav aria-label="Servers"><div id="guilds"></div></nav>
+<nav aria-label="Channels" id="channels"></nav>
+<main id="chat"></main>
+<script>const DATA = {json.dumps(guilds)};
+const CAPTURE = {json.dumps(capture)};
+{PAGE_SCRIPT}</script>
+</body>
+</html>
+"""
+
+
+# 1x1 transparent PNG served for every guild icon
+ICON = bytes.fromhex(
+    "89504e470d0a1a0a0000000d4948445200000001000000010806000000"
+    "1f15c4890000000d49444154789c63000100000500010d0a2db40000000049454e44ae426082"
+)
+
+WEBSOCKET_GUID = "258EAFA5-E914-47DA-95CA-C5AB0DC85B11"
+
+
+def api_path(url: str) -> str:
+    parts = urlsplit(url)
+    return parts.path + (f"?{parts.query}" if parts.query else "")
+
+
+def capture_steps(entries: list[dict]) -> list[dict]:
+    """Replay order for a recording: runs of gateway entries as {"from", "to"} index ranges,
+    API entries as {"path"}
+    """
+    steps: list[dict] = []
+    for index, entry in enumerate(entries):
+        if entry["source"] == "api":
+            steps.append({"path": api_path(entry["url"])})
+        elif steps and "to" in steps[-1] and steps[-1]["to"] == index:
+            steps[-1]["to"] = index + 1
+        else:
+            steps.append({"from": index, "to": index + 1})
+    return steps
+
+
+def websocket_frame(payload: bytes, opcode: int = 0x2) -> bytes:
+    """Unmasked, unfragmented server frame; binary by default"""
+    header = bytes([0x80 | opcode])
+    if len(payload) < 126:
+        header += bytes([len(payload)])
+    elif len(payload) < 1 << 16:
+        header += bytes([126]) + len(payload).to_bytes(2, "big")
+    else:
+        header += bytes([127]) + len(payload).to_bytes(8, "big")
+    return header + payload
+
+
+def gateway_frames(payloads: list[dict]) -> list[bytes]:
+    """Payloads compressed into one zlib stream as Discord's gateway does, each message split
+    across two websocket messages so only the second ends with the sync flush marker
+    """
+    compressor = zlib.compressobj()
+    frames = []
+    for payload in payloads:
+        data = compressor.compress(json.dumps(payload).encode())
+        data += compressor.flush(zlib.Z_SYNC_FLUSH)
+        middle = len(data) // 2
+        frames += [data[:middle], data[middle:]]
+    return frames
+
+
+class FakeDiscordServer:
+    """Serve the synthetic page for every path from a background thread.
+
+    Args:
+        layout: Generated guild / channel / category counts.
+        port: Port to listen on; 0 picks a free port.
+        capture: Recorded capture entries for the page to replay on load, served from
+            `/gateway` and their recorded API routes.
+    """
+
+    def __init__(
+        self,
+        layout: FakeDiscordLayout,
+        port: int = 0,
+        capture: list[dict] | None = None,
+    ):
+        self.layout = layout
+        self.guilds = layout.build()
+        capture = capture or []
+        page = render_page(
+            self.guilds, capture_steps(capture) if capture else None
+        ).encode()
+        api_bodies = {
+            api_path(entry["url"]): json.dumps(entry["payload"]).encode()
+            for entry in capture
+            if entry["source"] == "api"
+        }
+        gateway_payloads = [
+            entry["payload"] if entry["source"] == "gateway" else None
+            for entry in capture
+        ]
+
+        class Handler(BaseHTTPRequestHandler):
+            # WebSocket upgrades require HTTP/1.1
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                url = urlsplit(self.path)
+                if url.path == "/gateway" and self.headers.get("Upgrade"):
+                    self._replay_gateway(parse_qs(url.query))
+                    return
+                if self.path in api_bodies:
+                    body, content_type = api_bodies[self.path], "application/json"
+                elif self.path.startswith("/icons/"):
+                    body, content_type = ICON, "image/png"
+                else:
+                    body, content_type = page, "text/html; charset=utf-8"
+                self.send_response(200)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _replay_gateway(self, query: dict[str, list[str]]) -> None:
+                key = self.headers["Sec-WebSocket-Key"] + WEBSOCKET_GUID
+                self.send_response(101)
+                self.send_header("Upgrade", "websocket")
+                self.send_header("Connection", "Upgrade")
+                self.send_header(
+                    "Sec-WebSocket-Accept",
+                    base64.b64encode(hashlib.sha1(key.encode()).digest()).decode(),
+                )
+                self.end_headers()
+                if "corrupt" in query:
+                    frames = [b"not a zlib stream\x00\x00\xff\xff"]
+                else:
+                    start, end = int(query["from"][0]), int(query["to"][0])
+                    frames = gateway_frames(gateway_payloads[start:end])
+                for frame in frames:
+                    self.wfile.write(websocket_frame(frame))
+                # Normal closure; the client's close reply is not awaited
+                self.wfile.write(websocket_frame((1000).to_bytes(2, "big"), 0x8))
+                self.wfile.flush()
+                self.close_connection = True
+
+            def log_message(self, format, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", port), Handler)
+        self._thread: threading.Thread | None = None
+
+    @property
+    def port(self) -> int:
+        return self._server.server_address[1]
+
+    def start(self) -> None:
+        self._thread = threading.Thread(
+            target=self._server.serve_forever, name="fake_discord", daemon=True
+        )
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
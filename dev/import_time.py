@@ -0,0 +1,126 @@
+"""Import time of the FastAPI app, and the modules it must not load eagerly.
+
+Imports `main` in fresh interpreters under `-X importtime`, reporting the median total and the
+slowest modules by cumulative time. Fails when a deferred module (Playwright, requests, psutil
+or an app / controller implementation) is imported, or when `--budget` is exceeded. With
+`--serve`, also times process start until uvicorn accepts connections on the port.
+
+Usage:
+    python -m dev.import_time [--repeat 5] [--top 15] [--budget 600] [--serve]
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+# Loaded on first use only: through ControllerRegistry, or inside the function needing them
+DEFERRED_MODULES = [
+    "playwright",
+    "requests",
+    "psutil",
+    "apps.managed_app",
+    "apps.discord_app",
+    "apps.mpv_app",
+    "controllers.AppController.app_controller",
+    "controllers.DiscordController.discord_controller_pool",
+    "controllers.MpvController.mpv_controller",
+]
+
+PROBE = "import json, sys, main; print(json.dumps(sorted(sys.modules)))"
+
+
+def measure_import() -> tuple[int, dict[str, int], list[str]]:
+    """Total microseconds, cumulative microseconds per top level module and loaded modules"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", PROBE],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative: dict[str, int] = {}
+    total = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative_us, name = line.split("|")
+        if not cumulative_us.strip().isdigit():
+            continue
+        cumulative[name.strip()] = int(cumulative_us)
+        if name.strip() == "main":
+            total = int(cumulative_us)
+    return total, cumulative, json.loads(result.stdout)
+
+
+def measure_serve(port: int, timeout: float = 30.0) -> float:
+    """Seconds from spawning uvicorn until its port accepts a connection"""
+    started = time.perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--port", str(port)],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        env={**os.environ, "LOG_LEVEL": "WARNING"},
+    )
+    try:
+        while time.perf_counter() - started < timeout:
+            try:
+                with socket.create_connection(("127.0.0.1", port), timeout=0.1):
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(0.01)
+        raise RuntimeError(f"uvicorn did not listen on {port} within {timeout}s")
+    finally:
+        process.terminate()
+        process.wait()
+
+
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15, help="slowest modules to list")
+    parser.add_argument("--budget", type=float, help="fail above this median import ms")
+    parser.add_argument("--serve", action="store_true", help="also time port binding")
+    parser.add_argument("--port", type=int, default=8799)
+    return parser.parse_args(argv)
+
+
+def main(argv: list[str]) -> int:
+    args = parse_args(argv)
+    runs = [measure_import() for _ in range(args.repeat)]
+    totals = [total / 1000 for total, _, _ in runs]
+    _, cumulative, modules = runs[-1]
+    loaded = set(modules)
+    eager = [
+        name
+        for name in DEFERRED_MODULES
+        if name in loaded or any(module.startswith(name + ".") for module in loaded)
+    ]
+    report = {
+        "import_ms": {"median": statistics.median(totals), "min": min(totals)},
+        "slowest": {
+            name: cumulative_us / 1000
+            for name, cumulative_us in sorted(
+                cumulative.items(), key=lambda item: item[1], reverse=True
+            )[: args.top]
+        },
+        "eagerly_imported": eager,
+    }
+    if args.serve:
+        report["listen_s"] = measure_serve(args.port)
+    print(json.dumps(report, indent=2))
+
+    failed = bool(eager)
+    if args.budget is not None and report["import_ms"]["median"] > args.budget:
+        print(f"Import time exceeds the {args.budget}ms budget", file=sys.stderr)
+        failed = True
+    if eager:
+        print(f"Imported eagerly: {', '.join(eager)}", file=sys.stderr)
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -279,7 +279,7 @@ async def test_discord():
         #
 
         server = list(discord.session.server_list.values())[0]
-        server_locator = discord.session.get_server_locator(server)
+        server_locator = await discord.session.get_server_locator(server)
         print(server_locator)
         assert isinstance(server_locator, Locator)
         count = await server_locator.count()
@@ -1,41 +1,88 @@
+import logging
 from contextlib import asynccontextmanager
 
 from fastapi import Depends, FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import PlainTextResponse
 
-from controllers.DiscordController.discord_controller import DiscordAppController
+from apps.playwright_driver import stop_playwright
+from config import config
+from controllers.controller_registry import ControllerRegistry
 from dependencies import get_broadcaster
+from routers.admin_router import router as admin_router
 from routers.discord_router import router as discord_router
+from routers.mpv_router import router as mpv_router
 from utils.broadcaster import Broadcaster
+from utils.log import configure_logging, shutdown_logging
+from utils.loop_watchdog import LoopWatchdog
+from utils.metrics import registry
+from utils.profiler import SamplingProfiler
+
+logger = logging.getLogger(__name__)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    print("Starting the A.S.S.M.A.N.")
+    configure_logging()
+    logger.info("Starting the A.S.S.M.A.N.")
     broadcaster = Broadcaster()
-    discord_controller = DiscordAppController(broadcaster)
+    # Built on first request; see ControllerRegistry
+    controllers = ControllerRegistry(broadcaster)
+    controllers.register(
+        "discord",
+        "controllers.DiscordController.discord_controller_pool:DiscordControllerPool",
+    )
+    controllers.register(
+        "mpv", "controllers.MpvController.mpv_controller:MpvAppController"
+    )
 
     app.state.broadcaster = broadcaster
-    app.state.discord_controller = discord_controller
+    app.state.controllers = controllers
+
+    loop_watchdog = LoopWatchdog(
+        interval=config.LOOP_WATCHDOG_INTERVAL,
+        block_threshold=config.LOOP_BLOCK_THRESHOLD,
+        slow_step_threshold=config.LOOP_SLOW_STEP_THRESHOLD,
+    )
+    app.state.loop_watchdog = loop_watchdog
+    if config.LOOP_WATCHDOG:
+        await loop_watchdog.start()
+    profiler = SamplingProfiler(
+        interval=config.PROFILER_INTERVAL, task_interval=config.PROFILER_TASK_INTERVAL
+    )
+    app.state.profiler = profiler
 
     yield
 
-    if discord_controller.is_running():
-        await discord_controller.stop()
+    await profiler.stop()
+    await loop_watchdog.stop()
+
+    await controllers.shutdown()
+    await stop_playwright()
+    shutdown_logging()
 
 
 app = FastAPI(lifespan=lifespan)
 app.include_router(discord_router, prefix="/discord")
+app.include_router(mpv_router, prefix="/mpv")
+app.include_router(admin_router, prefix="/admin")
+
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    return PlainTextResponse(
+        registry.render(), media_type="text/plain; version=0.0.4; charset=utf-8"
+    )
 
 
 @app.websocket("/ws")
 async def websocket_connect(websocket: WebSocket, broadcaster=Depends(get_broadcaster)):
     await websocket.accept()
     await broadcaster.connect(websocket)
-    print("Client connected")
+    logger.info("Client connected")
     try:
         while True:
             await websocket.receive_text()
     except WebSocketDisconnect:
-        print("Client disconnected")
+        logger.info("Client disconnected")
     finally:
         await broadcaster.disconnect(websocket)
@@ -1,16 +1,18 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Literal
 
-import apps.discord_session_utils as utils
 from assman_types import JSONType
+from utils.serialization import RawJSON, dumps
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class DiscordChannel:
     id: str
     server_id: str
     name: str
     type: Literal["voice", "text"]
+    # Encoded on first use; channels are immutable, so it never goes stale
+    _json: RawJSON | None = field(default=None, init=False, repr=False, compare=False)
 
     def to_dict(self) -> dict[str, JSONType]:
         return {
@@ -20,18 +22,49 @@ class DiscordChannel:
             "type": self.type,
         }
 
+    def to_json(self) -> RawJSON:
+        if self._json is None:
+            object.__setattr__(self, "_json", RawJSON(dumps(self.to_dict())))
+        return self._json  # type: ignore[return-value]
 
-@dataclass
+
+@dataclass(slots=True)
 class DiscordServer:
     id: str
     name: str
     image_url: str
     channels: dict[str, DiscordChannel]
+    # Type partitioned view of channels, maintained by add_channel
+    channels_by_type: dict[str, dict[str, DiscordChannel]] = field(
+        init=False, repr=False, compare=False
+    )
+    # Encoded server fields and channel map; reset by update() and add_channel()
+    _json_head: str | None = field(default=None, init=False, repr=False, compare=False)
+    _json: RawJSON | None = field(default=None, init=False, repr=False, compare=False)
+
+    def __post_init__(self):
+        self.channels_by_type = {"text": {}, "voice": {}}
+        for channel in self.channels.values():
+            self.channels_by_type[channel.type][channel.id] = channel
+
+    def update(self, name: str, image_url: str) -> None:
+        self.name, self.image_url = name, image_url
+        self._json_head = self._json = None
+
+    def add_channel(self, channel: DiscordChannel) -> None:
+        previous = self.channels.get(channel.id)
+        if previous and previous.type != channel.type:
+            del self.channels_by_type[previous.type][channel.id]
+        self.channels[channel.id] = channel
+        self.channels_by_type[channel.type][channel.id] = channel
+        self._json = None
 
     def get_channels(
         self, type: Literal["any", "text", "voice"]
     ) -> list[DiscordChannel]:
-        return utils.get_channels(self.channels, type)
+        if type == "any":
+            return list(self.channels.values())
+        return list(self.channels_by_type[type].values())
 
     def to_dict(self) -> dict[str, JSONType]:
         return {
@@ -43,3 +76,18 @@ class DiscordServer:
                 for channel_id, channel in self.channels.items()
             },
         }
+
+    def to_json(self) -> RawJSON:
+        """Encoded to_dict(); a new channel only re-joins the channels' cached encodings"""
+        if self._json is None:
+            if self._json_head is None:
+                head = dumps(
+                    {"id": self.id, "name": self.name, "image_url": self.image_url}
+                )
+                self._json_head = head[:-1] + ',"channels":{'
+            channels = ",".join(
+                f"{dumps(channel_id)}:{channel.to_json().text}"
+                for channel_id, channel in self.channels.items()
+            )
+            self._json = RawJSON(f"{self._json_head}{channels}}}}}")
+        return self._json
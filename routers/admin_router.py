@@ -0,0 +1,109 @@
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import JSONResponse, PlainTextResponse, Response
+
+from config import config
+from controllers.controller_registry import ControllerRegistry
+from dependencies import get_controller_registry, get_loop_watchdog, get_profiler
+from utils.loop_watchdog import LoopWatchdog
+from utils.profiler import SamplingProfiler
+
+router = APIRouter()
+
+ProfileFormat = Literal["collapsed", "speedscope"]
+
+
+@router.get("/loop")
+async def loop_report(watchdog: LoopWatchdog = Depends(get_loop_watchdog)):
+    return watchdog.report()
+
+
+@router.post("/loop/start")
+async def start_loop_watchdog(watchdog: LoopWatchdog = Depends(get_loop_watchdog)):
+    await watchdog.start()
+    return watchdog.report()
+
+
+@router.post("/loop/stop")
+async def stop_loop_watchdog(watchdog: LoopWatchdog = Depends(get_loop_watchdog)):
+    await watchdog.stop()
+    return watchdog.report()
+
+
+@router.post("/loop/reset")
+async def reset_loop_watchdog(watchdog: LoopWatchdog = Depends(get_loop_watchdog)):
+    watchdog.reset()
+    return watchdog.report()
+
+
+def _profile_response(profiler: SamplingProfiler, format: ProfileFormat) -> Response:
+    if format == "collapsed":
+        return PlainTextResponse(
+            profiler.collapsed(),
+            headers={"Content-Disposition": 'attachment; filename="profile.folded"'},
+        )
+    return JSONResponse(
+        profiler.speedscope(),
+        headers={
+            "Content-Disposition": 'attachment; filename="profile.speedscope.json"'
+        },
+    )
+
+
+def _start_profiler(profiler: SamplingProfiler, duration: float | None) -> None:
+    try:
+        profiler.start(duration)
+    except RuntimeError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+
+
+@router.get("/profile")
+async def profile_status(profiler: SamplingProfiler = Depends(get_profiler)):
+    return profiler.status()
+
+
+@router.post("/profile/start")
+async def start_profile(
+    duration: float | None = Query(None, gt=0, le=config.PROFILER_MAX_DURATION),
+    profiler: SamplingProfiler = Depends(get_profiler),
+):
+    """Start profiling in the background; runs until /profile/stop when no duration is given"""
+    _start_profiler(profiler, duration)
+    return profiler.status()
+
+
+@router.post("/profile/stop")
+async def stop_profile(profiler: SamplingProfiler = Depends(get_profiler)):
+    await profiler.stop()
+    return profiler.status()
+
+
+@router.get("/profile/download")
+async def download_profile(
+    format: ProfileFormat = "speedscope",
+    profiler: SamplingProfiler = Depends(get_profiler),
+):
+    """Samples of the current or last profile"""
+    return _profile_response(profiler, format)
+
+
+@router.post("/profile/capture")
+async def capture_profile(
+    duration: float = Query(10.0, gt=0, le=config.PROFILER_MAX_DURATION),
+    format: ProfileFormat = "speedscope",
+    profiler: SamplingProfiler = Depends(get_profiler),
+):
+    """Profile for `duration` seconds and return the result"""
+    _start_profiler(profiler, duration)
+    await profiler.wait()
+    await profiler.stop()
+    return _profile_response(profiler, format)
+
+
+@router.get("/controllers")
+async def list_controllers(
+    controllers: ControllerRegistry = Depends(get_controller_registry),
+):
+    """Registered controllers and whether each has been built yet"""
+    return controllers.describe()
@@ -1,30 +1,151 @@
-from fastapi import APIRouter, Depends
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from pydantic import BaseModel
 
-from controllers.DiscordController.discord_controller import DiscordAppController
 from controllers.DiscordController.discord_types import DiscordAppTaskType
-from dependencies import get_discord_controller
+from dependencies import (
+    get_channel_controller,
+    get_discord_controllers,
+    get_discord_pool,
+    pick_discord_controller,
+)
+from utils.http_cache import snapshot_response
+
+if TYPE_CHECKING:
+    from controllers.DiscordController.discord_controller import DiscordAppController
+    from controllers.DiscordController.discord_controller_pool import (
+        DiscordControllerPool,
+    )
 
 router = APIRouter()
 
 
+class OutgoingMessage(BaseModel):
+    channel_id: str
+    content: str
+
+
+@router.get("/instances")
+async def list_instances(pool: DiscordControllerPool = Depends(get_discord_pool)):
+    return pool.describe()
+
+
 @router.get("/start")
 async def start_discord(
-    controller: DiscordAppController = Depends(get_discord_controller),
+    controllers: list[DiscordAppController] = Depends(get_discord_controllers),
 ):
-    await controller.start()
-    await controller.start_playwright()
+    for controller in controllers:
+        if controller.is_running():
+            continue
+        await controller.start()
+        await controller.start_playwright()
     return
 
 
 @router.get("/stop")
 async def stop_discord(
-    controller: DiscordAppController = Depends(get_discord_controller),
+    controllers: list[DiscordAppController] = Depends(get_discord_controllers),
 ):
-    return await controller.stop()
+    for controller in controllers:
+        if controller.is_running():
+            await controller.stop()
 
 
 @router.get("/server/learn")
 async def learn_servers(
-    controller: DiscordAppController = Depends(get_discord_controller),
+    controllers: list[DiscordAppController] = Depends(get_discord_controllers),
+):
+    """Learn on every running instance, or the pinned one; task ids by instance"""
+    return {
+        controller.app.instance_id: await controller.submit_task(
+            DiscordAppTaskType.LEARN_SERVERS, {}
+        )
+        for controller in controllers
+        if controller.is_running()
+    }
+
+
+@router.get("/servers")
+async def list_servers(
+    request: Request,
+    instance: str | None = None,
+    pool: DiscordControllerPool = Depends(get_discord_pool),
+):
+    """Servers with their channels learned by the pinned instance, else by every running
+    instance; 304 while the If-None-Match ETag is current
+    """
+    if instance is None:
+        return snapshot_response(request, pool.get_servers_snapshot())
+    controller = pick_discord_controller(pool, instance)
+    try:
+        return snapshot_response(request, controller.app.get_servers_snapshot())
+    except RuntimeError as e:
+        # Pinned instance not started
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/channels")
+async def list_channels(
+    request: Request,
+    channel_type: Literal["any", "voice", "text"] = "any",
+    instance: str | None = None,
+    pool: DiscordControllerPool = Depends(get_discord_pool),
+):
+    if instance is None:
+        return snapshot_response(request, pool.get_channels_snapshot(channel_type))
+    controller = pick_discord_controller(pool, instance)
+    try:
+        return snapshot_response(
+            request, controller.app.get_channels_snapshot(channel_type)
+        )
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/search")
+async def search(
+    q: str,
+    limit: int = 10,
+    kind: Literal["all", "server", "channel"] = "all",
+    server_id: str | None = None,
+    channel_type: Literal["all", "voice", "text"] = "all",
+    instance: str | None = None,
+    pool: DiscordControllerPool = Depends(get_discord_pool),
+):
+    """Search the pinned instance's catalogue, else every running instance's"""
+    if instance is None:
+        return pool.search(q, limit, kind, server_id, channel_type)
+    controller = pick_discord_controller(pool, instance)
+    try:
+        return controller.app.search(q, limit, kind, server_id, channel_type)
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+
+@router.get("/channel/{channel_id}/messages")
+async def fetch_messages(
+    channel_id: str,
+    limit: int | None = None,
+    controller: DiscordAppController = Depends(get_channel_controller),
+):
+    return await controller.submit_task(
+        DiscordAppTaskType.FETCH_MESSAGES, {"channel_id": channel_id, "limit": limit}
+    )
+
+
+@router.post("/messages")
+async def send_messages(
+    messages: list[OutgoingMessage],
+    instance: str | None = None,
+    pool: DiscordControllerPool = Depends(get_discord_pool),
 ):
-    return await controller.submit_task(DiscordAppTaskType.LEARN_SERVERS, {})
+    controller = pick_discord_controller(
+        pool, instance, [message.channel_id for message in messages]
+    )
+    return await controller.submit_task(
+        DiscordAppTaskType.SEND_MESSAGE,
+        {"messages": [message.model_dump() for message in messages]},
+    )
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+from fastapi import APIRouter, Depends
+from pydantic import BaseModel
+
+from controllers.MpvController.mpv_types import MpvAppTaskType
+from dependencies import get_mpv_controller
+
+if TYPE_CHECKING:
+    from controllers.MpvController.mpv_controller import MpvAppController
+
+router = APIRouter()
+
+
+@router.get("/start")
+async def start_mpv(
+    controller: MpvAppController = Depends(get_mpv_controller),
+):
+    await controller.start()
+    return
+
+
+@router.get("/stop")
+async def stop_mpv(
+    controller: MpvAppController = Depends(get_mpv_controller),
+):
+    return await controller.stop()
+
+
+@router.get("/pool")
+async def describe_pool(
+    controller: MpvAppController = Depends(get_mpv_controller),
+):
+    return controller.pool.describe()
+
+
+class PlayRequest(BaseModel):
+    path: str
+    append: bool = False
+    instance: str | None = None
+
+
+@router.post("/play")
+async def play(
+    request: PlayRequest,
+    controller: MpvAppController = Depends(get_mpv_controller),
+):
+    return await controller.submit_task(
+        MpvAppTaskType.PLAY, request.model_dump(exclude_none=True)
+    )
+
+
+@router.post("/{instance}/pause")
+async def pause(
+    instance: str,
+    controller: MpvAppController = Depends(get_mpv_controller),
+):
+    return await controller.submit_task(MpvAppTaskType.PAUSE, {"instance": instance})
+
+
+@router.post("/{instance}/resume")
+async def resume(
+    instance: str,
+    controller: MpvAppController = Depends(get_mpv_controller),
+):
+    return await controller.submit_task(MpvAppTaskType.RESUME, {"instance": instance})
+
+
+@router.post("/{instance}/stop")
+async def stop_playback(
+    instance: str,
+    controller: MpvAppController = Depends(get_mpv_controller),
+):
+    return await controller.submit_task(MpvAppTaskType.STOP, {"instance": instance})
@@ -1,10 +1,14 @@
 import asyncio
+import time
 from datetime import datetime
 from typing import Set
 
 from fastapi import WebSocket
 
 from controllers.controller_types import AppBroadcastType, JSONType
+from utils.metrics import BROADCAST_FANOUT, BROADCAST_SEND_ERRORS, WEBSOCKET_CLIENTS
+from utils.serialization import dumps
+from utils.tracing import span
 
 
 class Broadcaster:
@@ -15,10 +19,12 @@ class Broadcaster:
     async def connect(self, websocket: WebSocket):
         async with self._lock:
             self._connections.add(websocket)
+            WEBSOCKET_CLIENTS.set(len(self._connections))
 
     async def disconnect(self, websocket: WebSocket):
         async with self._lock:
             self._connections.discard(websocket)
+            WEBSOCKET_CLIENTS.set(len(self._connections))
 
     async def broadcast(
         self, message: dict[str, JSONType], message_type: AppBroadcastType | None = None
@@ -32,8 +38,20 @@ class Broadcaster:
         if message_type:
             broadcast["message_type"] = message_type.value
 
-        await asyncio.gather(
-            # Broadcast to all connected sockets
-            *[websocket.send_json(message) for websocket in connections],
-            return_exceptions=True,
-        )
+        started = time.perf_counter()
+        with span(
+            "broadcast",
+            message_type=str(broadcast.get("message_type")),
+            clients=len(connections),
+        ):
+            # Encoded once for every client, rather than by each send_json()
+            text = dumps(broadcast)
+            results = await asyncio.gather(
+                # Broadcast to all connected sockets
+                *[websocket.send_text(text) for websocket in connections],
+                return_exceptions=True,
+            )
+        BROADCAST_FANOUT.observe(time.perf_counter() - started)
+        errors = sum(isinstance(result, BaseException) for result in results)
+        if errors:
+            BROADCAST_SEND_ERRORS.inc(errors)
@@ -0,0 +1,25 @@
+from fastapi import Request, Response
+
+from utils.serialization import Snapshot
+
+# Clients may reuse a response only after revalidating it against the current ETag
+CACHE_CONTROL = "no-cache"
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against an ETag (RFC 9110 13.1.2)"""
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+def snapshot_response(request: Request, snapshot: Snapshot) -> Response:
+    """The snapshot's pre-encoded body, or an empty 304 when the client already holds it"""
+    headers = {"ETag": snapshot.etag, "Cache-Control": CACHE_CONTROL}
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match and _etag_matches(if_none_match, snapshot.etag):
+        return Response(status_code=304, headers=headers)
+    return Response(snapshot.body, media_type="application/json", headers=headers)
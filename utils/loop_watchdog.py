@@ -0,0 +1,329 @@
+import asyncio
+import collections.abc
+import heapq
+import itertools
+import logging
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from assman_types import JSONType
+from utils.metrics import registry
+
+logger = logging.getLogger(__name__)
+
+EVENT_LOOP_LAG = registry.histogram(
+    "assman_event_loop_lag_seconds",
+    "Delay between a scheduled watchdog tick and the event loop running it",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+EVENT_LOOP_BLOCKS = registry.counter(
+    "assman_event_loop_blocks_total",
+    "Times the event loop was blocked beyond the threshold",
+)
+
+
+def percentile(values: list[float], q: float) -> float | None:
+    """Nearest-rank percentile of `values`, q in [0, 100]"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return ordered[rank]
+
+
+@dataclass
+class BlockingEvent:
+    started_at: float  # time.time() of the last tick before the stall
+    stack: list[str]
+    duration: float | None = None
+    started_monotonic: float = 0.0
+
+    def to_dict(self) -> dict[str, JSONType]:
+        return {
+            "started_at": self.started_at,
+            "duration": self.duration,
+            "stack": self.stack,
+        }
+
+
+@dataclass(order=True)
+class SlowStep:
+    duration: float
+    seq: int
+    callback: str = field(compare=False)
+    at: float = field(compare=False)
+
+    def to_dict(self) -> dict[str, JSONType]:
+        return {"callback": self.callback, "duration": self.duration, "at": self.at}
+
+
+def describe_callback(handle: asyncio.Handle) -> str:
+    """Name the coroutine a task step resumes, or the plain callback otherwise"""
+    callback = getattr(handle, "_callback", None)
+    owner = getattr(callback, "__self__", None)
+    if isinstance(owner, asyncio.Task):
+        coro = owner.get_coro()
+        name = getattr(coro, "__qualname__", None) or repr(coro)
+        return f"{owner.get_name()}: {name}"
+    return getattr(callback, "__qualname__", None) or repr(callback)
+
+
+class TimedCoroutine(collections.abc.Coroutine):
+    """Coroutine proxy timing each step a Task drives it through, for loops whose handles
+    cannot be instrumented. Frame attributes are forwarded so stack walkers see through it.
+    """
+
+    __slots__ = ("_coro", "_observe")
+
+    def __init__(self, coro: Any, observe: Callable[[Any, float], None]):
+        self._coro = coro
+        self._observe = observe
+
+    def send(self, value: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self._coro.send(value)
+        finally:
+            self._observe(self._coro, time.perf_counter() - started)
+
+    def throw(self, *args: Any) -> Any:
+        started = time.perf_counter()
+        try:
+            return self._coro.throw(*args)
+        finally:
+            self._observe(self._coro, time.perf_counter() - started)
+
+    def close(self) -> None:
+        self._coro.close()
+
+    def __await__(self):
+        return self._coro.__await__()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._coro, name)
+
+
+class LoopWatchdog:
+    """Opt-in monitor of event loop responsiveness.
+
+    A ticker coroutine sleeps for `interval` and records how late it wakes as loop lag. A
+    monitor thread watches the ticker; once it has not run for `block_threshold`, the loop
+    thread's current stack is captured as the blocking culprit. Slow coroutine steps are also
+    timed, keeping the `slow_step_count` slowest.
+
+    On asyncio's own loops every callback is timed by instrumenting Handle. Other loops, i.e.
+    uvloop which uvicorn prefers when installed, run their handles natively; there each task
+    created while the watchdog runs is wrapped by a task factory instead, so only steps of
+    tasks started after start() are seen. report() gives the method in use as
+    `slow_step_source`.
+
+    Args:
+        interval: Seconds between ticks.
+        block_threshold: Seconds without a tick before the loop counts as blocked.
+        slow_step_threshold: Callbacks running at least this long are candidates for slow steps.
+        history: Lag samples and blocking events retained.
+        slow_step_count: Slowest steps retained.
+    """
+
+    def __init__(
+        self,
+        interval: float,
+        block_threshold: float,
+        slow_step_threshold: float,
+        history: int = 2048,
+        slow_step_count: int = 20,
+    ):
+        self.interval = interval
+        self.block_threshold = block_threshold
+        self.slow_step_threshold = slow_step_threshold
+        self.lag_samples: deque[float] = deque(maxlen=history)
+        self.blocking_events: deque[BlockingEvent] = deque(maxlen=history)
+        # Appended to by the monitor thread while the loop reports or resets
+        self._blocking_lock = threading.Lock()
+        self.slow_steps: list[SlowStep] = []
+        self.slow_step_count = slow_step_count
+        self._seq = itertools.count()
+        self._last_tick = time.monotonic()
+        self._current_block: BlockingEvent | None = None
+        self._loop_thread_id: int | None = None
+        self._ticker: asyncio.Task | None = None
+        self._monitor: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._original_run = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._previous_task_factory = None
+        self._task_factory = None
+        self.slow_step_source: str | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._ticker is not None
+
+    async def start(self) -> None:
+        if self.running:
+            return
+        self._loop_thread_id = threading.get_ident()
+        self._last_tick = time.monotonic()
+        self._stopping.clear()
+        self._instrument_steps()
+        self._ticker = asyncio.create_task(self._tick(), name="loop_watchdog")
+        self._monitor = threading.Thread(
+            target=self._watch, name="loop_watchdog_monitor", daemon=True
+        )
+        self._monitor.start()
+
+    async def stop(self) -> None:
+        if not self._ticker:
+            return
+        self._ticker.cancel()
+        await asyncio.gather(self._ticker, return_exceptions=True)
+        self._ticker = None
+        self._stopping.set()
+        if self._monitor:
+            await asyncio.to_thread(self._monitor.join)
+            self._monitor = None
+        self._uninstrument_steps()
+
+    # Lag
+    async def _tick(self) -> None:
+        while True:
+            scheduled = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            lag = max(0.0, now - scheduled)
+            self._last_tick = now
+            self.lag_samples.append(lag)
+            EVENT_LOOP_LAG.observe(lag)
+            block = self._current_block
+            if block is not None:
+                block.duration = now - block.started_monotonic
+                self._current_block = None
+
+    # Blocking calls
+    def _watch(self) -> None:
+        while not self._stopping.wait(self.interval):
+            stalled_for = time.monotonic() - self._last_tick
+            if stalled_for < self.block_threshold or self._current_block is not None:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id or 0)
+            if frame is None:
+                continue
+            block = BlockingEvent(
+                started_at=time.time() - stalled_for,
+                stack=[line.rstrip() for line in traceback.format_stack(frame)],
+                started_monotonic=self._last_tick,
+            )
+            self._current_block = block
+            with self._blocking_lock:
+                self.blocking_events.append(block)
+            EVENT_LOOP_BLOCKS.inc()
+            logger.warning(
+                "Event loop blocked for over %.3fs",
+                stalled_for,
+                extra={"stack": block.stack[-5:]},
+            )
+
+    # Slow coroutine steps
+    def _instrument_steps(self) -> None:
+        loop = asyncio.get_running_loop()
+        self._loop = loop
+        if isinstance(loop, asyncio.BaseEventLoop):
+            self._patch_handles()
+            self.slow_step_source = "handles"
+        else:
+            self._wrap_tasks(loop)
+            self.slow_step_source = "tasks"
+
+    def _uninstrument_steps(self) -> None:
+        self._unpatch_handles()
+        if self._loop is not None and self._task_factory is not None:
+            if self._loop.get_task_factory() is self._task_factory:
+                self._loop.set_task_factory(self._previous_task_factory)
+            self._task_factory = self._previous_task_factory = None
+        self._loop = None
+        self.slow_step_source = None
+
+    def _patch_handles(self) -> None:
+        original = asyncio.events.Handle._run
+        watchdog = self
+
+        def timed_run(handle: asyncio.Handle) -> None:
+            started = time.perf_counter()
+            try:
+                original(handle)
+            finally:
+                duration = time.perf_counter() - started
+                if duration >= watchdog.slow_step_threshold:
+                    watchdog._record_step(describe_callback(handle), duration)
+
+        self._original_run = original
+        asyncio.events.Handle._run = timed_run  # type: ignore[method-assign]
+
+    def _unpatch_handles(self) -> None:
+        if self._original_run is not None:
+            asyncio.events.Handle._run = self._original_run  # type: ignore[method-assign]
+            self._original_run = None
+
+    def _wrap_tasks(self, loop: asyncio.AbstractEventLoop) -> None:
+        previous = loop.get_task_factory()
+
+        def factory(loop: asyncio.AbstractEventLoop, coro: Any, **kwargs: Any):
+            coro = TimedCoroutine(coro, self._observe_task_step)
+            if previous is not None:
+                return previous(loop, coro, **kwargs)
+            return asyncio.Task(coro, loop=loop, **kwargs)
+
+        self._previous_task_factory = previous
+        self._task_factory = factory
+        loop.set_task_factory(factory)
+
+    def _observe_task_step(self, coro: Any, duration: float) -> None:
+        # Tasks wrapped before stop() keep reporting; ignore them once stopped
+        if duration < self.slow_step_threshold or self.slow_step_source != "tasks":
+            return
+        task = asyncio.current_task()
+        name = getattr(coro, "__qualname__", None) or repr(coro)
+        self._record_step(f"{task.get_name()}: {name}" if task else name, duration)
+
+    def _record_step(self, callback: str, duration: float) -> None:
+        if (
+            len(self.slow_steps) >= self.slow_step_count
+            and duration <= self.slow_steps[0].duration
+        ):
+            return
+        step = SlowStep(duration, next(self._seq), callback, time.time())
+        if len(self.slow_steps) < self.slow_step_count:
+            heapq.heappush(self.slow_steps, step)
+        else:
+            heapq.heapreplace(self.slow_steps, step)
+
+    def report(self) -> dict[str, JSONType]:
+        samples = list(self.lag_samples)
+        with self._blocking_lock:
+            blocking = list(self.blocking_events)
+        return {
+            "running": self.running,
+            "lag": {
+                "samples": len(samples),
+                "p50": percentile(samples, 50),
+                "p90": percentile(samples, 90),
+                "p99": percentile(samples, 99),
+                "max": max(samples, default=None),
+            },
+            "blocking": [event.to_dict() for event in blocking],
+            "slow_step_source": self.slow_step_source,
+            "slow_steps": [
+                step.to_dict() for step in sorted(self.slow_steps, reverse=True)
+            ],
+        }
+
+    def reset(self) -> None:
+        self.lag_samples.clear()
+        with self._blocking_lock:
+            self.blocking_events.clear()
+        self.slow_steps.clear()
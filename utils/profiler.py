@@ -0,0 +1,271 @@
+import asyncio
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from types import CodeType, FrameType
+from typing import Any
+
+from assman_types import JSONType
+
+TASKS_PROFILE = "asyncio tasks"
+
+# Interned frame key: a function's code object, or a label for a non-coroutine awaitable
+FrameKey = CodeType | str
+
+
+def _short_path(path: str) -> str:
+    """Path relative to the working directory for project files, else its last two parts"""
+    cwd = os.getcwd()
+    if path.startswith(cwd + os.sep):
+        return os.path.relpath(path, cwd)
+    return os.path.join(*path.split(os.sep)[-2:]) if os.sep in path else path
+
+
+def _coroutine_frames(awaitable: Any) -> tuple[list[FrameType], str | None]:
+    """Frames of a suspended coroutine and every coroutine it awaits, outermost first, plus a
+    label for the innermost non-coroutine awaitable (i.e. a Future)
+    """
+    frames = []
+    while awaitable is not None:
+        frame = (
+            getattr(awaitable, "cr_frame", None)
+            or getattr(awaitable, "gi_frame", None)
+            or getattr(awaitable, "ag_frame", None)
+        )
+        if frame is None:
+            if not hasattr(awaitable, "cr_await"):
+                return frames, f"<{type(awaitable).__name__}>"
+            break
+        frames.append(frame)
+        awaitable = (
+            getattr(awaitable, "cr_await", None)
+            or getattr(awaitable, "gi_yieldfrom", None)
+            or getattr(awaitable, "ag_await", None)
+        )
+    return frames, None
+
+
+class SamplingProfiler:
+    """In-process sampling profiler for live diagnosis, without restarting under an external one.
+
+    A sampler thread reads every thread's stack through sys._current_frames() each `interval`,
+    giving wall-clock profiles which include time spent blocked or idle. Every `task_interval`
+    it also asks the event loop to record the await chain of each asyncio task; the request is
+    skipped while a previous one is still waiting, so a busy loop is never flooded. Samples are
+    aggregated per distinct stack as they arrive, keeping memory bounded by stack variety
+    rather than duration.
+
+    Args:
+        interval: Seconds between thread stack samples.
+        task_interval: Seconds between asyncio task stack samples.
+    """
+
+    def __init__(self, interval: float, task_interval: float):
+        self.interval = interval
+        self.task_interval = task_interval
+        self.started_at: float | None = None
+        self.stopped_at: float | None = None
+        self.duration: float | None = None
+        self._frames: dict[FrameKey, int] = {}
+        self._frame_info: list[dict[str, JSONType]] = []
+        # Per profile: stack of frame indexes -> [sample count, seconds]
+        self._stacks: dict[str, dict[tuple[int, ...], list[float]]] = defaultdict(dict)
+        self._samples = 0
+        self._task_samples = 0
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._sampler: threading.Thread | None = None
+        self._stopping = threading.Event()
+        self._task_sample_pending = False
+        # Task samples are recorded on the loop thread, concurrently with the sampler thread
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._sampler is not None and self._sampler.is_alive()
+
+    def start(self, duration: float | None = None) -> None:
+        """Begin a new profile, discarding the last; stops on its own after `duration` seconds
+
+        Raises:
+            RuntimeError if a profile is already being captured
+        """
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+        self._reset()
+        self._loop = asyncio.get_running_loop()
+        self.duration = duration
+        self.started_at = time.time()
+        self.stopped_at = None
+        self._stopping.clear()
+        self._sampler = threading.Thread(
+            target=self._sample, name="sampling_profiler", daemon=True
+        )
+        self._sampler.start()
+
+    async def stop(self) -> None:
+        if self._sampler is None:
+            return
+        self._stopping.set()
+        await asyncio.to_thread(self._sampler.join)
+        self._sampler = None
+
+    async def wait(self) -> None:
+        """Wait for a profile started with a duration to finish"""
+        if self._sampler is not None:
+            await asyncio.to_thread(self._sampler.join)
+
+    def _reset(self) -> None:
+        self._frames.clear()
+        self._frame_info.clear()
+        self._stacks.clear()
+        self._samples = self._task_samples = 0
+
+    # Sampling
+    def _sample(self) -> None:
+        own_id = threading.get_ident()
+        started = last = time.perf_counter()
+        next_task_sample = started
+        deadline = started + self.duration if self.duration else None
+        try:
+            while not self._stopping.wait(self.interval):
+                now = time.perf_counter()
+                elapsed, last = now - last, now
+                names = {thread.ident: thread.name for thread in threading.enumerate()}
+                for thread_id, frame in sys._current_frames().items():
+                    if thread_id == own_id:
+                        continue
+                    stack = []
+                    while frame is not None:
+                        stack.append(self._frame_index(frame.f_code))
+                        frame = frame.f_back
+                    stack.reverse()
+                    self._add(
+                        f"thread {names.get(thread_id, thread_id)}", stack, elapsed
+                    )
+                self._samples += 1
+                if now >= next_task_sample:
+                    next_task_sample = now + self.task_interval
+                    self._request_task_sample()
+                if deadline is not None and now >= deadline:
+                    break
+        finally:
+            self.stopped_at = time.time()
+
+    def _request_task_sample(self) -> None:
+        if self._task_sample_pending or self._loop is None or self._loop.is_closed():
+            return
+        self._task_sample_pending = True
+        try:
+            self._loop.call_soon_threadsafe(self._sample_tasks)
+        except RuntimeError:
+            self._task_sample_pending = False
+
+    def _sample_tasks(self) -> None:
+        """Runs on the event loop between steps, when every task is suspended"""
+        self._task_sample_pending = False
+        for task in asyncio.all_tasks():
+            name = task.get_name()
+            # Unnamed tasks are numbered; merge them so each coroutine aggregates together
+            stack = [self._frame_index("Task" if name.startswith("Task-") else name)]
+            frames, leaf = _coroutine_frames(task.get_coro())
+            stack.extend(self._frame_index(frame.f_code) for frame in frames)
+            if leaf:
+                stack.append(self._frame_index(leaf))
+            self._add(TASKS_PROFILE, stack, self.task_interval)
+        self._task_samples += 1
+
+    def _frame_index(self, key: FrameKey) -> int:
+        index = self._frames.get(key)
+        if index is not None:
+            return index
+        with self._lock:
+            index = self._frames.get(key)
+            if index is not None:
+                return index
+            index = len(self._frame_info)
+            if isinstance(key, str):
+                self._frame_info.append({"name": key})
+            else:
+                self._frame_info.append(
+                    {
+                        "name": key.co_qualname,
+                        "file": _short_path(key.co_filename),
+                        "line": key.co_firstlineno,
+                    }
+                )
+            self._frames[key] = index
+        return index
+
+    def _add(self, profile: str, stack: list[int], seconds: float) -> None:
+        key = tuple(stack)
+        with self._lock:
+            entry = self._stacks[profile].get(key)
+            if entry is None:
+                self._stacks[profile][key] = [1, seconds]
+            else:
+                entry[0] += 1
+                entry[1] += seconds
+
+    # Output
+    def status(self) -> dict[str, JSONType]:
+        return {
+            "running": self.running,
+            "started_at": self.started_at,
+            "stopped_at": self.stopped_at,
+            "duration": self.duration,
+            "interval": self.interval,
+            "task_interval": self.task_interval,
+            "samples": self._samples,
+            "task_samples": self._task_samples,
+            "profiles": sorted(self._stacks),
+        }
+
+    def _frame_label(self, index: int) -> str:
+        info = self._frame_info[index]
+        if "file" not in info:
+            return str(info["name"])
+        return f"{info['name']} ({info['file']}:{info['line']})"
+
+    def collapsed(self) -> str:
+        """Brendan Gregg's folded stack format, i.e. for flamegraph.pl or speedscope"""
+        lines = []
+        for profile, stacks in self._snapshot().items():
+            for stack, (count, _) in stacks.items():
+                frames = ";".join([profile, *map(self._frame_label, stack)])
+                lines.append(f"{frames} {int(count)}")
+        return "\n".join(lines) + "\n"
+
+    def speedscope(self) -> dict[str, JSONType]:
+        """speedscope file format, one sampled profile per thread plus one of task stacks"""
+        end = (self.stopped_at or time.time()) - (self.started_at or time.time())
+        profiles = []
+        for profile, stacks in self._snapshot().items():
+            profiles.append(
+                {
+                    "type": "sampled",
+                    "name": profile,
+                    "unit": "seconds",
+                    "startValue": 0,
+                    "endValue": end,
+                    "samples": [list(stack) for stack in stacks],
+                    "weights": [seconds for _, seconds in stacks.values()],
+                }
+            )
+        return {
+            "$schema": "https://www.speedscope.app/file-format-schema.json",
+            "shared": {"frames": list(self._frame_info)},
+            "profiles": profiles,
+            "name": f"assman profile {self.started_at}",
+            "activeProfileIndex": 0,
+            "exporter": "assman",
+        }
+
+    def _snapshot(self) -> dict[str, dict[tuple[int, ...], list[float]]]:
+        # The sampler may add stacks while a running profile is read
+        with self._lock:
+            return {
+                profile: {stack: list(entry) for stack, entry in stacks.items()}
+                for profile, stacks in self._stacks.items()
+            }
@@ -0,0 +1,85 @@
+import hashlib
+import json
+import re
+import secrets
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from functools import lru_cache
+from typing import Any
+
+# Placeholder marking where a RawJSON fragment is spliced in; random per process so that no
+# client supplied string can forge one
+_PLACEHOLDER = f"raw-json-{secrets.token_hex(8)}"
+_PLACEHOLDER_PATTERN = re.compile(rf'"{_PLACEHOLDER}:(\d+)"')
+
+
+class RawJSON:
+    """Already encoded JSON text, written verbatim by dumps(); lets models encode their static
+    parts once instead of on every broadcast
+    """
+
+    __slots__ = ("text",)
+
+    def __init__(self, text: str):
+        self.text = text
+
+    @classmethod
+    def array(cls, items: list["RawJSON"]) -> "RawJSON":
+        return cls("[" + ",".join(item.text for item in items) + "]")
+
+    def __repr__(self) -> str:
+        return f"RawJSON({self.text[:60]!r})"
+
+
+def dumps(value: Any) -> str:
+    """Compact JSON text, as Starlette's send_json writes it, with RawJSON fragments spliced in.
+
+    Everything else is encoded by the C encoder; fragments cost one substitution pass, and
+    nothing when the value holds none.
+    """
+    if isinstance(value, RawJSON):
+        return value.text
+    fragments: list[str] = []
+
+    def collect(obj: Any) -> str:
+        if not isinstance(obj, RawJSON):
+            raise TypeError(
+                f"Object of type {type(obj).__name__} is not JSON serializable"
+            )
+        fragments.append(obj.text)
+        return f"{_PLACEHOLDER}:{len(fragments) - 1}"
+
+    text = json.dumps(value, separators=(",", ":"), ensure_ascii=False, default=collect)
+    if not fragments:
+        return text
+    return _PLACEHOLDER_PATTERN.sub(lambda match: fragments[int(match[1])], text)
+
+
+def dumpb(value: Any) -> bytes:
+    return dumps(value).encode()
+
+
+@lru_cache(maxsize=1024)
+def isoformat(timestamp: float) -> str:
+    """UTC ISO 8601 form of a time.time() timestamp; activity timestamps repeat every heartbeat"""
+    return datetime.fromtimestamp(timestamp, tz=timezone.utc).isoformat()
+
+
+@dataclass(frozen=True, slots=True)
+class Snapshot:
+    """Encoded listing at one version of its source, shared by every reader until it changes.
+
+    The ETag is a digest of the body, so it also stays stable across sessions or relearns that
+    reproduce the same content.
+    """
+
+    version: int
+    json: RawJSON
+    body: bytes
+    etag: str
+
+    @classmethod
+    def encode(cls, version: int, json: RawJSON) -> "Snapshot":
+        body = json.text.encode()
+        digest = hashlib.blake2b(body, digest_size=12).hexdigest()
+        return cls(version, json, body, f'"{digest}"')
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import os
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Awaitable, Iterator, TypeVar
+
+from assman_types import JSONType
+
+T = TypeVar("T")
+
+_current_span: ContextVar["Span | None"] = ContextVar("current_span", default=None)
+
+
+def _new_id(size: int) -> str:
+    return os.urandom(size).hex()
+
+
+@dataclass
+class Span:
+    name: str
+    trace: "Trace"
+    parent_id: str | None
+    start_ns: int = field(default_factory=time.time_ns)
+    end_ns: int | None = None
+    span_id: str = field(default_factory=lambda: _new_id(8))
+    attributes: dict[str, JSONType] = field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def duration_ms(self) -> float | None:
+        if self.end_ns is None:
+            return None
+        return (self.end_ns - self.start_ns) / 1e6
+
+    def end(self, end_ns: int | None = None) -> None:
+        if self.end_ns is not None:
+            return
+        self.end_ns = end_ns or time.time_ns()
+        self.trace.spans.append(self)
+
+    def child(self, name: str, **attributes: JSONType) -> "Span":
+        return Span(name, self.trace, self.span_id, attributes=attributes)
+
+    def to_otel(self) -> dict[str, JSONType]:
+        span: dict[str, JSONType] = {
+            "traceId": self.trace.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [
+                {"key": key, "value": _otel_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": (
+                {"code": 2, "message": self.error} if self.error else {"code": 1}
+            ),
+        }
+        if self.parent_id:
+            span["parentSpanId"] = self.parent_id
+        return span
+
+
+def _otel_value(value: JSONType) -> dict[str, JSONType]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+class Trace:
+    """Finished spans of a single traced operation, i.e. one AppTask"""
+
+    def __init__(self):
+        self.trace_id = _new_id(16)
+        self.spans: list[Span] = []
+
+    def summary(self) -> dict[str, JSONType]:
+        """Span count and total milliseconds per span name"""
+        by_name: dict[str, dict[str, float]] = {}
+        for span in self.spans:
+            entry = by_name.setdefault(span.name, {"count": 0, "total_ms": 0.0})
+            entry["count"] += 1
+            entry["total_ms"] += span.duration_ms or 0.0
+        return {
+            "trace_id": self.trace_id,
+            "spans": {
+                name: {
+                    "count": int(entry["count"]),
+                    "total_ms": round(entry["total_ms"], 3),
+                }
+                for name, entry in by_name.items()
+            },
+        }
+
+    def to_otel(self, service_name: str = "assman") -> dict[str, JSONType]:
+        """OTLP/JSON ExportTraceServiceRequest body holding every finished span"""
+        return {
+            "resourceSpans": [
+                {
+                    "resource": {
+                        "attributes": [
+                            {
+                                "key": "service.name",
+                                "value": {"stringValue": service_name},
+                            }
+                        ]
+                    },
+                    "scopeSpans": [
+                        {
+                            "scope": {"name": __name__},
+                            "spans": [span.to_otel() for span in self.spans],
+                        }
+                    ],
+                }
+            ]
+        }
+
+
+def start_trace(name: str, **attributes: JSONType) -> Span:
+    """Open the root span of a new trace; it is not made current, see use_span()"""
+    return Span(name, Trace(), None, attributes=attributes)
+
+
+def current_span() -> Span | None:
+    return _current_span.get()
+
+
+@contextmanager
+def use_span(span: Span | None) -> Iterator[Span | None]:
+    """Make `span` the parent of spans opened within the block, without ending it"""
+    token = _current_span.set(span)
+    try:
+        yield span
+    finally:
+        _current_span.reset(token)
+
+
+@contextmanager
+def span(name: str, **attributes: JSONType) -> Iterator[Span | None]:
+    """Child span of the current span; a no-op outside of a trace so untraced callers (i.e.
+    the heartbeat) pay nothing
+    """
+    parent = _current_span.get()
+    if parent is None:
+        yield None
+        return
+    child = parent.child(name, **attributes)
+    token = _current_span.set(child)
+    try:
+        yield child
+    except BaseException as e:
+        child.error = f"{type(e).__name__}: {e}"
+        raise
+    finally:
+        _current_span.reset(token)
+        child.end()
+
+
+async def traced(name: str, awaitable: Awaitable[T], **attributes: JSONType) -> T:
+    """Await `awaitable` within a child span, i.e. `await traced("playwright.click", locator.click())`"""
+    with span(name, **attributes):
+        return await awaitable
+
+
+async def export_trace(trace: Trace, path: str) -> None:
+    """Append the trace to a JSON lines file, one OTLP/JSON request body per line"""
+    line = json.dumps(trace.to_otel()) + "\n"
+
+    def write() -> None:
+        with open(path, "a") as export:
+            export.write(line)
+
+    await asyncio.to_thread(write)